@@ -0,0 +1,74 @@
+# app/api/limits.py
+#
+# Request body limits for the multipart upload endpoints. Starlette reads
+# (and spools to disk) a whole multipart body before the handler runs, so
+# a size check in the handler comes too late: this middleware refuses the
+# request from its Content-Length before any of the body is read, and
+# stops reading a body without one as soon as it crosses the limit.
+
+import json
+
+from fastapi import HTTPException
+
+# Room for the multipart boundaries and part headers around the files
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class BodyTooLarge(HTTPException):
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail=f"Request body exceeds the {limit} byte limit")
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware: limits = {path: max body bytes}, for exact paths.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            return await self._reject(send, limit)
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Turned into a 413 by FastAPI's exception handling
+                    raise BodyTooLarge(limit)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except BodyTooLarge:
+            if response_started:
+                raise
+            await self._reject(send, limit)
+
+    async def _reject(self, send, limit: int):
+        body = json.dumps({"detail": BodyTooLarge(limit).detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
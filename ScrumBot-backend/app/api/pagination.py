@@ -0,0 +1,99 @@
+# app/api/pagination.py
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from app.db.models import VoiceLog
+
+# Public field name -> column, for column-projected queries
+LOG_FIELDS = {
+    "id": VoiceLog.id,
+    "filename": VoiceLog.filename,
+    "summary": VoiceLog.summary,
+    "emotion": VoiceLog.emotion,
+    "created_at": VoiceLog.created_at,
+    "jira_issue_url": VoiceLog.jira_issue_url,
+    "transcript": VoiceLog.transcript,
+    "progress": VoiceLog.progress_json,
+    "next_steps": VoiceLog.next_steps_json,
+    "blockers": VoiceLog.blockers_json,
+}
+JSON_FIELDS = {"progress", "next_steps", "blockers"}
+
+# "summary" view leaves out the (large) transcript
+VIEWS = {
+    "full": list(LOG_FIELDS.keys()),
+    "summary": [name for name in LOG_FIELDS if name != "transcript"],
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, log_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), log_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, log_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(log_id)
+    except Exception:
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+
+
+def resolve_fields(view: str, fields: str = None) -> list[str]:
+    """
+    Fields to return: an explicit comma separated list wins over the view.
+    """
+    if fields:
+        selected = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in LOG_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return selected
+    if view not in VIEWS:
+        raise ValueError(f"Unknown view: {view} (expected one of {', '.join(VIEWS)})")
+    return VIEWS[view]
+
+
+def paginate_logs(query, fields: list[str], limit: int = None, cursor: str = None):
+    """
+    Keyset pagination over (created_at, id), newest first.
+    Only the requested columns are loaded. Returns (rows as dicts, next cursor).
+    limit=None returns every row (and no cursor).
+    """
+    # The cursor columns are always read, even if not returned
+    columns = list(dict.fromkeys(["id", "created_at"] + fields))
+    query = query.with_entities(*[LOG_FIELDS[name].label(name) for name in columns])
+
+    if cursor:
+        created_at, log_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            VoiceLog.created_at < created_at,
+            and_(VoiceLog.created_at == created_at, VoiceLog.id < log_id),
+        ))
+
+    query = query.order_by(VoiceLog.created_at.desc(), VoiceLog.id.desc())
+    rows = query.all() if limit is None else query.limit(limit + 1).all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    items = []
+    for row in rows:
+        item = {}
+        for name in fields:
+            value = getattr(row, name)
+            if name in JSON_FIELDS:
+                value = json.loads(value) if value else []
+            item[name] = value
+        items.append(item)
+    return items, next_cursor
@@ -1,20 +1,138 @@
-@router.get("/report")
-def get_report(days: int = 7, db: Session = Depends(get_db)):
+# app/api/report.py
+#
+# Sprint report rendering. Logs are read with yield_per (REPORT_BATCH_SIZE
+# rows at a time) and rendered incrementally, so a report of any size is
+# streamed with bounded memory. Transcripts, by far the largest column,
+# are only selected when asked for.
+
+import csv
+import io
+import json
+import os
+from datetime import datetime, timedelta
+
+from app.db.models import VoiceLog
+
+REPORT_BATCH_SIZE = int(os.getenv("REPORT_BATCH_SIZE", "200"))
+# Rendered text is sent in chunks of about this many bytes
+REPORT_CHUNK_BYTES = 64 * 1024
+
+# format -> (media type, file extension)
+REPORT_FORMATS = {
+    "markdown": ("text/markdown; charset=utf-8", "md"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+CSV_FIELDS = ["id", "created_at", "filename", "summary", "emotion", "progress", "next_steps", "blockers", "jira_issue_url"]
+
+
+def iter_report_rows(db, days: int, include_transcripts: bool = True):
+    """
+    Logs of the last `days` days, oldest first, as dicts (JSON fields decoded).
+    """
     since = datetime.utcnow() - timedelta(days=days)
-    logs = (
-        db.query(VoiceLog)
+    columns = [
+        VoiceLog.id,
+        VoiceLog.created_at,
+        VoiceLog.filename,
+        VoiceLog.summary,
+        VoiceLog.emotion,
+        VoiceLog.progress_json,
+        VoiceLog.next_steps_json,
+        VoiceLog.blockers_json,
+        VoiceLog.jira_issue_url,
+    ]
+    if include_transcripts:
+        columns.append(VoiceLog.transcript)
+
+    query = (
+        db.query(*columns)
         .filter(VoiceLog.created_at >= since)
-        .order_by(VoiceLog.created_at.asc())
-        .all()
+        .order_by(VoiceLog.created_at.asc(), VoiceLog.id.asc())
+        .yield_per(REPORT_BATCH_SIZE)
     )
+    for row in query:
+        item = {
+            "id": row.id,
+            "created_at": row.created_at,
+            "filename": row.filename,
+            "summary": row.summary,
+            "emotion": row.emotion,
+            "progress": json.loads(row.progress_json) if row.progress_json else [],
+            "next_steps": json.loads(row.next_steps_json) if row.next_steps_json else [],
+            "blockers": json.loads(row.blockers_json) if row.blockers_json else [],
+            "jira_issue_url": row.jira_issue_url,
+        }
+        if include_transcripts:
+            item["transcript"] = row.transcript
+        yield item
+
+
+def render_markdown(rows, days: int):
+    yield f"# Sprint Report (last {days} days)\n\n"
+    for log in rows:
+        lines = [
+            f"## Update on {log['created_at'].strftime('%Y-%m-%d %H:%M')}",
+            f"- **Summary:** {log['summary']}",
+            f"- **Emotion:** {log['emotion']}",
+        ]
+        if "transcript" in log:
+            lines.append(f"- **Transcript:** {log['transcript']}")
+        lines.append(f"- **Progress:** {', '.join(log['progress']) if log['progress'] else 'None'}")
+        lines.append(f"- **Next Steps:** {', '.join(log['next_steps']) if log['next_steps'] else 'None'}")
+        lines.append(f"- **Blockers:** {', '.join(log['blockers']) if log['blockers'] else 'None'}")
+        if log["jira_issue_url"]:
+            lines.append(f"- **Jira Issue:** [{log['jira_issue_url']}]({log['jira_issue_url']})")
+        yield "\n".join(lines) + "\n\n"
+
+
+def render_csv(rows, days: int):
+    buffer = io.StringIO()
+    writer = None
+    for log in rows:
+        if writer is None:
+            fields = CSV_FIELDS + (["transcript"] if "transcript" in log else [])
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writeheader()
+        writer.writerow({
+            **log,
+            "created_at": log["created_at"].isoformat(),
+            "progress": "; ".join(log["progress"]),
+            "next_steps": "; ".join(log["next_steps"]),
+            "blockers": "; ".join(log["blockers"]),
+        })
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is None:
+        # Empty window: header only
+        yield ",".join(CSV_FIELDS) + "\r\n"
+
+
+def render_ndjson(rows, days: int):
+    for log in rows:
+        yield json.dumps({**log, "created_at": log["created_at"].isoformat()}) + "\n"
+
 
-    report_lines = [f"# Sprint Report (last {days} days)\n"]
+RENDERERS = {
+    "markdown": render_markdown,
+    "csv": render_csv,
+    "ndjson": render_ndjson,
+}
 
-    for log in logs:
-        date_str = log.created_at.strftime("%Y-%m-%d %H:%M")
-        report_lines.append(f"## Update on {date_str}")
-        report_lines.append(f"- **Summary:** {log.summary}")
-        report_lines.append(f"- **Emotion:** {log.emotion}")
-        report_lines.append(f"- **Transcript:** {log.transcript}\n")
 
-    return {"markdown_report": "\n".join(report_lines)}
+def render_report(db, days: int, fmt: str = "markdown", include_transcripts: bool = True):
+    """
+    Generator of encoded report chunks of about REPORT_CHUNK_BYTES.
+    """
+    pending, size = [], 0
+    for text in RENDERERS[fmt](iter_report_rows(db, days, include_transcripts), days):
+        data = text.encode()
+        pending.append(data)
+        size += len(data)
+        if size >= REPORT_CHUNK_BYTES:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, Depends, HTTPException, Request, Header, Response, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta
 import os
 from typing import List, Dict, Optional
@@ -8,28 +9,59 @@ from rq import Queue
 import redis
 import json
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, and_, not_
 
-from app.services.transcriber import transcribe_audio
-from app.services.summarizer import summarize
-from app.services.emotion import detect_emotion
-from app.services.trend_analyzer import analyze_trends_from_logs
+# Only queue, DB and schema code is imported here: ML models, the LLM and
+# Jira live in the worker, and jobs are enqueued by their dotted name.
 from app.db.session import SessionLocal
 from app.db.models import VoiceLog
-from pydantic import BaseModel
-from worker.tasks import process_audio 
-from app.utils.llm_utils import analyze_trends_with_llm
-from worker.tasks import run_trend_analysis
+from app.api.schemas import VoiceLogResponse, UploadSessionRequest
+from app.api.pagination import InvalidCursor, resolve_fields, paginate_logs
+from app.api.report import REPORT_FORMATS, render_report
+from app.services import result_cache
+from app.services import trend_cache
+from app.services import batches
+from app.services import jira_outbox
+from app.services import blocker_index
+from app.services import report_cache
+from app.services import insights_cache
+from app.services.queues import (
+    QueueFull,
+    admit,
+    get_redis,
+    get_async_redis,
+    get_interactive_queue,
+    get_llm_queue,
+    get_analytics_queue,
+    get_backfill_queue,
+    pool_stats,
+    queue_stats,
+)
+from app.services.model_registry import get_shared_model_stats
+from app.services.progress import stream_events
+from app.utils.llm_cache import get_shared_stats as get_llm_cache_stats
+from app.utils.structured_output import get_shared_stats as get_llm_json_stats
+from app.utils.upload_utils import (
+    UploadTooLarge,
+    UploadOffsetMismatch,
+    safe_filename,
+    save_upload_stream,
+    create_upload_session,
+    get_upload_session,
+    append_upload_chunk,
+    finish_upload_session,
+)
 
 
 
-redis_url = os.getenv("REDIS_URL", "redis://localhost:6380")
-conn = redis.from_url(redis_url)
 
 
 router = APIRouter()
 
 UPLOAD_FOLDER = "uploads"
+PARTIAL_UPLOAD_FOLDER = os.path.join(UPLOAD_FOLDER, ".partial")
+# Page size of GET /logs when only a cursor is given
+LOG_PAGE_SIZE = 50
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 
@@ -41,61 +73,279 @@ def get_db():
         db.close()
 
 
-# Pydantic response schema for voice logs
-class VoiceLogResponse(BaseModel):
-    id: int
-    filename: str
-    transcript: str
-    summary: str
-    emotion: str
-    jira_issue_url: Optional[str] = None
-
-    progress: List[str] = []
-    next_steps: List[str] = []
-    blockers: List[str] = []
-
-    class Config:
-        orm_mode = True
-
-
 # Health check
 @router.get("/ping")
 def health_check():
     return {"status": "running"}
 
 
-# Upload audio & enqueue background task (RQ)
-@router.post("/upload_audio")
-async def upload_audio(file: UploadFile = File(...)):
-    file_name = f"{datetime.now().timestamp()}_{file.filename}"
-    file_path = os.path.join(UPLOAD_FOLDER, file_name)
+def admit_or_429(q: Queue) -> dict:
+    """
+    Queue position / ETA for a new job, or a 429 with Retry-After when
+    the queue is saturated.
+    """
+    try:
+        return admit(q)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
 
+def enqueue_audio_processing(q: Queue, file_path: str, file_name: str, content_hash: str, size: int, admission: dict) -> dict:
     # Enqueue task with RQ
-    redis_conn = redis.Redis()
-    q = Queue(connection=redis_conn)
-    job=q.enqueue('worker.tasks.process_audio', file_path, file_name, result_ttl=600, job_timeout=600)
+    job=q.enqueue('worker.tasks.process_audio', file_path, file_name, content_hash, result_ttl=600, job_timeout=600)
 
     return {
         "task_id": job.id,
         "file": file_name,
+        "size": size,
+        "sha256": content_hash,
+        **admission,
         "message": "Processing started. This may take a few seconds.",
     }
 
+
+def multipart_files_schema(field: str, multiple: bool = False) -> dict:
+    """
+    OpenAPI request body of an upload endpoint that parses its own form.
+    """
+    file_schema = {"type": "string", "format": "binary"}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"multipart/form-data": {"schema": {
+                "type": "object",
+                "properties": {field: {"type": "array", "items": file_schema} if multiple else file_schema},
+                "required": [field],
+            }}},
+        }
+    }
+
+
+def form_files(form, field: str) -> list[UploadFile]:
+    files = [value for value in form.getlist(field) if not isinstance(value, str)]
+    if not files:
+        raise HTTPException(status_code=422, detail=f"Missing file field: {field}")
+    return files
+
+
+# Upload audio & enqueue background task (RQ).
+# The form is parsed in the handler, not declared with File(...): FastAPI
+# reads (and spools) a declared body before the handler runs, so a
+# saturated queue would only be refused after the whole upload arrived.
+@router.post("/upload_audio", openapi_extra=multipart_files_schema("file"))
+async def upload_audio(request: Request, q: Queue = Depends(get_interactive_queue)):
+    # Refuse before reading the body when the workers are already saturated
+    admission = admit_or_429(q)
+
+    async with request.form(max_files=1) as form:
+        file = form_files(form, "file")[0]
+        file_name = f"{datetime.now().timestamp()}_{safe_filename(file.filename)}"
+        file_path = os.path.join(UPLOAD_FOLDER, file_name)
+
+        # Stream to disk in chunks instead of reading the whole body into memory
+        try:
+            size, content_hash = await save_upload_stream(file, file_path)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+    return enqueue_audio_processing(q, file_path, file_name, content_hash, size, admission)
+
+
+# Upload a group of recordings (e.g. a whole standup) as one batch:
+# one processing job for every file, then one trend refresh for the batch.
+# Poll GET /batch_status/{batch_id}, or follow task_id on /task_events.
+@router.post("/upload_audio/batch", openapi_extra=multipart_files_schema("files", multiple=True))
+async def upload_audio_batch(
+    request: Request,
+    q: Queue = Depends(get_interactive_queue),
+    analytics_q: Queue = Depends(get_analytics_queue),
+):
+    # Refused before the body is read, as for single uploads
+    admission = admit_or_429(q)
+
+    saved = []
+    async with request.form(max_files=batches.MAX_BATCH_FILES + 1) as form:
+        files = form_files(form, "files")
+        if len(files) > batches.MAX_BATCH_FILES:
+            raise HTTPException(status_code=413, detail=f"At most {batches.MAX_BATCH_FILES} files per batch")
+
+        for file in files:
+            file_name = f"{datetime.now().timestamp()}_{safe_filename(file.filename)}"
+            file_path = os.path.join(UPLOAD_FOLDER, file_name)
+            try:
+                size, content_hash = await save_upload_stream(file, file_path)
+            except UploadTooLarge as e:
+                raise HTTPException(status_code=413, detail=f"{file.filename}: {e}")
+            saved.append({"file_path": file_path, "file": file_name, "size": size, "sha256": content_hash})
+
+    batch_id = batches.new_batch_id()
+    items = [(f["file_path"], f["file"], f["sha256"]) for f in saved]
+    job = q.enqueue(
+        'worker.tasks.process_audio_batch', batch_id, items,
+        result_ttl=batches.BATCH_TTL, job_timeout=600 * len(items),
+    )
+    finalize = analytics_q.enqueue('worker.tasks.finalize_batch', batch_id, depends_on=job, result_ttl=batches.BATCH_TTL)
+
+    files_info = [{k: f[k] for k in ("file", "size", "sha256")} for f in saved]
+    batches.create_batch(get_redis(), batch_id, files_info, job.id, finalize.id)
+
+    return {
+        "batch_id": batch_id,
+        "task_id": job.id,
+        "files": files_info,
+        **admission,
+        "message": f"Processing {len(saved)} files as one batch.",
+    }
+
+
+@router.get("/batch_status/{batch_id}")
+def get_batch_status(batch_id: str, redis_conn: redis.Redis = Depends(get_redis)):
+    batch = batches.get_batch(redis_conn, batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"Batch not found: {batch_id}")
+
+    try:
+        job = Job.fetch(batch["job_id"], connection=redis_conn)
+        finalize = Job.fetch(batch["finalize_job_id"], connection=redis_conn)
+    except NoSuchJobError:
+        raise HTTPException(status_code=404, detail=f"Batch jobs expired: {batch_id}")
+
+    if job.is_failed or finalize.is_failed:
+        status = "failure"
+    elif job.is_finished and finalize.is_finished:
+        status = "success"
+    elif job.is_finished:
+        status = "refreshing_trends"
+    else:
+        status = "pending"
+
+    return {
+        "batch_id": batch_id,
+        "status": status,
+        "stage": job.meta.get("stage"),
+        "files": batch["files"],
+        "results": job.result["results"] if job.is_finished else None,
+        "timings": job.result["timings"] if job.is_finished else job.meta.get("stage_timings"),
+        "error_message": str(job.exc_info) if job.is_failed else None,
+    }
+
+
+# Resumable uploads for long recordings:
+#   POST /uploads                    -> start a session (filename + total length)
+#   GET /uploads/{id}                -> current offset, to resume after a dropped connection
+#   PATCH /uploads/{id}              -> raw body appended at the Upload-Offset header
+#   POST /uploads/{id}/complete      -> enqueue processing once every byte arrived
+@router.post("/uploads")
+def start_upload(body: UploadSessionRequest):
+    try:
+        return create_upload_session(PARTIAL_UPLOAD_FOLDER, body.filename, body.length)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
+@router.get("/uploads/{upload_id}")
+def get_upload(upload_id: str):
+    try:
+        return get_upload_session(PARTIAL_UPLOAD_FOLDER, upload_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Upload not found: {upload_id}")
+
+
+@router.patch("/uploads/{upload_id}")
+async def upload_chunk(upload_id: str, request: Request, upload_offset: int = Header(...)):
+    try:
+        return await append_upload_chunk(
+            PARTIAL_UPLOAD_FOLDER, upload_id, upload_offset, request.stream(), lock_conn=get_redis()
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Upload not found: {upload_id}")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
+@router.post("/uploads/{upload_id}/complete")
+def complete_upload(upload_id: str, q: Queue = Depends(get_interactive_queue)):
+    # The parts stay resumable if the queue is full, the client retries later
+    admission = admit_or_429(q)
+    try:
+        session = get_upload_session(PARTIAL_UPLOAD_FOLDER, upload_id)
+        file_name = f"{datetime.now().timestamp()}_{session['filename']}"
+        file_path = os.path.join(UPLOAD_FOLDER, file_name)
+        size, content_hash = finish_upload_session(PARTIAL_UPLOAD_FOLDER, upload_id, file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Upload not found: {upload_id}")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return enqueue_audio_processing(q, file_path, file_name, content_hash, size, admission)
+
+# Hit rate of the content-addressed audio result cache
+@router.get("/metrics/cache")
+def get_cache_metrics(redis_conn: redis.Redis = Depends(get_redis)):
+    return result_cache.get_stats(redis_conn)
+
+
+# Hit/miss counters of the LLM response cache, summed over all workers
+@router.get("/metrics/llm_cache")
+def get_llm_cache_metrics(redis_conn: redis.Redis = Depends(get_redis)):
+    return get_llm_cache_stats(redis_conn)
+
+
+# JSON parse outcomes of LLM replies (parsed / extracted / repaired / failed), summed over all workers
+@router.get("/metrics/llm_json")
+def get_llm_json_metrics(redis_conn: redis.Redis = Depends(get_redis)):
+    return get_llm_json_stats(redis_conn)
+
+
+# Shared Redis connection pool usage in this API process
+@router.get("/metrics/redis")
+def get_redis_metrics():
+    return pool_stats()
+
+
+# Load time and memory of the models in every worker process
+@router.get("/metrics/models")
+def get_model_metrics(redis_conn: redis.Redis = Depends(get_redis)):
+    return get_shared_model_stats(redis_conn)
+
+
+# Jira issues waiting in the outbox, created, or given up on
+@router.get("/metrics/jira_outbox")
+def get_jira_outbox_metrics(db: Session = Depends(get_db)):
+    return jira_outbox.get_stats(db)
+
+
+# Drain the Jira outbox now (e.g. after Jira came back up)
+@router.post("/jira/outbox/drain")
+def enqueue_jira_outbox_drain(q: Queue = Depends(get_analytics_queue)):
+    job = q.enqueue('worker.tasks.drain_jira_outbox')
+    return {"task_id": job.get_id(), "status": "queued"}
+
+
+# Depth, workers and average job duration of each priority queue
+@router.get("/metrics/queues")
+def get_queue_metrics():
+    return queue_stats()
+
+
 @router.get("/task_status/{task_id}")
-def get_task_status(task_id: str):
+def get_task_status(task_id: str, redis_conn: redis.Redis = Depends(get_redis)):
     try:
-        redis_conn = redis.Redis()
         job = Job.fetch(task_id, connection=redis_conn)
 
         if job.is_finished:
-            return {
+            result = job.result or {}
+            response = {
                 "status": "success",
                 "result": job.result,
-                "log_url": f"/logs/{job.result['log_id']}" if job.result else None
+                "log_url": f"/logs/{result['log_id']}" if "log_id" in result else None,
             }
+            if "batch_id" in result:
+                # Batch upload: per-file log ids are in the results
+                response["batch_url"] = f"/batch_status/{result['batch_id']}"
+            return response
         elif job.is_failed:
             return {
                 "status": "failure",
@@ -109,12 +359,73 @@ def get_task_status(task_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error checking job status: {str(e)}")
 
-# Get all voice logs
-@router.get("/logs", response_model=List[VoiceLogResponse])
-def get_all_logs(db: Session = Depends(get_db)):
-    logs = db.query(VoiceLog).all()
-    if not logs:
+# Live progress of one or more jobs as Server-Sent Events
+# (transcribing, cleaning chunk i/n, summarizing, emotion, saving, saved / failed).
+# The stream closes once every job is finished.
+@router.get("/task_events/{task_id}")
+def stream_task_events(task_id: str):
+    return StreamingResponse(
+        stream_events(get_async_redis(), [task_id]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/task_events")
+def stream_tasks_events(task_ids: str = Query(..., description="Comma separated job ids")):
+    ids = [task_id.strip() for task_id in task_ids.split(",") if task_id.strip()]
+    if not ids:
+        raise HTTPException(status_code=400, detail="No task ids given")
+    return StreamingResponse(
+        stream_events(get_async_redis(), ids),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Get voice logs, newest first. With `limit` (or `cursor`) one page at a
+# time, the cursor of the next page in the X-Next-Cursor header; without
+# either, every log as before pagination existed.
+@router.get("/logs")
+def get_all_logs(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    emotion: Optional[str] = None,
+    has_blockers: Optional[bool] = None,
+    view: str = "full",
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        selected = resolve_fields(view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query = db.query(VoiceLog)
+    if since:
+        query = query.filter(VoiceLog.created_at >= since)
+    if until:
+        query = query.filter(VoiceLog.created_at < until)
+    if emotion:
+        query = query.filter(VoiceLog.emotion == emotion)
+    if has_blockers is not None:
+        with_blockers = and_(VoiceLog.blockers_json.isnot(None), VoiceLog.blockers_json.notin_(["", "[]"]))
+        query = query.filter(with_blockers if has_blockers else not_(with_blockers))
+
+    try:
+        if cursor and limit is None:
+            limit = LOG_PAGE_SIZE
+        logs, next_cursor = paginate_logs(query, selected, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not logs and not cursor:
         raise HTTPException(status_code=404, detail="No logs found")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return logs
 
 
@@ -127,94 +438,115 @@ def get_log(log_id: int, db: Session = Depends(get_db)):
     return log
 
 
-# Trends API — emotion counts and logs per day for last 7 days
-@router.get("/trends")
-def enqueue_trend_analysis():
-    redis_conn = redis.Redis()
-    q = Queue(connection=redis_conn)
-    job = q.enqueue(run_trend_analysis)
+# Re-score the emotion of every stored log in batches (long-running backfill)
+@router.post("/emotions/rescore")
+def enqueue_emotion_rescore(batch_size: int = 64, after_id: int = 0, q: Queue = Depends(get_backfill_queue)):
+    job = q.enqueue('worker.tasks.rescore_emotions', batch_size, after_id, job_timeout=6 * 3600)
     return {"task_id": job.get_id(), "status": "queued"}
 
-@router.get("/trends/latest")
-def get_latest_trends():
-    redis_conn = redis.Redis()
-    trends = redis_conn.get("latest_trends")
-    if trends is None:
+
+# Trends API — emotion counts per day, top blockers and next steps over the
+# last `days` days (all history by default). Served from the trend cache with
+# its age; a stale entry triggers one background refresh.
+@router.get("/trends")
+def get_trends(
+    days: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    redis_conn: redis.Redis = Depends(get_redis),
+    q: Queue = Depends(get_analytics_queue),
+):
+    def enqueue_refresh(window):
+        q.enqueue('worker.tasks.run_trend_analysis', window)
+
+    trends = trend_cache.get_trends(redis_conn, db, days, enqueue_refresh)
+    if not trends["dates"]:
         raise HTTPException(status_code=404, detail="No trends data available yet.")
-    return json.loads(trends)
-
-# Trends Insights (LLM-powered)
-# @router.get("/trends/insights")
-# def get_trends_insights(db: Session = Depends(get_db)):
-#     today = datetime.utcnow().date()
-#     week_ago = today - timedelta(days=7)
-
-#     emotion_counts = (
-#         db.query(
-#             func.date(VoiceLog.created_at).label("date"),
-#             VoiceLog.emotion,
-#             func.count(VoiceLog.id)
-#         )
-#         .filter(VoiceLog.created_at >= week_ago)
-#         .group_by("date", VoiceLog.emotion)
-#         .all()
-#     )
-
-#     trends = {}
-#     for date, emotion, count in emotion_counts:
-#         date_str = str(date)
-#         if date_str not in trends:
-#             trends[date_str] = {}
-#         trends[date_str][emotion] = count
-
-#     total_logs = (
-#         db.query(
-#             func.date(VoiceLog.created_at).label("date"),
-#             func.count(VoiceLog.id)
-#         )
-#         .filter(VoiceLog.created_at >= week_ago)
-#         .group_by("date")
-#         .all()
-#     )
-
-#     for date, total in total_logs:
-#         date_str = str(date)
-#         if date_str not in trends:
-#             trends[date_str] = {}
-#         trends[date_str]["total_logs"] = total
-
-#     # 🧠 Generate LLM insight
-#     insights = analyze_trends_with_llm(trends)
-
-#     return {
-#         "trends_data": trends,
-#         "insights_summary": insights
-#     }
+    return trends
+
+
+# Most frequent blockers over the last `days` days, near-duplicates grouped
+@router.get("/blockers/top")
+def get_top_blockers(
+    days: Optional[int] = Query(None, ge=1),
+    limit: int = Query(5, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    return blocker_index.top_clusters(db, days, limit)
+
+
+# Kept for existing clients, same as GET /trends
+@router.get("/trends/latest")
+def get_latest_trends(
+    days: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    redis_conn: redis.Redis = Depends(get_redis),
+    q: Queue = Depends(get_analytics_queue),
+):
+    return get_trends(days, db, redis_conn, q)
+
+# Trends Insights (LLM-powered), computed by a worker: summaries per day,
+# reduced into one report. Returns the last result with its age (a stale one
+# triggers a refresh), or 202 while the first computation of a window runs.
+@router.get("/trends/insights")
+def get_trends_insights(
+    response: Response,
+    days: int = Query(7, ge=1, le=90),
+    redis_conn: redis.Redis = Depends(get_redis),
+    q: Queue = Depends(get_llm_queue),
+):
+    def enqueue_refresh(window):
+        q.enqueue('worker.tasks.run_trend_insights', window, job_timeout=insights_cache.INSIGHTS_JOB_TIMEOUT)
+
+    insights = insights_cache.get_insights(redis_conn, days, enqueue_refresh)
+    if insights is None:
+        response.status_code = 202
+        return {"status": "computing", "days": days, "message": "Insights are being generated. Try again shortly."}
+    return insights
 
 # Sprint Report API — generates markdown report of last N days updates
-@router.get("/report")
-def get_report(days: int = 7, db: Session = Depends(get_db)):
-    since = datetime.utcnow() - timedelta(days=days)
-    logs = (
-        db.query(VoiceLog)
-        .filter(VoiceLog.created_at >= since)
-        .order_by(VoiceLog.created_at.asc())
-        .all()
-    )
+def _render_report_in_session(days: int, fmt: str, include_transcripts: bool):
+    # Streaming outlives the request's dependencies, so the generator owns its session
+    db = SessionLocal()
+    try:
+        yield from render_report(db, days, fmt, include_transcripts)
+    finally:
+        db.close()
 
-    report_lines = [f"# Sprint Report (last {days} days)\n"]
-
-    for log in logs:
-        date_str = log.created_at.strftime("%Y-%m-%d %H:%M")
-        report_lines.append(f"## Update on {date_str}")
-        report_lines.append(f"- **Summary:** {log.summary}")
-        report_lines.append(f"- **Emotion:** {log.emotion}")
-        report_lines.append(f"- **Transcript:** {log.transcript}")
-        report_lines.append(f"- **Progress:** {', '.join(log.progress) if log.progress else 'None'}")
-        report_lines.append(f"- **Next Steps:** {', '.join(log.next_steps) if log.next_steps else 'None'}")
-        report_lines.append(f"- **Blockers:** {', '.join(log.blockers) if log.blockers else 'None'}")
-        if log.jira_issue_url:
-            report_lines.append(f"- **Jira Issue:** [{log.jira_issue_url}]({log.jira_issue_url})")
-            report_lines.append("")  # Newline
-
-    return {"markdown_report": "\n".join(report_lines)}
+
+def _cached_or_streamed_report(redis_conn, days: int, fmt: str, include_transcripts: bool):
+    """
+    (cached report bytes, None) on a cache hit, (None, chunk generator) otherwise.
+    """
+    key = report_cache.cache_key(redis_conn, days, fmt, include_transcripts)
+    cached = report_cache.get(redis_conn, key)
+    if cached is not None:
+        return cached, None
+    return None, report_cache.stream_and_store(redis_conn, key, _render_report_in_session(days, fmt, include_transcripts))
+
+
+# Sprint report as a download, streamed as it is rendered
+# (format: markdown, csv or ndjson; transcripts=false for a much smaller report)
+@router.get("/report/export")
+def export_report(
+    days: int = Query(7, ge=1),
+    format: str = "markdown",
+    transcripts: bool = True,
+    redis_conn: redis.Redis = Depends(get_redis),
+):
+    if format not in REPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}', expected one of {sorted(REPORT_FORMATS)}")
+    media_type, extension = REPORT_FORMATS[format]
+    headers = {"Content-Disposition": f'attachment; filename="sprint-report-{days}-days.{extension}"'}
+
+    cached, chunks = _cached_or_streamed_report(redis_conn, days, format, transcripts)
+    if cached is not None:
+        return Response(content=cached, media_type=media_type, headers={**headers, "X-Report-Cache": "hit"})
+    return StreamingResponse(chunks, media_type=media_type, headers={**headers, "X-Report-Cache": "miss"})
+
+
+# Markdown report wrapped in JSON (used by the frontend)
+@router.get("/report")
+def get_report(days: int = 7, transcripts: bool = True, redis_conn: redis.Redis = Depends(get_redis)):
+    cached, chunks = _cached_or_streamed_report(redis_conn, days, "markdown", transcripts)
+    report = cached if cached is not None else b"".join(chunks)
+    return {"markdown_report": report.decode()}
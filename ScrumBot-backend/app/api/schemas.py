@@ -0,0 +1,28 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.utils.upload_utils import MAX_UPLOAD_BYTES
+
+
+# Pydantic response schema for voice logs
+class VoiceLogResponse(BaseModel):
+    id: int
+    filename: str
+    transcript: str
+    summary: str
+    emotion: str
+    jira_issue_url: Optional[str] = None
+
+    progress: List[str] = []
+    next_steps: List[str] = []
+    blockers: List[str] = []
+
+    class Config:
+        orm_mode = True
+
+
+# Request body to start a resumable upload
+class UploadSessionRequest(BaseModel):
+    filename: str
+    length: int = Field(gt=0, le=MAX_UPLOAD_BYTES)
@@ -1,5 +1,6 @@
 from .session import engine
-from .models import Base
+from .migrations import run_migrations
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    # Schema changes are versioned in migrations.py
+    return run_migrations(engine)
@@ -0,0 +1,176 @@
+# app/db/migrations.py
+#
+# Minimal versioned schema migrations.
+# Each migration runs once, in order, and its version is recorded in the
+# schema_migrations table. Migrations are written to be idempotent so that
+# databases created ad hoc (create_all) before this existed upgrade cleanly.
+# To change the schema: update app/db/models.py, then append a migration here.
+
+import hashlib
+import logging
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+
+def _add_column(conn, table: str, column: str, ddl_type: str):
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def _m0001_baseline(conn):
+    # Schema as it was before migrations were introduced
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS voice_logs1 (
+            id INTEGER NOT NULL,
+            filename VARCHAR,
+            transcript TEXT,
+            summary TEXT,
+            emotion VARCHAR,
+            created_at DATETIME,
+            jira_issue_url VARCHAR,
+            progress TEXT,
+            next_steps TEXT,
+            blockers TEXT,
+            PRIMARY KEY (id),
+            UNIQUE (filename)
+        )
+    """))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_voice_logs1_id ON voice_logs1 (id)"))
+
+
+def _m0002_voice_log_indexes(conn):
+    # Time-range scans (report, trends, date filters) and emotion-by-day
+    # grouping are both served by (created_at, emotion) without touching rows
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_voice_logs1_created_at_emotion ON voice_logs1 (created_at, emotion)"
+    ))
+    # GET /logs?emotion=... ordered by created_at
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_voice_logs1_emotion_created_at ON voice_logs1 (emotion, created_at)"
+    ))
+    # sha256 of the uploaded audio
+    _add_column(conn, "voice_logs1", "content_hash", "VARCHAR(64)")
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_voice_logs1_content_hash ON voice_logs1 (content_hash)"
+    ))
+
+
+def _m0003_trend_rollups(conn):
+    from sqlalchemy.orm import Session
+    from app.db.models import TrendDailyEmotion, TrendDailyItem
+    from app.services import trend_rollups
+
+    TrendDailyEmotion.__table__.create(conn, checkfirst=True)
+    TrendDailyItem.__table__.create(conn, checkfirst=True)
+
+    # Backfill from the logs saved so far (blockers by exact text, as before
+    # clustering; migration 5 rebuilds them by cluster)
+    session = Session(bind=conn)
+    count = trend_rollups.rebuild(session, cluster_blockers=False)
+    session.flush()
+    session.close()
+    logging.info(f"Trend rollups backfilled from {count} logs")
+
+
+def _m0004_jira_outbox(conn):
+    from app.db.models import JiraOutbox
+
+    # Creates the table with its indexes
+    JiraOutbox.__table__.create(conn, checkfirst=True)
+
+
+def _m0005_blocker_clusters(conn):
+    from sqlalchemy.orm import Session
+    from app.db.models import BlockerCluster, BlockerMention, BlockerLshBucket
+    from app.services import blocker_index, trend_rollups
+
+    BlockerCluster.__table__.create(conn, checkfirst=True)
+    BlockerMention.__table__.create(conn, checkfirst=True)
+    BlockerLshBucket.__table__.create(conn, checkfirst=True)
+
+    # Cluster the blockers saved so far, then count blockers by cluster
+    session = Session(bind=conn)
+    count = blocker_index.rebuild(session)
+    trend_rollups.rebuild(session)
+    session.flush()
+    session.close()
+    logging.info(f"Blocker clusters built from {count} logs")
+
+
+def _m0006_voice_log_pipeline_version(conn):
+    # Lets duplicate uploads be found from the database alone (Redis flushed);
+    # older logs have no version and are never reused
+    _add_column(conn, "voice_logs1", "pipeline_version", "VARCHAR(12)")
+
+
+def _m0007_jira_outbox_cluster_keys(conn):
+    # Outbox rows were keyed "blocker_cluster:<id>", but cluster ids are
+    # reassigned by blocker_index.rebuild: key them by the cluster's seed
+    # blocker, found through the first mention of the row's log
+    from app.services.jira_outbox import dedup_key
+
+    rows = conn.execute(text(
+        "SELECT id, log_id, summary FROM jira_outbox WHERE dedup_key LIKE 'blocker_cluster:%'"
+    )).fetchall()
+    for row_id, log_id, summary in rows:
+        seed = conn.execute(text(
+            "SELECT c.normalized FROM blocker_mentions m JOIN blocker_clusters c ON c.id = m.cluster_id "
+            "WHERE m.log_id = :log_id ORDER BY m.id LIMIT 1"
+        ), {"log_id": log_id}).scalar()
+        key = hashlib.sha256(seed.encode()).hexdigest() if seed else dedup_key(summary.split(": ", 1)[-1])
+        conn.execute(text("UPDATE jira_outbox SET dedup_key = :key WHERE id = :id"), {"key": key, "id": row_id})
+    logging.info(f"Re-keyed {len(rows)} Jira outbox rows by blocker")
+
+
+MIGRATIONS = [
+    (1, "baseline voice_logs1", _m0001_baseline),
+    (2, "voice_logs1 time/emotion indexes and content_hash", _m0002_voice_log_indexes),
+    (3, "daily trend rollups", _m0003_trend_rollups),
+    (4, "jira outbox", _m0004_jira_outbox),
+    (5, "blocker clusters and LSH index", _m0005_blocker_clusters),
+    (6, "voice_logs1 pipeline_version", _m0006_voice_log_pipeline_version),
+    (7, "jira outbox keyed by cluster seed", _m0007_jira_outbox_cluster_keys),
+]
+
+
+def current_version(engine) -> int:
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar()
+
+
+def _ensure_version_table(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    """))
+
+
+def run_migrations(engine, target: int = None) -> list[int]:
+    """
+    Applies every pending migration up to `target` (latest by default).
+    Returns the versions that were applied.
+    """
+    applied = []
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        done = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+    for version, name, migrate in MIGRATIONS:
+        if version in done or (target is not None and version > target):
+            continue
+        # One transaction per migration
+        with engine.begin() as conn:
+            logging.info(f"Applying migration {version}: {name}")
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"),
+                {"v": version, "n": name, "t": datetime.utcnow()},
+            )
+        applied.append(version)
+    return applied
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, Index, ForeignKey
 from datetime import datetime
 import json
 
@@ -7,6 +7,12 @@ Base = declarative_base()
 
 class VoiceLog(Base):
     __tablename__ = "voice_logs1"
+    # Created by app/db/migrations.py (keep both in sync)
+    __table_args__ = (
+        Index("ix_voice_logs1_created_at_emotion", "created_at", "emotion"),
+        Index("ix_voice_logs1_emotion_created_at", "emotion", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, unique=True)
     transcript = Column(Text)
@@ -14,6 +20,8 @@ class VoiceLog(Base):
     emotion = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     jira_issue_url = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # sha256 of the audio
+    pipeline_version = Column(String(12), nullable=True)  # result_cache.pipeline_version() that produced it
 
     # Store JSON as string
     progress_json = Column("progress", Text, nullable=True)
@@ -44,3 +52,73 @@ class VoiceLog(Base):
     @blockers.setter
     def blockers(self, value):
         self.blockers_json = json.dumps(value)
+
+
+# Daily trend rollups, updated incrementally as logs are saved
+# (see app/services/trend_rollups.py)
+class TrendDailyEmotion(Base):
+    __tablename__ = "trend_daily_emotions"
+    day = Column(Date, primary_key=True)
+    emotion = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class TrendDailyItem(Base):
+    __tablename__ = "trend_daily_items"
+    kind = Column(String, primary_key=True)  # "blocker" or "next_step"
+    day = Column(Date, primary_key=True)
+    text = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# Jira issues waiting to be created, drained by a background job
+# (see app/services/jira_outbox.py)
+class JiraOutbox(Base):
+    __tablename__ = "jira_outbox"
+    __table_args__ = (
+        Index("ix_jira_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    log_id = Column(Integer, ForeignKey("voice_logs1.id"), nullable=False, index=True)
+    dedup_key = Column(String(64), nullable=False, index=True)  # sha256 of the (cluster seed) blocker, normalized
+    summary = Column(Text, nullable=False)
+    description = Column(Text, nullable=False)
+    issue_type = Column(String, nullable=False, default="Task")
+    status = Column(String, nullable=False, default="pending")  # pending, done or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    issue_key = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# Near-duplicate blockers grouped into clusters, with a MinHash LSH index
+# (see app/services/blocker_index.py)
+class BlockerCluster(Base):
+    __tablename__ = "blocker_clusters"
+    id = Column(Integer, primary_key=True)
+    label = Column(Text, nullable=False)  # first blocker of the cluster, as written
+    normalized = Column(Text, nullable=False)
+    mentions = Column(Integer, nullable=False, default=0)
+    first_seen = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_seen = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class BlockerMention(Base):
+    __tablename__ = "blocker_mentions"
+    __table_args__ = (
+        Index("ix_blocker_mentions_day_cluster_id", "day", "cluster_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    log_id = Column(Integer, ForeignKey("voice_logs1.id"), nullable=False, index=True)
+    cluster_id = Column(Integer, ForeignKey("blocker_clusters.id"), nullable=False, index=True)
+    text = Column(Text, nullable=False)
+    day = Column(Date, nullable=False)
+
+
+class BlockerLshBucket(Base):
+    __tablename__ = "blocker_lsh_buckets"
+    bucket = Column(String(24), primary_key=True)  # "band:hash"
+    cluster_id = Column(Integer, ForeignKey("blocker_clusters.id"), primary_key=True)
@@ -0,0 +1,49 @@
+# app/services/batches.py
+#
+# A batch is a group of recordings uploaded together (e.g. a whole team's
+# standup). The files are processed by one worker job, so model inference is
+# batched across the group, and a follow-up job that depends on it refreshes
+# the trends once for the whole batch. The batch record in Redis is the single
+# status handle clients poll.
+
+import json
+import os
+import time
+import uuid
+
+# Max files accepted in one batch upload
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "20"))
+# How long a batch record (and its status) is kept
+BATCH_TTL = int(os.getenv("BATCH_TTL", str(24 * 3600)))
+
+
+def _key(batch_id: str) -> str:
+    return f"audio_batch:{batch_id}"
+
+
+def new_batch_id() -> str:
+    return uuid.uuid4().hex
+
+
+def create_batch(conn, batch_id: str, files: list[dict], job_id: str, finalize_job_id: str) -> dict:
+    """
+    Saves the batch record: its files (name, size, sha256) and the ids of
+    the processing and finalize jobs.
+    """
+    batch = {
+        "batch_id": batch_id,
+        "created_at": time.time(),
+        "files": files,
+        "job_id": job_id,
+        "finalize_job_id": finalize_job_id,
+    }
+    conn.set(_key(batch_id), json.dumps(batch), ex=BATCH_TTL)
+    return batch
+
+
+def get_batch(conn, batch_id: str) -> dict:
+    """
+    The batch record, or None if it is unknown or expired.
+    """
+    batch = conn.get(_key(batch_id))
+    return json.loads(batch) if batch is not None else None
@@ -0,0 +1,175 @@
+# app/services/blocker_index.py
+#
+# Clusters near-duplicate blockers ("waiting on API keys", "Still waiting for
+# the API keys!") across logs. Each blocker is shingled into character
+# n-grams and MinHashed; the signature is split into LSH bands, and clusters
+# sharing a band bucket are candidates, confirmed with the exact Jaccard
+# similarity against the cluster's first blocker. Unmatched blockers start a
+# new cluster. Mentions are stored per day, so cluster counts over any
+# window are an indexed aggregate.
+
+import hashlib
+import os
+import random
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
+
+from app.db.models import VoiceLog, BlockerCluster, BlockerMention, BlockerLshBucket
+
+# Jaccard similarity (character shingles) above which two blockers are the same
+BLOCKER_SIMILARITY = float(os.getenv("BLOCKER_SIMILARITY", "0.5"))
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+# 32 bands of 2 rows: pairs down to ~0.2 similarity become candidates,
+# the exact check above decides
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+STOPWORDS = {"a", "an", "the", "on", "for", "of", "to", "from", "with", "in", "is", "are", "we", "i", "our", "my", "still"}
+
+
+def normalize_blocker(text: str) -> str:
+    words = re.sub(r"[^\w\s]", " ", text.lower()).split()
+    return " ".join(w for w in words if w not in STOPWORDS)
+
+
+def shingles(normalized: str) -> set[str]:
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def minhash(shingle_set: set[str]) -> list[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingle_set]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def lsh_buckets(signature: list[int]) -> list[str]:
+    """
+    One bucket key per band, "band:hash of the band's rows".
+    """
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(repr(rows).encode(), digest_size=8).hexdigest()
+        buckets.append(f"{band}:{digest}")
+    return buckets
+
+
+def find_cluster(db: Session, normalized: str, shingle_set: set[str], buckets: list[str]):
+    """
+    Most similar existing cluster above BLOCKER_SIMILARITY, or None.
+    """
+    candidate_ids = {
+        row.cluster_id
+        for row in db.query(BlockerLshBucket.cluster_id).filter(BlockerLshBucket.bucket.in_(buckets))
+    }
+    if not candidate_ids:
+        return None
+
+    best, best_score = None, BLOCKER_SIMILARITY
+    for cluster in db.query(BlockerCluster).filter(BlockerCluster.id.in_(candidate_ids)):
+        score = 1.0 if cluster.normalized == normalized else jaccard(shingle_set, shingles(cluster.normalized))
+        if score >= best_score:
+            best, best_score = cluster, score
+    return best
+
+
+def assign_cluster(db: Session, text: str, seen_at: datetime = None) -> BlockerCluster:
+    """
+    Cluster of a blocker, created (and indexed) if no similar one exists.
+    """
+    seen_at = seen_at or datetime.utcnow()
+    normalized = normalize_blocker(text) or text.strip().lower()
+    shingle_set = shingles(normalized)
+    buckets = lsh_buckets(minhash(shingle_set))
+
+    cluster = find_cluster(db, normalized, shingle_set, buckets)
+    if cluster is None:
+        cluster = BlockerCluster(label=text.strip(), normalized=normalized, mentions=0, first_seen=seen_at, last_seen=seen_at)
+        db.add(cluster)
+        db.flush()
+        db.add_all([BlockerLshBucket(bucket=bucket, cluster_id=cluster.id) for bucket in buckets])
+        # Sessions do not autoflush: the next blocker of the same log must see these buckets
+        db.flush()
+
+    cluster.mentions += 1
+    cluster.last_seen = max(cluster.last_seen or seen_at, seen_at)
+    return cluster
+
+
+def index_log(db: Session, log: VoiceLog) -> list[BlockerCluster]:
+    """
+    Clusters every blocker of a log and records the mentions. Call after
+    flush and before commit, like trend_rollups.record_log.
+    Returns one cluster per blocker, in order.
+    """
+    created_at = log.created_at or datetime.utcnow()
+    clusters = []
+    for text in log.blockers or []:
+        if not text or not text.strip():
+            continue
+        cluster = assign_cluster(db, text, created_at)
+        db.add(BlockerMention(log_id=log.id, cluster_id=cluster.id, text=text, day=created_at.date()))
+        clusters.append(cluster)
+    db.flush()
+    return clusters
+
+
+def rebuild(db: Session, batch_size: int = 1000) -> int:
+    """
+    Re-clusters the blockers of every log (backfill / after tuning the
+    similarity). Cluster ids are reassigned, so nothing outside the index
+    may refer to a cluster by id. Returns the number of logs read.
+    """
+    db.query(BlockerMention).delete()
+    db.query(BlockerLshBucket).delete()
+    db.query(BlockerCluster).delete()
+
+    count = 0
+    # Only the columns used, so this also runs from migrations that
+    # predate later VoiceLog columns
+    logs = (
+        db.query(VoiceLog)
+        .options(load_only(VoiceLog.id, VoiceLog.created_at, VoiceLog.blockers_json))
+        .order_by(VoiceLog.id)
+        .yield_per(batch_size)
+    )
+    for log in logs:
+        index_log(db, log)
+        count += 1
+    return count
+
+
+def top_clusters(db: Session, days: int = None, limit: int = 5) -> list[dict]:
+    """
+    Most mentioned blocker clusters over the last `days` days (all history if None).
+    """
+    total = func.count(BlockerMention.id).label("total")
+    query = db.query(BlockerMention.cluster_id, total)
+    if days:
+        query = query.filter(BlockerMention.day >= datetime.utcnow().date() - timedelta(days=days - 1))
+    rows = query.group_by(BlockerMention.cluster_id).order_by(total.desc()).limit(limit).all()
+
+    clusters = {c.id: c for c in db.query(BlockerCluster).filter(BlockerCluster.id.in_([r.cluster_id for r in rows]))}
+    return [
+        {
+            "cluster_id": row.cluster_id,
+            "label": clusters[row.cluster_id].label,
+            "count": int(row.total),
+            "first_seen": clusters[row.cluster_id].first_seen,
+            "last_seen": clusters[row.cluster_id].last_seen,
+        }
+        for row in rows
+    ]
@@ -1,21 +1,15 @@
-from transformers import pipeline
+from app.services.model_registry import get_emotion_classifier
 
-# Load the emotion classification pipeline (one time only, outside function)
-emotion_classifier = pipeline(
-    "text-classification",
-    model="j-hartmann/emotion-english-distilroberta-base",
-    return_all_scores=False,
-    top_k=None
-)
 
 def detect_emotion(text: str) -> str:
     try:
-        result = emotion_classifier(text)
+        # Shared classifier, loaded once per process by the model registry
+        result = get_emotion_classifier()([text])[0]
 
         # Debug print (optional, remove in prod)
         print("Emotion classification result:", result)
 
-        # Check format and return label
+        # Check format and return label (scores are sorted, best first)
         if isinstance(result, list) and isinstance(result[0], dict) and 'label' in result[0]:
             return result[0]['label']
         else:
@@ -0,0 +1,238 @@
+# app/services/insights.py
+#
+# LLM trend insights as a map-reduce over days:
+#   map     each day's logs -> a small JSON summary (days run in parallel;
+#           a day too large for one prompt is split and merged)
+#   reduce  the daily summaries -> the final report (merged hierarchically
+#           first if they don't fit in one prompt)
+# Daily summaries are cached in Redis under a fingerprint of the day's log
+# lines (the exact prompt input), so a new run only re-summarizes days whose
+# logs were added, edited or re-scored. Summaries that fell back to the
+# default (the model's reply was unusable) are never cached.
+
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from app.db.models import VoiceLog
+from app.services.llm_client import model_id
+from app.utils.llm_utils import FALLBACK_KEY, summarize_logs_partial, merge_partial_summaries, trend_report_from_partials
+
+# Days summarized at the same time
+INSIGHTS_CONCURRENCY = int(os.getenv("INSIGHTS_CONCURRENCY", "4"))
+# Max characters of log text / partial summaries per prompt, well inside
+# the model's context window once the instructions are added
+INSIGHTS_MAX_PROMPT_CHARS = int(os.getenv("INSIGHTS_MAX_PROMPT_CHARS", "6000"))
+INSIGHTS_CACHE_TTL = int(os.getenv("INSIGHTS_CACHE_TTL", str(30 * 24 * 3600)))
+# Bump when the prompts change, so cached summaries are not reused
+INSIGHTS_PROMPT_VERSION = "3"
+
+# A single log line is never longer than this
+MAX_LINE_CHARS = 1000
+
+EMPTY_REPORT = {
+    "top_blockers": [],
+    "frequent_next_steps": [],
+    "emotion_trend": "mixed",
+    "progress_health": "medium",
+    "risk_level": "low",
+    "ai_insights": "No standup logs in this window.",
+}
+
+
+def log_line(log: dict) -> str:
+    emotion = log.get("emotion") or log.get("sentiment") or "neutral"
+    line = (
+        f"- [{emotion}] {log.get('summary') or ''}"
+        f" | blockers: {', '.join(log.get('blockers') or []) or 'none'}"
+        f" | next: {', '.join(log.get('next_steps') or []) or 'none'}"
+        f" | progress: {', '.join(log.get('progress') or []) or 'none'}"
+    )
+    return line[:MAX_LINE_CHARS]
+
+
+def pack(items: list[str], max_chars: int = None) -> list[list[int]]:
+    """
+    Greedily groups item indexes so each group's text fits in max_chars.
+    """
+    max_chars = max_chars or INSIGHTS_MAX_PROMPT_CHARS
+    groups, current, size = [], [], 0
+    for i, item in enumerate(items):
+        if current and size + len(item) > max_chars:
+            groups.append(current)
+            current, size = [], 0
+        current.append(i)
+        size += len(item) + 1
+    if current:
+        groups.append(current)
+    return groups
+
+
+def is_fallback(summary: dict) -> bool:
+    return bool(summary.get(FALLBACK_KEY))
+
+
+def without_marker(summary: dict) -> dict:
+    return {k: v for k, v in summary.items() if k != FALLBACK_KEY}
+
+
+def _merge(partials: list[dict], scope: str) -> dict:
+    # A merge of fallback summaries is a fallback too
+    merged = merge_partial_summaries([without_marker(p) for p in partials], scope)
+    if any(is_fallback(p) for p in partials):
+        merged[FALLBACK_KEY] = True
+    return merged
+
+
+def merge_partials(partials: list[dict], scope: str) -> dict:
+    """
+    Merges partial summaries level by level until one is left.
+    """
+    while len(partials) > 1:
+        serialized = [json.dumps(p) for p in partials]
+        groups = pack(serialized)
+        if len(groups) == len(partials):
+            # Each partial alone fills a prompt: merge them pairwise
+            groups = [list(range(i, min(i + 2, len(partials)))) for i in range(0, len(partials), 2)]
+        partials = [
+            partials[g[0]] if len(g) == 1 else _merge([partials[i] for i in g], scope)
+            for g in groups
+        ]
+    return partials[0]
+
+
+def summarize_lines(lines: list[str], scope: str) -> dict:
+    """
+    Summary of any number of log lines: one prompt per chunk that fits,
+    then the chunk summaries are merged.
+    """
+    partials = [summarize_logs_partial([lines[i] for i in group], scope) for group in pack(lines)]
+    return merge_partials(partials, scope)
+
+
+def summarize_days(lines_by_day: dict[str, list[str]]) -> dict[str, dict]:
+    """
+    Map step: one summary per day, INSIGHTS_CONCURRENCY days at a time.
+    """
+    days = sorted(lines_by_day)
+
+    def summarize(day):
+        summary = summarize_lines(lines_by_day[day], f"{day} ({len(lines_by_day[day])} updates)")
+        return {"day": day, "log_count": len(lines_by_day[day]), **summary}
+
+    with ThreadPoolExecutor(max_workers=max(1, INSIGHTS_CONCURRENCY)) as executor:
+        return dict(zip(days, executor.map(summarize, days)))
+
+
+def reduce_days(day_summaries: list[dict]) -> dict:
+    """
+    Reduce step: consecutive days are merged into periods until every
+    summary fits in one prompt, then the final report is generated.
+    """
+    partials = sorted(day_summaries, key=lambda p: p["day"])
+    while len(partials) > 1 and len(pack([json.dumps(p) for p in partials])) > 1:
+        merged = []
+        for group in pack([json.dumps(p) for p in partials]):
+            chunk = [partials[i] for i in group]
+            if len(chunk) == 1:
+                merged.append(chunk[0])
+                continue
+            period = f"{chunk[0]['day'].split(' ')[0]} to {chunk[-1]['day'].split(' ')[-1]}"
+            summary = merge_partials(chunk, period)
+            merged.append({**summary, "day": period, "log_count": sum(p["log_count"] for p in chunk)})
+        if len(merged) == len(partials):
+            break
+        partials = merged
+    report = trend_report_from_partials([without_marker(p) for p in partials])
+    if any(is_fallback(p) for p in partials):
+        report[FALLBACK_KEY] = True
+    return report
+
+
+def analyze_logs(logs: list[dict]) -> dict:
+    """
+    Map-reduce report over an in-memory list of logs (no caching).
+    """
+    lines_by_day = defaultdict(list)
+    for log in logs:
+        lines_by_day[str(log["created_at"])[:10]].append(log_line(log))
+    if not lines_by_day:
+        return dict(EMPTY_REPORT)
+    return without_marker(reduce_days(list(summarize_days(lines_by_day).values())))
+
+
+def _day_key(day: str, fingerprint: str) -> str:
+    return f"insights:day:{INSIGHTS_PROMPT_VERSION}:{model_id()}:{day}:{fingerprint}"
+
+
+def day_fingerprint(lines: list[str]) -> str:
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()[:32]
+
+
+def window_lines(db, days: int) -> dict[str, list[str]]:
+    """
+    {day: log lines, oldest first} for the last `days` days.
+    """
+    since = datetime.combine(datetime.utcnow().date() - timedelta(days=days - 1), datetime.min.time())
+    rows = (
+        db.query(
+            VoiceLog.created_at, VoiceLog.summary, VoiceLog.emotion,
+            VoiceLog.blockers_json, VoiceLog.next_steps_json, VoiceLog.progress_json,
+        )
+        .filter(VoiceLog.created_at >= since)
+        .order_by(VoiceLog.created_at.asc(), VoiceLog.id.asc())
+    )
+    lines_by_day = defaultdict(list)
+    for row in rows:
+        lines_by_day[row.created_at.strftime("%Y-%m-%d")].append(log_line({
+            "summary": row.summary,
+            "emotion": row.emotion,
+            "blockers": json.loads(row.blockers_json) if row.blockers_json else [],
+            "next_steps": json.loads(row.next_steps_json) if row.next_steps_json else [],
+            "progress": json.loads(row.progress_json) if row.progress_json else [],
+        }))
+    return dict(lines_by_day)
+
+
+def trend_insights(conn, db, days: int = 7) -> dict:
+    """
+    Insights over the last `days` days. Only days whose logs changed since
+    the last run are summarized again; the final report is cached too.
+    """
+    lines_by_day = window_lines(db, days)
+    keys = {day: _day_key(day, day_fingerprint(lines)) for day, lines in lines_by_day.items()}
+
+    summaries = {}
+    for day, key in keys.items():
+        cached = conn.get(key)
+        if cached is not None:
+            summaries[day] = json.loads(cached)
+
+    missing = sorted(day for day in keys if day not in summaries)
+    if missing:
+        fresh = summarize_days({day: lines_by_day[day] for day in missing})
+        for day, summary in fresh.items():
+            if not is_fallback(summary):
+                conn.set(keys[day], json.dumps(summary), ex=INSIGHTS_CACHE_TTL)
+        summaries.update(fresh)
+    logging.info(f"Insights over {days} days: {len(keys)} days, {len(missing)} summarized")
+
+    final_key = "insights:final:" + hashlib.sha256("|".join(sorted(keys.values())).encode()).hexdigest()
+    cached = conn.get(final_key)
+    if cached is not None:
+        report = json.loads(cached)
+    else:
+        report = reduce_days(list(summaries.values())) if summaries else dict(EMPTY_REPORT)
+        if not is_fallback(report):
+            conn.set(final_key, json.dumps(report), ex=INSIGHTS_CACHE_TTL)
+
+    return {
+        **without_marker(report),
+        "window_days": days,
+        "daily": [without_marker(summaries[day]) for day in sorted(summaries)],
+        "resummarized_days": missing,
+    }
@@ -0,0 +1,78 @@
+# app/services/insights_cache.py
+#
+# Latest LLM trend insights per window, for the API. Computing insights
+# takes LLM calls, so it always happens in a worker (run_trend_insights on
+# the llm queue); the API serves the last result with its age and triggers
+# at most one refresh per window at a time, like app/services/trend_cache.py.
+
+import json
+import os
+import time
+
+# Age after which the insights of a window are recomputed in the background
+INSIGHTS_STALE_SECONDS = int(os.getenv("INSIGHTS_STALE_SECONDS", "3600"))
+INSIGHTS_LATEST_TTL = int(os.getenv("INSIGHTS_LATEST_TTL", str(7 * 24 * 3600)))
+# Max run time of one computation (many LLM calls); the refresh lock lasts as long
+INSIGHTS_JOB_TIMEOUT = int(os.getenv("INSIGHTS_JOB_TIMEOUT", "1800"))
+INSIGHTS_REFRESH_LOCK_SECONDS = INSIGHTS_JOB_TIMEOUT
+
+
+def latest_key(days: int) -> str:
+    return f"insights:latest:days={days}"
+
+
+def _lock_key(days: int) -> str:
+    return f"{latest_key(days)}:refreshing"
+
+
+def store_latest(conn, days: int, data: dict):
+    entry = {"computed_at": time.time(), "data": data}
+    conn.set(latest_key(days), json.dumps(entry), ex=INSIGHTS_LATEST_TTL)
+
+
+def request_refresh(conn, days: int, enqueue_refresh) -> bool:
+    """
+    Calls enqueue_refresh(days) unless a refresh of the window is already pending.
+    """
+    if conn.set(_lock_key(days), 1, nx=True, ex=INSIGHTS_REFRESH_LOCK_SECONDS):
+        enqueue_refresh(days)
+        return True
+    return False
+
+
+def release_refresh_lock(conn, days: int):
+    conn.delete(_lock_key(days))
+
+
+def cached_windows(conn) -> list[int]:
+    windows = []
+    for key in conn.scan_iter(match="insights:latest:days=*"):
+        key = key.decode()
+        if not key.endswith(":refreshing"):
+            windows.append(int(key.split("=", 1)[1]))
+    return windows
+
+
+def get_insights(conn, days: int, enqueue_refresh):
+    """
+    Last insights of the window plus their age, or None if they were
+    never computed (a refresh is then requested).
+    """
+    cached = conn.get(latest_key(days))
+    if cached is None:
+        request_refresh(conn, days, enqueue_refresh)
+        return None
+
+    entry = json.loads(cached)
+    age = max(time.time() - entry["computed_at"], 0)
+    refreshing = conn.exists(_lock_key(days)) > 0
+    if age > INSIGHTS_STALE_SECONDS and not refreshing:
+        refreshing = request_refresh(conn, days, enqueue_refresh)
+
+    return {
+        **entry["data"],
+        "computed_at": entry["computed_at"],
+        "age_seconds": round(age, 1),
+        "stale": age > INSIGHTS_STALE_SECONDS,
+        "refreshing": refreshing,
+    }
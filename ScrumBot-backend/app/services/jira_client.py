@@ -1,82 +1,104 @@
-from jira import JIRA
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+USE_MOCK = os.getenv("MOCK_JIRA", "false").lower() == "true"
+
 JIRA_SERVER = os.getenv("JIRA_SERVER")
 JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
 JIRA_PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY")
+# Seconds per Jira HTTP call; retries are handled by the outbox, not the client
+JIRA_TIMEOUT = float(os.getenv("JIRA_TIMEOUT", "10"))
 
-jira_options = {"server": JIRA_SERVER}
+_jira_client = None
 
-# Add a check for missing values to avoid silent failures
-assert JIRA_SERVER and JIRA_EMAIL and JIRA_API_TOKEN and JIRA_PROJECT_KEY, "JIRA env vars not set correctly."
 
-jira_client = JIRA(
-    options=jira_options,
-    basic_auth=(JIRA_EMAIL, JIRA_API_TOKEN)
-)
+class MockJIRAClient:
+    """
+    Stands in for Jira when MOCK_JIRA=true (local runs, load tests).
+    """
 
-def create_jira_issue(summary: str, description: str, issue_type: str = "Task"):
-    issue_dict = {
-        "project": {"key": JIRA_PROJECT_KEY},
-        "summary": summary,
-        "description": description,
-        "issuetype": {"name": issue_type},
-    }
-    issue = jira_client.create_issue(fields=issue_dict)
-    return issue.key
+    def __init__(self):
+        self._next = 1
 
-# import os
-# from dotenv import load_dotenv
+    def _fake_issue(self):
+        issue = type("FakeIssue", (), {"key": f"MOCK-{self._next}"})
+        self._next += 1
+        return issue
 
-# load_dotenv()
+    def create_issue(self, fields, prefetch=True):
+        print("MockJIRAClient used. Returning fake issue.")
+        return self._fake_issue()
 
-# USE_MOCK = os.getenv("MOCK_JIRA", "false").lower() == "true"
+    def create_issues(self, field_list, prefetch=True):
+        return [
+            {"status": "Success", "issue": self._fake_issue(), "error": None, "input_fields": fields}
+            for fields in field_list
+        ]
 
-# JIRA_SERVER = os.getenv("JIRA_SERVER")
-# JIRA_EMAIL = os.getenv("JIRA_EMAIL")
-# JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
-# JIRA_PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY")
 
+def get_jira_client():
+    """
+    Connects to Jira on first use, so importing this module stays cheap.
+    """
+    global _jira_client
+    if _jira_client is None:
+        if USE_MOCK:
+            print("🔧 MOCK_JIRA is enabled. Using MockJIRAClient.")
+            _jira_client = MockJIRAClient()
+            return _jira_client
 
-# class MockJIRAClient:
-#     def create_issue(self, fields):
-#         print("MockJIRAClient used. Returning fake issue.")
-#         return type("FakeIssue", (), {"key": "MOCK-123"})
+        from jira import JIRA
 
+        # Add a check for missing values to avoid silent failures
+        assert JIRA_SERVER and JIRA_EMAIL and JIRA_API_TOKEN and JIRA_PROJECT_KEY, "JIRA env vars not set correctly."
 
-# def get_jira_client():
-#     if USE_MOCK:
-#         print("🔧 MOCK_JIRA is enabled. Using MockJIRAClient.")
-#         return MockJIRAClient()
+        jira_options = {"server": JIRA_SERVER}
+        _jira_client = JIRA(
+            options=jira_options,
+            basic_auth=(JIRA_EMAIL, JIRA_API_TOKEN),
+            timeout=JIRA_TIMEOUT,
+            max_retries=0,
+        )
+    return _jira_client
 
-#     try:
-#         from jira import JIRA
 
-#         assert JIRA_SERVER and JIRA_EMAIL and JIRA_API_TOKEN and JIRA_PROJECT_KEY, \
-#             "JIRA env vars not set correctly."
+def issue_url(issue_key: str) -> str:
+    server = (JIRA_SERVER or "https://devpatel26612.atlassian.net").rstrip("/")
+    return f"{server}/browse/{issue_key}"
 
-#         jira_options = {"server": JIRA_SERVER}
-#         return JIRA(options=jira_options, basic_auth=(JIRA_EMAIL, JIRA_API_TOKEN))
-#     except Exception as e:
-#         print(f"Error initializing real Jira client: {e}")
-#         print("Falling back to MockJIRAClient.")
-#         return MockJIRAClient()
+
+def _issue_fields(summary: str, description: str, issue_type: str = "Task") -> dict:
+    return {
+        "project": {"key": JIRA_PROJECT_KEY},
+        "summary": summary,
+        "description": description,
+        "issuetype": {"name": issue_type},
+    }
 
 
-# jira_client = get_jira_client()
+def create_jira_issue(summary: str, description: str, issue_type: str = "Task"):
+    issue = get_jira_client().create_issue(fields=_issue_fields(summary, description, issue_type))
+    return issue.key
 
 
-# def create_jira_issue(summary: str, description: str, issue_type: str = "Task"):
-#     issue_dict = {
-#         "project": {"key": JIRA_PROJECT_KEY},
-#         "summary": summary,
-#         "description": description,
-#         "issuetype": {"name": issue_type},
-#     }
-#     issue = jira_client.create_issue(fields=issue_dict)
-#     print(f"Issue created: {issue.key}")
-#     return issue.key
+def create_jira_issues(issues: list[dict]) -> list[dict]:
+    """
+    Creates several issues in one bulk request.
+    issues: [{"summary", "description", "issue_type"?}, ...]
+    Returns one {"key", "error"} per issue, in order (key is None on error).
+    """
+    field_list = [
+        _issue_fields(issue["summary"], issue["description"], issue.get("issue_type", "Task"))
+        for issue in issues
+    ]
+    results = get_jira_client().create_issues(field_list=field_list, prefetch=False)
+    return [
+        {
+            "key": result["issue"].key if result["status"] == "Success" else None,
+            "error": None if result["status"] == "Success" else str(result["error"]),
+        }
+        for result in results
+    ]
@@ -0,0 +1,181 @@
+# app/services/jira_outbox.py
+#
+# Jira issues are not created inside the audio job. The job adds an outbox
+# row in the same transaction as the log, and a background job drains the
+# outbox: due rows are deduplicated by blocker, created with one bulk request
+# per JIRA_BULK_SIZE issues, and failures are retried with exponential
+# backoff. Near-duplicate blockers (same cluster) share one issue.
+# A slow or failing Jira never delays or fails saving a log.
+
+import hashlib
+import os
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models import BlockerCluster, JiraOutbox, VoiceLog
+from app.services.blocker_index import normalize_blocker
+from app.services.jira_client import create_jira_issues, issue_url
+
+JIRA_BULK_SIZE = int(os.getenv("JIRA_BULK_SIZE", "50"))
+JIRA_MAX_ATTEMPTS = int(os.getenv("JIRA_MAX_ATTEMPTS", "8"))
+# Backoff after the n-th failure: base * 2^(n-1), capped, with +-20% jitter
+JIRA_BACKOFF_BASE = float(os.getenv("JIRA_BACKOFF_BASE", "30"))
+JIRA_BACKOFF_MAX = float(os.getenv("JIRA_BACKOFF_MAX", "3600"))
+# A blocker seen again within this many days links to the existing issue
+JIRA_DEDUP_DAYS = int(os.getenv("JIRA_DEDUP_DAYS", "30"))
+
+
+def dedup_key(text: str) -> str:
+    return hashlib.sha256(normalize_blocker(text).encode()).hexdigest()
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(JIRA_BACKOFF_BASE * 2 ** (attempts - 1), JIRA_BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _existing_issue(db: Session, key: str):
+    """
+    Issue already created for the same blocker within the dedup window.
+    """
+    since = datetime.utcnow() - timedelta(days=JIRA_DEDUP_DAYS)
+    row = (
+        db.query(JiraOutbox.issue_key)
+        .filter(JiraOutbox.dedup_key == key, JiraOutbox.status == "done", JiraOutbox.created_at >= since)
+        .order_by(JiraOutbox.id.desc())
+        .first()
+    )
+    return row.issue_key if row else None
+
+
+def cluster_key(cluster: BlockerCluster) -> str:
+    """
+    Key of a blocker cluster: the hash of its seed blocker. Cluster ids are
+    reassigned by blocker_index.rebuild, so they never identify an issue.
+    """
+    return hashlib.sha256(cluster.normalized.encode()).hexdigest()
+
+
+def enqueue_blocker_issue(db: Session, log: VoiceLog, cluster: BlockerCluster = None):
+    """
+    Queues the Jira issue for the first blocker of a log (call before the
+    log's commit). Blockers are deduplicated by their cluster in the blocker
+    index when the cluster is given, by normalized text otherwise. If the
+    blocker already has an issue, the log links to it and nothing is queued.
+    Returns the outbox row, or None.
+    """
+    if not log.blockers:
+        return None
+
+    key = cluster_key(cluster) if cluster is not None else dedup_key(log.blockers[0])
+    issue_key = _existing_issue(db, key)
+    if issue_key:
+        log.jira_issue_url = issue_url(issue_key)
+        return None
+
+    row = JiraOutbox(
+        log_id=log.id,
+        dedup_key=key,
+        summary=f"Blocker from ScrumBot: {log.blockers[0]}",
+        description=f"Audio File: {log.filename}\nTranscript: {log.transcript}\nSummary: {log.summary}",
+    )
+    db.add(row)
+    return row
+
+
+def _link(db: Session, rows: list, issue_key: str):
+    url = issue_url(issue_key)
+    for row in rows:
+        row.status = "done"
+        row.issue_key = issue_key
+        row.last_error = None
+    db.query(VoiceLog).filter(VoiceLog.id.in_([row.log_id for row in rows])).update(
+        {VoiceLog.jira_issue_url: url}, synchronize_session=False
+    )
+
+
+def _fail(rows: list, error: str):
+    now = datetime.utcnow()
+    for row in rows:
+        row.attempts += 1
+        row.last_error = error[:2000]
+        if row.attempts >= JIRA_MAX_ATTEMPTS:
+            row.status = "failed"
+        else:
+            row.next_attempt_at = now + timedelta(seconds=backoff_seconds(row.attempts))
+
+
+def drain(db: Session, limit: int = 500) -> dict:
+    """
+    Creates the issues of every due outbox row (up to `limit` rows).
+    Rows for the same blocker share one issue. Commits after each bulk request.
+    """
+    due = (
+        db.query(JiraOutbox)
+        .filter(JiraOutbox.status == "pending", JiraOutbox.next_attempt_at <= datetime.utcnow())
+        .order_by(JiraOutbox.id.asc())
+        .limit(limit)
+        .all()
+    )
+
+    groups = {}
+    for row in due:
+        groups.setdefault(row.dedup_key, []).append(row)
+
+    created = linked = failed = 0
+    to_create = []
+    for key, rows in groups.items():
+        issue_key = _existing_issue(db, key)
+        if issue_key:
+            _link(db, rows, issue_key)
+            linked += len(rows)
+        else:
+            to_create.append(rows)
+    db.commit()
+
+    for start in range(0, len(to_create), JIRA_BULK_SIZE):
+        batch = to_create[start:start + JIRA_BULK_SIZE]
+        issues = [
+            {"summary": rows[0].summary, "description": rows[0].description, "issue_type": rows[0].issue_type}
+            for rows in batch
+        ]
+        try:
+            results = create_jira_issues(issues)
+        except Exception as e:
+            # Jira down or timing out: the whole request is retried later
+            results = [{"key": None, "error": f"{type(e).__name__}: {e}"}] * len(batch)
+
+        for rows, result in zip(batch, results):
+            if result["key"]:
+                _link(db, rows, result["key"])
+                created += 1
+                linked += len(rows) - 1
+            else:
+                _fail(rows, result["error"] or "unknown error")
+                failed += len(rows)
+        db.commit()
+
+    return {"due": len(due), "created": created, "linked": linked, "failed": failed}
+
+
+def next_retry_in(db: Session):
+    """
+    Seconds until the next pending row is due (None if nothing is pending).
+    """
+    next_at = db.query(func.min(JiraOutbox.next_attempt_at)).filter(JiraOutbox.status == "pending").scalar()
+    if next_at is None:
+        return None
+    return max((next_at - datetime.utcnow()).total_seconds(), 0)
+
+
+def get_stats(db: Session) -> dict:
+    counts = dict(db.query(JiraOutbox.status, func.count(JiraOutbox.id)).group_by(JiraOutbox.status).all())
+    return {
+        "pending": counts.get("pending", 0),
+        "done": counts.get("done", 0),
+        "failed": counts.get("failed", 0),
+        "next_retry_in": next_retry_in(db),
+    }
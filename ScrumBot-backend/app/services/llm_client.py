@@ -0,0 +1,178 @@
+# app/services/llm_client.py
+#
+# Every LLM request goes through here. Two backends:
+#   ollama  one ollama.Client per (host, timeout) per process; its HTTP client
+#           keeps connections alive and is shared by all threads
+#   stub    deterministic replies after LLM_STUB_LATENCY seconds, no server
+#           needed (load tests and pipeline benchmarks run offline)
+# Model, timeout, num_ctx and keep_alive default to the LLM_* settings and
+# can be overridden per call. Nothing here imports ollama until it is used,
+# so the API can import this module.
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "ollama").lower()
+LLM_MODEL = os.getenv("LLM_MODEL", "mistral")
+# Ollama server (default: OLLAMA_HOST, else http://localhost:11434)
+LLM_HOST = os.getenv("LLM_HOST") or os.getenv("OLLAMA_HOST")
+# Seconds before a request to the LLM server is abandoned
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+# Context window in tokens (unset: the model's default)
+LLM_NUM_CTX = int(os.getenv("LLM_NUM_CTX", "0")) or None
+# How long Ollama keeps the model loaded after a request
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "30m")
+# Stub backend: seconds per request, and per streamed token
+LLM_STUB_LATENCY = float(os.getenv("LLM_STUB_LATENCY", "0.05"))
+LLM_STUB_TOKEN_LATENCY = float(os.getenv("LLM_STUB_TOKEN_LATENCY", "0"))
+
+
+class OllamaBackend:
+    name = "ollama"
+
+    def __init__(self, host: str = None):
+        self.host = host
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client(self, timeout: float):
+        # httpx clients are thread safe: one per timeout, shared by all threads
+        with self._lock:
+            if timeout not in self._clients:
+                import ollama
+                self._clients[timeout] = ollama.Client(host=self.host, timeout=timeout)
+            return self._clients[timeout]
+
+    def chat(self, model, messages, options, format, keep_alive, timeout) -> str:
+        response = self.client(timeout).chat(
+            model=model, messages=messages, options=options, format=format or "", keep_alive=keep_alive
+        )
+        return response["message"]["content"]
+
+    def stream(self, model, messages, options, format, keep_alive, timeout):
+        chunks = self.client(timeout).chat(
+            model=model, messages=messages, options=options, format=format or "", keep_alive=keep_alive, stream=True
+        )
+        for chunk in chunks:
+            if chunk["message"]["content"]:
+                yield chunk["message"]["content"]
+
+
+def _stub_value(schema: dict, seed: str):
+    kind = schema.get("type")
+    if "enum" in schema:
+        return schema["enum"][int(seed[:2], 16) % len(schema["enum"])]
+    if kind == "object":
+        return {key: _stub_value(sub, seed) for key, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [_stub_value(schema.get("items", {"type": "string"}), seed)]
+    if kind in ("integer", "number"):
+        return int(seed[:4], 16) % 100
+    if kind == "boolean":
+        return int(seed[:2], 16) % 2 == 0
+    return f"stub {seed[:8]}"
+
+
+class StubBackend:
+    """
+    Replies are a function of the request only: text requests echo the quoted
+    input (as a transcript cleaner would), JSON requests get an object
+    matching the schema (or a minimal summary object for format="json").
+    """
+    name = "stub"
+
+    def __init__(self, latency: float, token_latency: float = 0.0):
+        self.latency = latency
+        self.token_latency = token_latency
+
+    def reply(self, model, messages, format) -> str:
+        content = messages[-1]["content"]
+        seed = hashlib.sha256(f"{model}\n{content}".encode()).hexdigest()
+        if isinstance(format, dict):
+            return json.dumps(_stub_value(format, seed))
+        if format == "json":
+            return json.dumps({"summary": f"stub {seed[:8]}"})
+        quoted = re.search(r'Input: "(.*)"', content, flags=re.DOTALL)
+        return quoted.group(1) if quoted else f"stub reply {seed[:8]}"
+
+    def chat(self, model, messages, options, format, keep_alive, timeout) -> str:
+        time.sleep(self.latency)
+        return self.reply(model, messages, format)
+
+    def stream(self, model, messages, options, format, keep_alive, timeout):
+        time.sleep(self.latency)
+        for token in re.findall(r"\S+\s*", self.reply(model, messages, format)):
+            time.sleep(self.token_latency)
+            yield token
+
+
+BACKENDS = {
+    "ollama": lambda: OllamaBackend(LLM_HOST),
+    "stub": lambda: StubBackend(LLM_STUB_LATENCY, LLM_STUB_TOKEN_LATENCY),
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if LLM_BACKEND not in BACKENDS:
+                raise ValueError(f"Unknown LLM_BACKEND {LLM_BACKEND!r} (expected one of {', '.join(BACKENDS)})")
+            _backend = BACKENDS[LLM_BACKEND]()
+        return _backend
+
+
+def model_id(model: str = None) -> str:
+    """
+    Model name as used in cache keys: stub replies never share keys with real ones.
+    """
+    model = model or LLM_MODEL
+    return model if LLM_BACKEND == "ollama" else f"{LLM_BACKEND}:{model}"
+
+
+def request_options(options: dict = None, num_ctx: int = None) -> dict:
+    """
+    Model options sent with a request (num_ctx filled in from LLM_NUM_CTX).
+    """
+    options = dict(options or {})
+    num_ctx = num_ctx or LLM_NUM_CTX
+    if num_ctx:
+        options.setdefault("num_ctx", num_ctx)
+    return options or None
+
+
+def chat(messages: list, model: str = None, options: dict = None, format=None,
+         timeout: float = None, num_ctx: int = None, keep_alive=None) -> str:
+    """
+    Content of the assistant's reply.
+    """
+    return get_backend().chat(
+        model or LLM_MODEL,
+        messages,
+        request_options(options, num_ctx),
+        format,
+        keep_alive or LLM_KEEP_ALIVE,
+        timeout or LLM_TIMEOUT,
+    )
+
+
+def stream_chat(messages: list, model: str = None, options: dict = None, format=None,
+                timeout: float = None, num_ctx: int = None, keep_alive=None):
+    """
+    The reply as it is generated, piece by piece.
+    """
+    yield from get_backend().stream(
+        model or LLM_MODEL,
+        messages,
+        request_options(options, num_ctx),
+        format,
+        keep_alive or LLM_KEEP_ALIVE,
+        timeout or LLM_TIMEOUT,
+    )
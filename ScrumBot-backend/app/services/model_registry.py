@@ -0,0 +1,212 @@
+# app/services/model_registry.py
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+# Model configuration (override via env vars)
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # 'int8' is fastest on CPU
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+# Concurrent transcriptions one WhisperModel can run (shared weights)
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "1"))
+EMOTION_MODEL = os.getenv("EMOTION_MODEL", "j-hartmann/emotion-english-distilroberta-base")
+SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "sshleifer/distilbart-cnn-12-6")
+
+# Comma separated list of models to load before the worker starts ("all" for
+# every model; the pipeline only uses whisper and emotion)
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "")
+
+# Per-process model stats, shared through Redis for GET /metrics/models
+STATS_KEY = "model_stats"
+STATS_TTL = 7 * 24 * 3600
+
+_models = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+def available_cores() -> int:
+    """
+    CPUs this process may run on (honors affinity / container cpusets).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Worker processes transcribing on this machine (set by the worker
+# entrypoint for the processes it spawns; each loads its own model)
+WORKER_PROCESS_COUNT = max(1, int(os.getenv("WORKER_PROCESS_COUNT", "1")))
+
+
+def default_cpu_threads(processes: int = 1) -> int:
+    """
+    Threads per transcription when the cores are shared evenly between
+    `processes` worker processes running WHISPER_NUM_WORKERS transcriptions each.
+    """
+    return max(1, available_cores() // (max(1, processes) * WHISPER_NUM_WORKERS))
+
+
+# Threads per concurrent transcription; by default the cores are shared
+# evenly between all the transcriptions of all the worker processes
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0")) or default_cpu_threads(WORKER_PROCESS_COUNT)
+
+
+def _rss_bytes() -> int:
+    """
+    Current resident set size of this process (0 if it can't be read).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _param_bytes(hf_pipeline) -> int:
+    """
+    Size of the weights of a transformers pipeline, in bytes.
+    """
+    try:
+        return sum(p.numel() * p.element_size() for p in hf_pipeline.model.parameters())
+    except Exception:
+        return 0
+
+
+def _load_whisper():
+    from faster_whisper import WhisperModel
+    return WhisperModel(
+        WHISPER_MODEL_SIZE,
+        compute_type=WHISPER_COMPUTE_TYPE,
+        device=WHISPER_DEVICE,
+        num_workers=WHISPER_NUM_WORKERS,
+        cpu_threads=WHISPER_CPU_THREADS,
+    )
+
+
+def _load_emotion():
+    from transformers import pipeline
+    # top_k=None returns the score of every label, sorted by score
+    return pipeline("text-classification", model=EMOTION_MODEL, top_k=None)
+
+
+def _load_summarizer():
+    from transformers import pipeline
+    return pipeline("summarization", model=SUMMARIZER_MODEL)
+
+
+_LOADERS = {
+    "whisper": (
+        _load_whisper,
+        lambda: f"{WHISPER_MODEL_SIZE} ({WHISPER_COMPUTE_TYPE}, {WHISPER_DEVICE}, "
+                f"{WHISPER_NUM_WORKERS} workers x {WHISPER_CPU_THREADS} threads)",
+    ),
+    "emotion": (_load_emotion, lambda: EMOTION_MODEL),
+    "summarizer": (_load_summarizer, lambda: SUMMARIZER_MODEL),
+}
+
+
+def get_model(name: str):
+    """
+    Returns the named model, loading it on first use.
+    The model then stays resident for the life of the process.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _LOADERS:
+        raise KeyError(f"Unknown model: {name}")
+
+    with _lock:
+        model = _models.get(name)
+        if model is None:
+            loader, describe = _LOADERS[name]
+            logging.info(f"Loading model '{name}': {describe()}")
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            model = loader()
+            _stats[name] = {
+                "model": describe(),
+                "load_seconds": round(time.perf_counter() - started, 3),
+                "rss_delta_bytes": max(_rss_bytes() - rss_before, 0),
+                "param_bytes": _param_bytes(model) if name != "whisper" else None,
+                "loaded_at": time.time(),
+                "pid": os.getpid(),
+            }
+            _models[name] = model
+            logging.info(
+                f"Model '{name}' loaded in {_stats[name]['load_seconds']}s "
+                f"(+{_stats[name]['rss_delta_bytes'] / 2**20:.0f} MiB RSS)"
+            )
+            publish_model_stats()
+    return model
+
+
+def get_whisper_model():
+    return get_model("whisper")
+
+
+def get_emotion_classifier():
+    return get_model("emotion")
+
+
+def get_summarizer():
+    return get_model("summarizer")
+
+
+def warm_up(names=None) -> dict:
+    """
+    Loads the given models (all of them by default) and returns their stats.
+    """
+    for name in names or _LOADERS.keys():
+        get_model(name)
+    return get_model_stats()
+
+
+def preload_from_env() -> dict:
+    """
+    Loads the models listed in PRELOAD_MODELS, e.g. "whisper,emotion" or "all".
+    """
+    names = [n.strip() for n in PRELOAD_MODELS.split(",") if n.strip()]
+    if not names:
+        return {}
+    if "all" in names:
+        names = None
+    return warm_up(names)
+
+
+def get_model_stats() -> dict:
+    """
+    Load time and memory footprint of every model loaded so far in this process.
+    """
+    return {
+        "loaded": {name: dict(stats) for name, stats in _stats.items()},
+        "available": list(_LOADERS.keys()),
+        "process_rss_bytes": _rss_bytes(),
+    }
+
+
+def publish_model_stats():
+    """
+    Shares this process's model stats with the API (one hash field per process).
+    """
+    try:
+        from app.services.queues import get_redis
+        conn = get_redis()
+        conn.hset(STATS_KEY, f"{socket.gethostname()}:{os.getpid()}", json.dumps(get_model_stats()))
+        conn.expire(STATS_KEY, STATS_TTL)
+    except Exception as e:
+        logging.debug(f"Could not publish model stats: {e}")
+
+
+def get_shared_model_stats(conn) -> dict:
+    """
+    {"host:pid": model stats} of every worker process that loaded a model.
+    """
+    return {k.decode(): json.loads(v) for k, v in conn.hgetall(STATS_KEY).items()}
@@ -0,0 +1,123 @@
+# app/services/progress.py
+#
+# Per-job progress events. The worker publishes each pipeline step to a
+# Redis pub/sub channel (and keeps the last event, for late subscribers);
+# the API relays them to clients as Server-Sent Events.
+
+import asyncio
+import json
+import os
+import time
+
+from rq.job import Job
+
+# Stages after which no more events are published for a job
+TERMINAL_STAGES = {"saved", "cached", "failed"}
+# Seconds the last event of a job is kept
+PROGRESS_TTL = 3600
+# Seconds between SSE keep-alive comments
+HEARTBEAT_SECONDS = 15
+# While no event arrives, the RQ status of the jobs is checked this often, so
+# a stream ends for jobs that are unknown, expired or died without a
+# terminal event
+JOB_STATUS_CHECK_SECONDS = 5
+# A stream is closed after this long whatever happens (clients fall back to polling)
+PROGRESS_STREAM_MAX_SECONDS = int(os.getenv("PROGRESS_STREAM_MAX_SECONDS", "1800"))
+# RQ statuses after which a job will never publish again
+ENDED_JOB_STATUSES = {"finished", "failed", "stopped", "canceled"}
+
+
+def channel(job_id: str) -> str:
+    return f"job_progress:{job_id}"
+
+
+def _last_key(job_id: str) -> str:
+    return f"job_progress:{job_id}:last"
+
+
+def publish_progress(conn, job_id: str, stage: str, **data):
+    """
+    Publishes one progress event, e.g. publish_progress(conn, id, "cleaning", chunk=2, total=5).
+    Nothing is published once the job's last event is terminal, so a late
+    event cannot hide the outcome from subscribers that arrive later.
+    """
+    last = conn.get(_last_key(job_id))
+    if last is not None and json.loads(last)["stage"] in TERMINAL_STAGES:
+        return
+    event = json.dumps({"job_id": job_id, "stage": stage, "ts": time.time(), **data})
+    conn.set(_last_key(job_id), event, ex=PROGRESS_TTL)
+    conn.publish(channel(job_id), event)
+
+
+def _sse(event: str) -> str:
+    return f"event: progress\ndata: {event}\n\n"
+
+
+async def _ended_jobs(async_conn, job_ids) -> dict:
+    """
+    {job id: RQ status} of the jobs that ended or no longer exist (status None).
+    """
+    ended = {}
+    for job_id in job_ids:
+        status = await async_conn.hget(Job.key_for(job_id), "status")
+        status = status.decode() if status is not None else None
+        if status is None or status in ENDED_JOB_STATUSES:
+            ended[job_id] = status
+    return ended
+
+
+async def stream_events(async_conn, job_ids: list[str], max_seconds: float = None):
+    """
+    Async generator of SSE frames for the given jobs. Starts with the last
+    known event of each job and ends once every job reached a terminal stage.
+    A job that is unknown, or ended without a terminal event (worker died),
+    gets a "failed" event ("finished" jobs are just dropped: their result is
+    on /task_status). The stream ends after max_seconds in any case.
+    """
+    deadline = time.monotonic() + (max_seconds or PROGRESS_STREAM_MAX_SECONDS)
+    pending = set(job_ids)
+    pubsub = async_conn.pubsub()
+    await pubsub.subscribe(*[channel(job_id) for job_id in job_ids])
+
+    try:
+        # Replay the current state (subscribed first, so nothing is missed)
+        for job_id in job_ids:
+            last = await async_conn.get(_last_key(job_id))
+            if last is not None:
+                yield _sse(last.decode())
+                if json.loads(last)["stage"] in TERMINAL_STAGES:
+                    pending.discard(job_id)
+
+        last_sent = last_checked = time.monotonic()
+        while pending and time.monotonic() < deadline:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message is None:
+                if time.monotonic() - last_checked > JOB_STATUS_CHECK_SECONDS:
+                    # Only when idle: a terminal event is published before
+                    # RQ marks the job ended, so it would already be here
+                    last_checked = time.monotonic()
+                    for job_id, status in (await _ended_jobs(async_conn, pending)).items():
+                        pending.discard(job_id)
+                        if status != "finished":
+                            error = f"Job {status}" if status else "Job not found or expired"
+                            yield _sse(json.dumps({"job_id": job_id, "stage": "failed", "error": error, "ts": time.time()}))
+                            last_sent = time.monotonic()
+                    if not pending:
+                        break
+                # last_sent only moves when a frame goes out, or proxies
+                # would cut idle streams of long jobs
+                if time.monotonic() - last_sent > HEARTBEAT_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                await asyncio.sleep(0)
+                continue
+
+            data = message["data"].decode()
+            yield _sse(data)
+            last_sent = time.monotonic()
+            event = json.loads(data)
+            if event["stage"] in TERMINAL_STAGES:
+                pending.discard(event["job_id"])
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
@@ -0,0 +1,195 @@
+# app/services/queues.py
+#
+# One pooled Redis client and one Queue object per name, shared by every
+# request handler (via FastAPI dependencies) and by the worker process.
+#
+# Jobs are split into priority classes, highest first:
+#   interactive  uploads a user is waiting on (ASR + LLM pipeline)
+#   llm          LLM-only jobs (insights)
+#   analytics    trend refreshes
+#   backfill     bulk repairs and re-scoring
+# Workers take jobs in that order, and uploads are refused (429) when
+# the interactive queue is already QUEUE_MAX_DEPTH deep.
+
+import math
+import os
+import threading
+
+import redis
+from rq import Queue
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6380")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+# Seconds a caller waits for a free pooled connection before erroring
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "10"))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "2"))
+
+INTERACTIVE = "interactive"
+LLM = "llm"
+ANALYTICS = "analytics"
+BACKFILL = "backfill"
+# Listen order of the workers; "default" is last so jobs enqueued before
+# the split are still drained
+QUEUE_PRIORITY = [INTERACTIVE, LLM, ANALYTICS, BACKFILL, "default"]
+
+# Waiting jobs above which new interactive work is refused
+QUEUE_MAX_DEPTH = int(os.getenv("QUEUE_MAX_DEPTH", "50"))
+# Job duration assumed for ETAs until real durations were recorded
+QUEUE_DEFAULT_JOB_SECONDS = float(os.getenv("QUEUE_DEFAULT_JOB_SECONDS", "60"))
+
+DURATIONS_KEY = "queue_stats:job_seconds"
+# Weight of the newest job in the moving average of durations
+DURATION_SMOOTHING = 0.2
+
+_pool = None
+_client = None
+_async_client = None
+_queues = {}
+_lock = threading.Lock()
+
+
+def get_pool() -> redis.BlockingConnectionPool:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                # Blocking pool: bursts wait for a free connection instead of
+                # opening sockets without limit
+                _pool = redis.BlockingConnectionPool.from_url(
+                    REDIS_URL,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    timeout=REDIS_POOL_TIMEOUT,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+                    health_check_interval=30,
+                )
+    return _pool
+
+
+def get_redis() -> redis.Redis:
+    """
+    Shared client backed by the pool (also usable as a FastAPI dependency).
+    """
+    global _client
+    if _client is None:
+        _client = redis.Redis(connection_pool=get_pool())
+    return _client
+
+
+def get_async_redis():
+    """
+    asyncio client for long-lived async work in the API (pub/sub relays).
+    """
+    global _async_client
+    if _async_client is None:
+        import redis.asyncio
+        _async_client = redis.asyncio.from_url(
+            REDIS_URL,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        )
+    return _async_client
+
+
+def get_queue(name: str = "default") -> Queue:
+    queue = _queues.get(name)
+    if queue is None:
+        with _lock:
+            queue = _queues.setdefault(name, Queue(name, connection=get_redis()))
+    return queue
+
+
+# FastAPI dependencies, one per priority class
+def get_interactive_queue() -> Queue:
+    return get_queue(INTERACTIVE)
+
+
+def get_llm_queue() -> Queue:
+    return get_queue(LLM)
+
+
+def get_analytics_queue() -> Queue:
+    return get_queue(ANALYTICS)
+
+
+def get_backfill_queue() -> Queue:
+    return get_queue(BACKFILL)
+
+
+class QueueFull(Exception):
+    def __init__(self, queue_name: str, depth: int, retry_after: int):
+        super().__init__(f"Queue '{queue_name}' is full ({depth} jobs waiting), retry in {retry_after}s")
+        self.queue_name = queue_name
+        self.depth = depth
+        self.retry_after = retry_after
+
+
+def record_duration(conn, queue_name: str, seconds: float):
+    """
+    Folds one finished job's duration into the moving average of its queue.
+    """
+    previous = conn.hget(DURATIONS_KEY, queue_name)
+    average = seconds if previous is None else (
+        DURATION_SMOOTHING * seconds + (1 - DURATION_SMOOTHING) * float(previous)
+    )
+    conn.hset(DURATIONS_KEY, queue_name, round(average, 3))
+
+
+def average_duration(conn, queue_name: str) -> float:
+    value = conn.hget(DURATIONS_KEY, queue_name)
+    return float(value) if value is not None else QUEUE_DEFAULT_JOB_SECONDS
+
+
+def estimate_wait(queue: Queue, position: int) -> int:
+    """
+    Seconds until the job at `position` (1 = next) starts, given the workers
+    listening on the queue and the average job duration.
+    """
+    from rq import Worker
+    workers = max(Worker.count(queue=queue), 1)
+    return math.ceil(math.ceil(position / workers) * average_duration(queue.connection, queue.name))
+
+
+def admit(queue: Queue, max_depth: int = None) -> dict:
+    """
+    Admission control before enqueueing: raises QueueFull when the queue
+    already holds max_depth waiting jobs, otherwise returns the position
+    and ETA the new job will get.
+    """
+    max_depth = QUEUE_MAX_DEPTH if max_depth is None else max_depth
+    depth = queue.count
+    if depth >= max_depth:
+        raise QueueFull(queue.name, depth, estimate_wait(queue, depth - max_depth + 1))
+    position = depth + 1
+    return {"queue": queue.name, "queue_position": position, "eta_seconds": estimate_wait(queue, position)}
+
+
+def pool_stats() -> dict:
+    pool = get_pool()
+    created = len(getattr(pool, "_connections", []))
+    idle = sum(1 for c in getattr(getattr(pool, "pool", None), "queue", []) if c)
+    return {
+        "url": pool.connection_kwargs.get("host", "") + ":" + str(pool.connection_kwargs.get("port", "")),
+        "max_connections": pool.max_connections,
+        "created_connections": created,
+        "idle_connections": idle,
+        "in_use_connections": created - idle,
+        "queues": sorted(_queues.keys()),
+    }
+
+
+def queue_stats() -> dict:
+    """
+    Waiting jobs, workers and average job duration per priority class.
+    """
+    from rq import Worker
+    conn = get_redis()
+    return {
+        name: {
+            "waiting": get_queue(name).count,
+            "workers": Worker.count(queue=get_queue(name)),
+            "avg_job_seconds": average_duration(conn, name),
+        }
+        for name in QUEUE_PRIORITY
+    }
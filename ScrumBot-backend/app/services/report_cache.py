@@ -0,0 +1,73 @@
+# app/services/report_cache.py
+#
+# Rendered sprint reports cached per (window, format, transcripts).
+# Keys embed a generation number that is bumped whenever logs are added or
+# changed, so every cached report is invalidated at once by a single INCR;
+# superseded entries simply expire.
+
+import logging
+import os
+
+# Also bounds how far a cached "last N days" window can lag behind the clock
+REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", "600"))
+# Larger reports are streamed but not cached
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
+GENERATION_KEY = "report_cache:generation"
+
+
+def cache_key(conn, days: int, fmt: str, include_transcripts: bool):
+    """
+    Cache key of a report, or None when Redis is unreachable (the report is
+    then rendered without the cache).
+    """
+    try:
+        generation = int(conn.get(GENERATION_KEY) or 0)
+    except Exception as e:
+        logging.warning(f"Report cache unavailable, rendering without it: {e}")
+        return None
+    return f"report:{generation}:days={days}:{fmt}:transcripts={int(include_transcripts)}"
+
+
+def get(conn, key: str):
+    if key is None:
+        return None
+    try:
+        return conn.get(key)
+    except Exception as e:
+        logging.warning(f"Could not read cached report: {e}")
+        return None
+
+
+def invalidate(conn):
+    """
+    Drops every cached report (call after logs are saved or updated).
+    """
+    if conn is None:
+        return
+    try:
+        conn.incr(GENERATION_KEY)
+    except Exception as e:
+        logging.warning(f"Could not invalidate cached reports: {e}")
+
+
+def stream_and_store(conn, key: str, chunks):
+    """
+    Passes the report chunks through and caches the whole report once
+    it is complete (unless it exceeds REPORT_CACHE_MAX_BYTES or key is None).
+    """
+    parts, size = ([], 0) if key is not None else (None, 0)
+    for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            if size <= REPORT_CACHE_MAX_BYTES:
+                parts.append(chunk)
+            else:
+                parts = None
+        yield chunk
+
+    if parts is not None:
+        try:
+            conn.set(key, b"".join(parts), ex=REPORT_CACHE_TTL)
+        except Exception as e:
+            logging.warning(f"Could not cache report: {e}")
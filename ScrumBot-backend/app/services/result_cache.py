@@ -0,0 +1,81 @@
+# app/services/result_cache.py
+
+import hashlib
+import os
+
+from app.db.models import VoiceLog
+from app.services.llm_client import model_id
+from app.services.model_registry import (
+    WHISPER_MODEL_SIZE,
+    WHISPER_COMPUTE_TYPE,
+    EMOTION_MODEL,
+)
+
+# Bump when prompts or pipeline logic change, so older results are not reused
+PROMPT_VERSION = "2"
+# How long a processed recording can be reused (default 30 days)
+AUDIO_CACHE_TTL = int(os.getenv("AUDIO_CACHE_TTL", str(30 * 24 * 3600)))
+
+STATS_KEY = "audio_result_cache:stats"
+
+
+def pipeline_version() -> str:
+    """
+    Short fingerprint of every model / prompt that shapes a VoiceLog.
+    """
+    parts = [PROMPT_VERSION, WHISPER_MODEL_SIZE, WHISPER_COMPUTE_TYPE, model_id(), EMOTION_MODEL]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:12]
+
+
+def _key(content_hash: str) -> str:
+    return f"audio_result:{pipeline_version()}:{content_hash}"
+
+
+def lookup(conn, db, content_hash: str):
+    """
+    Returns the id of a VoiceLog the current pipeline already produced from
+    this audio, or None. Redis first, then the content_hash column, so
+    dedup survives a Redis flush (the Redis entry is restored on a database
+    hit). conn may be None (database only). Counts a hit or a miss.
+    """
+    log_id = None
+    if conn is not None:
+        cached = conn.get(_key(content_hash))
+        if cached is not None:
+            if db.query(VoiceLog.id).filter(VoiceLog.id == int(cached)).first() is not None:
+                log_id = int(cached)
+            else:
+                # The log was deleted
+                conn.delete(_key(content_hash))
+
+    if log_id is None:
+        row = (
+            db.query(VoiceLog.id)
+            .filter(VoiceLog.content_hash == content_hash, VoiceLog.pipeline_version == pipeline_version())
+            .order_by(VoiceLog.id.desc())
+            .first()
+        )
+        if row is not None:
+            log_id = row.id
+            if conn is not None:
+                store(conn, content_hash, log_id)
+
+    if conn is not None:
+        conn.hincrby(STATS_KEY, "hits" if log_id is not None else "misses", 1)
+    return log_id
+
+
+def store(conn, content_hash: str, log_id: int):
+    conn.set(_key(content_hash), log_id, ex=AUDIO_CACHE_TTL)
+
+
+def get_stats(conn) -> dict:
+    stats = {k.decode(): int(v) for k, v in conn.hgetall(STATS_KEY).items()}
+    hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+    total = hits + misses
+    return {
+        "pipeline_version": pipeline_version(),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+    }
@@ -1,8 +1,7 @@
-from transformers import pipeline
+from app.services.model_registry import get_summarizer
 
 
-summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6")
-
 def summarize(text: str) -> str:
+    summarizer = get_summarizer()
     result = summarizer(text, max_length=60, min_length=10, do_sample=False)
     return result[0]['summary_text']
@@ -1,24 +1,56 @@
 # app/services/transcriber.py
 
-from faster_whisper import WhisperModel
-from app.utils.transcript_utils import clean_transcript_chunkwise
-from app.utils.emotion_utils import detect_emotions
+import os
+from concurrent.futures import ThreadPoolExecutor
 
+from app.services.model_registry import get_whisper_model
+from app.services.audio_preprocess import preprocess_audio
 
-def transcribe_audio(audio_path: str) -> str:
-    # Use 'int8' for better performance on CPU
-    model = WhisperModel("base", compute_type="int8", device="cpu")
-    
-    segments, _ = model.transcribe(audio_path)
+# Transcribe up to N speech regions of one recording concurrently
+# (needs WHISPER_NUM_WORKERS >= N to actually run in parallel)
+WHISPER_PARALLEL_REGIONS = int(os.getenv("WHISPER_PARALLEL_REGIONS", "1"))
 
-    # Join all segments into one raw transcript
-    raw_transcription = " ".join([segment.text for segment in segments]).strip()
 
-    # Clean it in small LLM chunks
-    cleaned_transcript = clean_transcript_chunkwise(raw_transcription)
+def _transcribe_piece(model, audio) -> list[str]:
+    segments, _ = model.transcribe(audio)
+    return [segment.text for segment in segments]
+
+
+def transcribe_audio_stream(audio_path: str, stats: dict = None):
+    """
+    Yields the text of each Whisper segment as soon as it is decoded.
+    Only speech is decoded: the audio is resampled to 16 kHz mono and the
+    silences found by VAD are dropped first. Duration stats (total vs speech)
+    are written to `stats` when given.
+    """
+    # Loaded once per worker process (size / compute type set in the model registry)
+    model = get_whisper_model()
+
+    pieces, audio_stats = preprocess_audio(audio_path, WHISPER_PARALLEL_REGIONS)
+    if stats is not None:
+        stats.update(audio_stats)
 
-     # Step 3: Detect emotion
-    emotion = detect_emotions(cleaned_transcript)
+    if len(pieces) <= 1:
+        for piece in pieces:
+            # Faster-Whisper decodes lazily: each segment is produced while iterating
+            segments, _ = model.transcribe(piece)
+            for segment in segments:
+                yield segment.text
+        return
 
+    # Speech regions decoded concurrently, text yielded in the original order
+    with ThreadPoolExecutor(max_workers=len(pieces)) as executor:
+        futures = [executor.submit(_transcribe_piece, model, piece) for piece in pieces]
+        for future in futures:
+            yield from future.result()
+
+
+def transcribe_audio(audio_path: str) -> str:
+    """
+    Speech-to-text only: returns the raw Whisper transcript.
+    Cleaning and emotion detection are separate pipeline stages (see worker.tasks).
+    """
+    # Join all segments into one raw transcript
+    raw_transcription = " ".join(transcribe_audio_stream(audio_path)).strip()
 
-    return cleaned_transcript, emotion
+    return raw_transcription
@@ -0,0 +1,31 @@
+# app/services/transcription_pool.py
+#
+# Runs several transcriptions at once inside one worker process. They all
+# share the same resident WhisperModel (loaded once, with
+# num_workers=WHISPER_NUM_WORKERS and cpu_threads pinned per transcription),
+# so N files cost one copy of the weights instead of N worker containers.
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.model_registry import WHISPER_NUM_WORKERS
+from app.services.transcriber import transcribe_audio
+
+
+def _transcribe_or_error(file_path: str):
+    try:
+        return transcribe_audio(file_path)
+    except Exception as e:
+        return e
+
+
+def transcribe_files(file_paths: list[str], concurrency: int = None, return_exceptions: bool = False) -> list:
+    """
+    Raw transcripts of every file, in input order, up to `concurrency`
+    (default WHISPER_NUM_WORKERS) decoded at the same time. With
+    return_exceptions, a file that fails gets its exception in place of a
+    transcript instead of failing the others.
+    """
+    concurrency = max(1, min(concurrency or WHISPER_NUM_WORKERS, len(file_paths) or 1))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(_transcribe_or_error if return_exceptions else transcribe_audio, file_paths))
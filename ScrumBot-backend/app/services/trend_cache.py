@@ -0,0 +1,95 @@
+# app/services/trend_cache.py
+#
+# Serves trend windows from Redis with stale-while-revalidate:
+# a fresh entry is returned as is, a stale one is returned immediately while
+# a single background job recomputes it, and a missing one is computed
+# inline from the daily rollups (cheap: O(days)).
+
+import json
+import os
+import time
+
+from app.services.trend_rollups import trends_for_window
+
+# Age after which a cached window is refreshed in the background
+TREND_STALE_SECONDS = int(os.getenv("TREND_STALE_SECONDS", "300"))
+# Hard expiry of a cached window
+TREND_CACHE_TTL = int(os.getenv("TREND_CACHE_TTL", str(24 * 3600)))
+# Max time a refresh may hold the per-key lock
+TREND_REFRESH_LOCK_SECONDS = int(os.getenv("TREND_REFRESH_LOCK_SECONDS", "120"))
+
+
+def cache_key(days: int = None) -> str:
+    return f"trends:days={days or 'all'}"
+
+
+def _lock_key(days: int = None) -> str:
+    return f"{cache_key(days)}:refreshing"
+
+
+def compute_and_store(conn, db, days: int = None) -> dict:
+    entry = {"computed_at": time.time(), "data": trends_for_window(db, days)}
+    conn.set(cache_key(days), json.dumps(entry), ex=TREND_CACHE_TTL)
+    return entry
+
+
+def release_refresh_lock(conn, days: int = None):
+    conn.delete(_lock_key(days))
+
+
+def _with_age(entry: dict, refreshing: bool) -> dict:
+    age = max(time.time() - entry["computed_at"], 0)
+    return {
+        **entry["data"],
+        "computed_at": entry["computed_at"],
+        "age_seconds": round(age, 1),
+        "stale": age > TREND_STALE_SECONDS,
+        "refreshing": refreshing,
+    }
+
+
+def get_trends(conn, db, days: int = None, enqueue_refresh=None) -> dict:
+    """
+    Returns the trends of the window plus their age.
+    enqueue_refresh(days) is called (at most once per key at a time)
+    when the cached entry is stale.
+    """
+    cached = conn.get(cache_key(days))
+
+    if cached is None:
+        return _with_age(compute_and_store(conn, db, days), refreshing=False)
+
+    entry = json.loads(cached)
+    refreshing = False
+    if time.time() - entry["computed_at"] > TREND_STALE_SECONDS and enqueue_refresh is not None:
+        # Single flight: only the caller that takes the lock triggers a recompute
+        if conn.set(_lock_key(days), 1, nx=True, ex=TREND_REFRESH_LOCK_SECONDS):
+            enqueue_refresh(days)
+        refreshing = True
+
+    return _with_age(entry, refreshing)
+
+
+def cached_windows(conn) -> list:
+    """
+    Windows currently held in the cache (days, or None for all history).
+    """
+    windows = []
+    for key in conn.scan_iter(match="trends:days=*"):
+        key = key.decode()
+        if key.endswith(":refreshing"):
+            continue
+        value = key.split("=", 1)[1]
+        windows.append(None if value == "all" else int(value))
+    return windows
+
+
+def refresh_cached_windows(conn, db) -> list:
+    """
+    Recomputes every cached window at once (after a batch of new logs),
+    so readers don't each trigger their own refresh.
+    """
+    windows = cached_windows(conn)
+    for days in windows:
+        compute_and_store(conn, db, days)
+    return windows
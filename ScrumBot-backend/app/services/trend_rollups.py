@@ -0,0 +1,149 @@
+# app/services/trend_rollups.py
+#
+# Per-day emotion counts and blocker / next-step counters.
+# process_audio updates them in the same transaction as the log insert,
+# so any trend window is composed from (days x emotions) rows instead of
+# re-reading and JSON-decoding every VoiceLog.
+# Blockers are counted by cluster (app/services/blocker_index.py), under
+# the cluster's label, so rephrasings of one blocker add up.
+
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models import VoiceLog, TrendDailyEmotion, TrendDailyItem, BlockerCluster, BlockerMention
+
+BLOCKER = "blocker"
+NEXT_STEP = "next_step"
+
+
+def _upsert_insert(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _increment(db: Session, model, keys: dict, amount: int = 1):
+    insert = _upsert_insert(db)
+    stmt = insert(model.__table__).values(**keys, count=amount)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys.keys()),
+        set_={"count": model.__table__.c.count + amount},
+    )
+    db.execute(stmt)
+
+
+def _day(created_at: datetime) -> date:
+    return (created_at or datetime.utcnow()).date()
+
+
+def record_log(db: Session, log: VoiceLog, blocker_labels: list[str] = None):
+    """
+    Adds one log to the rollups. Call after flush (created_at is set) and
+    before commit, so the log and its counters are saved together.
+    blocker_labels: cluster labels of the log's blockers (defaults to their text).
+    """
+    day = _day(log.created_at)
+    _increment(db, TrendDailyEmotion, {"day": day, "emotion": log.emotion or "neutral"})
+    for text in (log.blockers or []) if blocker_labels is None else blocker_labels:
+        _increment(db, TrendDailyItem, {"kind": BLOCKER, "day": day, "text": text})
+    for text in log.next_steps or []:
+        _increment(db, TrendDailyItem, {"kind": NEXT_STEP, "day": day, "text": text})
+
+
+def move_emotion(db: Session, created_at: datetime, old: str, new: str):
+    """
+    Keeps the rollups in sync when a log's emotion is re-scored.
+    """
+    day = _day(created_at)
+    _increment(db, TrendDailyEmotion, {"day": day, "emotion": old or "neutral"}, -1)
+    _increment(db, TrendDailyEmotion, {"day": day, "emotion": new or "neutral"}, 1)
+
+
+def rebuild(db: Session, batch_size: int = 1000, cluster_blockers: bool = True) -> int:
+    """
+    Recomputes every rollup from voice_logs1 (one-off backfill / repair).
+    Blockers are counted from the blocker index, or by exact text if
+    cluster_blockers is False. Returns the number of logs read.
+    """
+    db.query(TrendDailyEmotion).delete()
+    db.query(TrendDailyItem).delete()
+
+    rows = (
+        db.query(VoiceLog.created_at, VoiceLog.emotion, VoiceLog.blockers_json, VoiceLog.next_steps_json)
+        .order_by(VoiceLog.id)
+        .yield_per(batch_size)
+    )
+    emotions = defaultdict(int)
+    items = defaultdict(int)
+    count = 0
+    for row in rows:
+        day = _day(row.created_at)
+        emotions[(day, row.emotion or "neutral")] += 1
+        if not cluster_blockers:
+            for text in json.loads(row.blockers_json) if row.blockers_json else []:
+                items[(BLOCKER, day, text)] += 1
+        for text in json.loads(row.next_steps_json) if row.next_steps_json else []:
+            items[(NEXT_STEP, day, text)] += 1
+        count += 1
+
+    if cluster_blockers:
+        mentions = (
+            db.query(BlockerMention.day, BlockerCluster.label, func.count(BlockerMention.id))
+            .join(BlockerCluster, BlockerCluster.id == BlockerMention.cluster_id)
+            .group_by(BlockerMention.day, BlockerCluster.label)
+        )
+        for day, label, n in mentions:
+            items[(BLOCKER, day, label)] += n
+
+    db.bulk_insert_mappings(TrendDailyEmotion, [
+        {"day": day, "emotion": emotion, "count": n} for (day, emotion), n in emotions.items()
+    ])
+    db.bulk_insert_mappings(TrendDailyItem, [
+        {"kind": kind, "day": day, "text": text, "count": n} for (kind, day, text), n in items.items()
+    ])
+    return count
+
+
+def _top_items(db: Session, kind: str, since, limit: int):
+    total = func.sum(TrendDailyItem.count).label("total")
+    query = db.query(TrendDailyItem.text, total).filter(TrendDailyItem.kind == kind)
+    if since:
+        query = query.filter(TrendDailyItem.day >= since)
+    rows = query.group_by(TrendDailyItem.text).having(total > 0).order_by(total.desc()).limit(limit).all()
+    return [(text, int(n)) for text, n in rows]
+
+
+def trends_for_window(db: Session, days: int = None, top: int = 5) -> dict:
+    """
+    Trends over the last `days` days (all history if None), in the same
+    shape as trend_analyzer.analyze_trends_from_logs.
+    """
+    since = datetime.utcnow().date() - timedelta(days=days - 1) if days else None
+
+    query = db.query(TrendDailyEmotion.day, TrendDailyEmotion.emotion, TrendDailyEmotion.count)
+    if since:
+        query = query.filter(TrendDailyEmotion.day >= since)
+
+    emotion_by_date = defaultdict(dict)
+    for day, emotion, count in query.filter(TrendDailyEmotion.count > 0):
+        emotion_by_date[day.strftime("%Y-%m-%d")][emotion] = count
+
+    sorted_dates = sorted(emotion_by_date.keys())
+    all_emotions = {e for counts in emotion_by_date.values() for e in counts}
+    emotion_trends = {
+        emotion: [emotion_by_date[d].get(emotion, 0) for d in sorted_dates]
+        for emotion in all_emotions
+    }
+
+    return {
+        "dates": sorted_dates,
+        "emotions": emotion_trends,
+        "top_blockers": _top_items(db, BLOCKER, since, top),
+        "frequent_next_steps": _top_items(db, NEXT_STEP, since, top),
+    }
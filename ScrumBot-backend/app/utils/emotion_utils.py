@@ -1,31 +1,85 @@
 # app/utils/emotion_utils.py
 
-from transformers import pipeline
+import os
+from collections import defaultdict
+
+from app.services.model_registry import get_emotion_classifier
+
+# Number of text windows sent through the model per forward pass
+EMOTION_BATCH_SIZE = int(os.getenv("EMOTION_BATCH_SIZE", "16"))
+# Tokens shared by two consecutive windows of a long transcript
+EMOTION_WINDOW_STRIDE = int(os.getenv("EMOTION_WINDOW_STRIDE", "64"))
+
+
+def _token_windows(tokenizer, text: str) -> list[tuple[str, int]]:
+    """
+    Splits text into overlapping windows that fit the model input.
+    Returns (window text, token count) pairs.
+    """
+    max_tokens = tokenizer.model_max_length - tokenizer.num_special_tokens_to_add()
+    ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+    if len(ids) <= max_tokens:
+        return [(text, max(len(ids), 1))]
+
+    windows = []
+    step = max(max_tokens - EMOTION_WINDOW_STRIDE, 1)
+    for start in range(0, len(ids), step):
+        piece = ids[start:start + max_tokens]
+        windows.append((tokenizer.decode(piece), len(piece)))
+        if start + max_tokens >= len(ids):
+            break
+    return windows
+
+
+def get_emotion_probabilities_batch(texts: list[str], batch_size: int = None) -> list[dict]:
+    """
+    Returns the emotion probabilities of every text.
+    Long texts are split into token windows whose scores are averaged,
+    weighted by window length, instead of being cut off.
+    """
+    if not texts:
+        return []
+
+    classifier = get_emotion_classifier()
+    windows, owners = [], []
+    for i, text in enumerate(texts):
+        for window, n_tokens in _token_windows(classifier.tokenizer, text or ""):
+            windows.append(window)
+            owners.append((i, n_tokens))
+
+    results = classifier(windows, batch_size=batch_size or EMOTION_BATCH_SIZE, truncation=True)
+
+    totals = [defaultdict(float) for _ in texts]
+    weights = [0] * len(texts)
+    for (i, n_tokens), scores in zip(owners, results):
+        for entry in scores:
+            totals[i][entry["label"]] += entry["score"] * n_tokens
+        weights[i] += n_tokens
+
+    return [
+        {label: round(score / weights[i], 4) for label, score in totals[i].items()}
+        for i in range(len(texts))
+    ]
+
+
+def detect_emotions_batch(texts: list[str], batch_size: int = None) -> list[str]:
+    """
+    Returns the dominant emotion of every text.
+    """
+    return [
+        max(probabilities, key=probabilities.get)
+        for probabilities in get_emotion_probabilities_batch(texts, batch_size)
+    ]
 
-# Load once when file is imported
-emotion_classifier = pipeline(
-    "text-classification",
-    model="j-hartmann/emotion-english-distilroberta-base",
-    return_all_scores=True
-)
 
 def detect_emotions(transcript: str) -> str:
     """
     Returns the dominant emotion based on the transcript text.
     """
-    results = emotion_classifier(transcript[:512])  # Truncate to fit model input size
-    scores = results[0]
-
-    # Sort by score
-    sorted_scores = sorted(scores, key=lambda x: x['score'], reverse=True)
-    top_emotion = sorted_scores[0]["label"]
-    
-    return top_emotion
+    return detect_emotions_batch([transcript])[0]
 
 def get_emotion_probabilities(transcript: str) -> dict:
     """
     Returns a dictionary of all emotion probabilities.
     """
-    results = emotion_classifier(transcript[:512])
-    scores = results[0]
-    return {entry["label"]: round(entry["score"], 4) for entry in scores}
+    return get_emotion_probabilities_batch([transcript])[0]
@@ -0,0 +1,179 @@
+# app/utils/llm_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# In-process tier: max number of responses kept per worker
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+# Redis tier: shared between workers, survives crashes and restarts
+LLM_CACHE_REDIS = os.getenv("LLM_CACHE_REDIS", "true").lower() == "true"
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Bump when prompts or response handling change, so older responses are not reused
+PROMPT_VERSION = "1"
+
+STATS_KEY = "llm_cache:stats"
+
+
+def normalize_prompt(text: str) -> str:
+    # Prompts are built from indented f-strings, whitespace is not meaningful
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_key(model: str, messages: list, options: dict = None, fmt=None) -> str:
+    payload = {
+        "version": PROMPT_VERSION,
+        "model": model,
+        "messages": [
+            {"role": m.get("role", "user"), "content": normalize_prompt(m.get("content", ""))}
+            for m in messages
+        ],
+        "options": options or {},
+    }
+    if fmt is not None:
+        # Only added when set, so keys of plain-text requests are unchanged
+        payload["format"] = fmt
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    return f"llm_cache:{digest}"
+
+
+class MemoryTier:
+    """
+    Size-bounded LRU dict, safe to share between threads.
+    """
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisTier:
+    """
+    Redis-backed tier with a TTL per entry. Errors are logged and treated as misses.
+    """
+    name = "redis"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @property
+    def conn(self):
+        # Shared pooled client (app.services.queues)
+        from app.services.queues import get_redis
+        return get_redis()
+
+    def get(self, key):
+        try:
+            value = self.conn.get(key)
+        except Exception as e:
+            logging.warning(f"LLM cache (redis) read failed: {e}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        try:
+            self.conn.set(key, json.dumps(value), ex=self.ttl)
+        except Exception as e:
+            logging.warning(f"LLM cache (redis) write failed: {e}")
+
+    def record(self, field: str):
+        try:
+            self.conn.hincrby(STATS_KEY, field, 1)
+        except Exception:
+            pass
+
+
+class LLMCache:
+    """
+    Looks a request up tier by tier (fastest first), back-filling faster
+    tiers on a hit, and only calls the LLM when every tier misses.
+    """
+
+    def __init__(self, tiers: list):
+        self.tiers = tiers
+        self.counters = {f"{tier.name}_hits": 0 for tier in tiers}
+        self.counters["misses"] = 0
+        self._lock = threading.Lock()
+
+    def _count(self, field: str):
+        with self._lock:
+            self.counters[field] += 1
+        for tier in self.tiers:
+            if isinstance(tier, RedisTier):
+                tier.record(field)
+
+    def get_or_call(self, model: str, messages: list, options: dict, fetch, fmt=None, cacheable=None):
+        """
+        Returns the cached response for (model, messages, options, fmt),
+        or calls fetch() and caches what it returns (only if cacheable(value)
+        is true, when given).
+        """
+        key = make_key(model, messages, options, fmt)
+
+        for i, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster in self.tiers[:i]:
+                    faster.set(key, value)
+                self._count(f"{tier.name}_hits")
+                return value
+
+        self._count("misses")
+        value = fetch()
+        if cacheable is not None and not cacheable(value):
+            return value
+        for tier in self.tiers:
+            tier.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        hits = sum(v for k, v in counters.items() if k.endswith("_hits"))
+        total = hits + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "memory_entries": sum(len(t) for t in self.tiers if isinstance(t, MemoryTier)),
+        }
+
+
+def _build_default_cache() -> LLMCache:
+    tiers = [MemoryTier(LLM_CACHE_MAX_ENTRIES)]
+    if LLM_CACHE_REDIS:
+        tiers.append(RedisTier(LLM_CACHE_TTL))
+    return LLMCache(tiers)
+
+
+llm_cache = _build_default_cache()
+
+
+def get_shared_stats(conn) -> dict:
+    """
+    Counters aggregated over every worker (read from Redis).
+    """
+    return {k.decode(): int(v) for k, v in conn.hgetall(STATS_KEY).items()}
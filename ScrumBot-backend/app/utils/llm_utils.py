@@ -1,6 +1,88 @@
 # llm_utils.py
-import ollama
 import json
+import logging
+from app.services import llm_client
+from app.utils.llm_cache import llm_cache
+from app.utils.structured_output import (
+    LLM_JSON_REPAIR_RETRIES,
+    PARTIAL_SUMMARY_SCHEMA,
+    SUMMARY_SCHEMA,
+    TREND_REPORT_SCHEMA,
+    JSONExtractionError,
+    coerce_summary,
+    extract_json,
+    parse_stats,
+    response_format,
+)
+
+
+def cached_chat(model: str = None, messages: list = None, options: dict = None, format=None, cacheable=None) -> dict:
+    """
+    llm_client.chat behind the LLM response cache (in-process LRU, then Redis).
+    `format` is Ollama's output format ("json" or a JSON schema); the model
+    defaults to LLM_MODEL.
+    """
+    model = model or llm_client.LLM_MODEL
+    options = llm_client.request_options(options)
+
+    def fetch():
+        content = llm_client.chat(messages, model=model, options=options, format=format)
+        return {"message": {"role": "assistant", "content": content}}
+
+    return llm_cache.get_or_call(llm_client.model_id(model), messages, options, fetch, fmt=format, cacheable=cacheable)
+
+
+def _contains_json(response: dict) -> bool:
+    try:
+        extract_json(response["message"]["content"])
+        return True
+    except JSONExtractionError:
+        return False
+
+
+def _repair_prompt(reply: str, schema: dict = None) -> str:
+    keys = f" with the keys {', '.join(schema['properties'])}" if schema else ""
+    return f"""
+The text below was supposed to be a single JSON object{keys}, but it is not valid JSON.
+Rewrite it as that JSON object. Return only the JSON, no other text.
+
+{reply}
+"""
+
+
+def chat_json(prompt: str, task: str, schema: dict = None):
+    """
+    Sends the prompt asking for JSON output (constrained by `schema` when
+    LLM_STRUCTURED_OUTPUT=schema) and returns the parsed object. A reply with
+    the JSON wrapped in prose or code fences is extracted; an unparseable one
+    is sent back for repair up to LLM_JSON_REPAIR_RETRIES times (the repair
+    prompt carries only the bad reply, not the original input).
+    Returns None if no JSON could be obtained. Unparseable replies are not cached.
+    """
+    fmt = response_format(schema)
+    content = cached_chat(
+        messages=[{"role": "user", "content": prompt}], format=fmt, cacheable=_contains_json
+    )["message"]["content"]
+
+    for attempt in range(LLM_JSON_REPAIR_RETRIES + 1):
+        try:
+            value, extracted = extract_json(content)
+        except JSONExtractionError as e:
+            logging.warning(f"{task}: unparseable LLM reply (attempt {attempt + 1}): {e}")
+            if attempt == LLM_JSON_REPAIR_RETRIES:
+                break
+            content = cached_chat(
+                messages=[{"role": "user", "content": _repair_prompt(content, schema)}],
+                format=fmt or "json",
+                cacheable=_contains_json,
+            )["message"]["content"]
+            continue
+        parse_stats.record("repaired" if attempt else "extracted" if extracted else "parsed", task)
+        return value
+
+    parse_stats.record("failed", task)
+    return None
+
 
 def clean_transcript_with_llm(raw_transcript: str) -> str:
     prompt = f"""
@@ -11,7 +93,7 @@ def clean_transcript_with_llm(raw_transcript: str) -> str:
 
     Output:
     """
-    response = ollama.chat(model="mistral", messages=[
+    response = cached_chat(messages=[
         {"role": "user", "content": prompt}
     ])
     return response['message']['content'].strip()
@@ -36,46 +118,83 @@ Return only a JSON response in this format:
 }}
     """
 
-    response = ollama.chat(model="mistral", messages=[
-        {"role": "user", "content": prompt}
-    ])
+    value = chat_json(prompt, task="structured_summary", schema=SUMMARY_SCHEMA)
+    if value is None:
+        print("⚠️ JSON parsing failed, using the transcript as summary")
+        value = {}  # fallback: summary = transcript, everything else empty
+    return coerce_summary(value, transcript)
 
-    try:
-        import json
-        return json.loads(response['message']['content'])
-    except Exception as e:
-        print("⚠️ JSON parsing failed:", e)
-        return {
-            "summary": transcript,  # fallback
-            "blockers": [],
-            "progress": [],
-            "next_steps": [],
-            "sentiment": "neutral"
-        }
 
+def summarize_logs_partial(log_lines: list[str], scope: str) -> dict:
+    """
+    Map step of the trend insights: condenses the standup logs of one
+    scope (e.g. a day) into a small JSON summary.
+    """
+    logs_text = "\n".join(log_lines)
+    prompt = f"""
+You are a sprint trend analyst AI. Summarize the following standup updates from {scope}.
+Each line is one update: [emotion] summary | blockers | next steps | progress.
+
+{logs_text}
 
-def generate_trend_analysis_from_logs(logs: list[dict]) -> dict:
+Return only a JSON response in this format:
+
+{{
+  "summary": "Two or three sentences on what happened",
+  "blockers": ["..."],
+  "next_steps": ["..."],
+  "emotion_trend": "positive" | "negative" | "mixed",
+  "progress_health": "good" | "medium" | "poor"
+}}
+"""
+    return _chat_json(prompt, task="insights_partial", schema=PARTIAL_SUMMARY_SCHEMA, fallback={
+        "summary": "",
+        "blockers": [],
+        "next_steps": [],
+        "emotion_trend": "mixed",
+        "progress_health": "medium",
+    })
+
+
+def merge_partial_summaries(partials: list[dict], scope: str) -> dict:
     """
-    Takes in a list of structured voice logs and returns AI-analyzed trends in JSON.
-    Each log should include filename, summary, blockers, progress, next_steps, sentiment, and timestamp.
+    Combines several partial summaries into one, in the same format
+    (used when the partials don't fit in one prompt).
     """
-    log_text = ""
-    for log in logs:
-        log_text += f"""
-    Filename: {log['filename']}
-    Summary: {log['summary']}
-    Blockers: {", ".join(log['blockers'])}
-    Progress: {", ".join(log['progress'])}
-    Next Steps: {", ".join(log['next_steps'])}
-    Sentiment: {log['sentiment']}
-    Timestamp: {log['created_at']}
----
+    prompt = f"""
+You are a sprint trend analyst AI. Merge these partial summaries of standup updates from {scope} into one.
+Keep recurring blockers and next steps, drop duplicates.
+
+{json.dumps(partials, indent=1)}
+
+Return only a JSON response in this format:
+
+{{
+  "summary": "Two or three sentences on what happened",
+  "blockers": ["..."],
+  "next_steps": ["..."],
+  "emotion_trend": "positive" | "negative" | "mixed",
+  "progress_health": "good" | "medium" | "poor"
+}}
 """
+    return _chat_json(prompt, task="insights_merge", schema=PARTIAL_SUMMARY_SCHEMA, fallback={
+        "summary": " ".join(p.get("summary", "") for p in partials),
+        "blockers": [b for p in partials for b in p.get("blockers", [])],
+        "next_steps": [n for p in partials for n in p.get("next_steps", [])],
+        "emotion_trend": "mixed",
+        "progress_health": "medium",
+    })
 
+
+def trend_report_from_partials(partials: list[dict]) -> dict:
+    """
+    Reduce step of the trend insights: the final report from the
+    per-day (or per-period) partial summaries.
+    """
     prompt = f"""
-You are a sprint trend analyst AI. Analyze the following standup logs from a development team.
+You are a sprint trend analyst AI. Analyze the following summaries of a development team's standup logs, one per period.
 
-{log_text}
+{json.dumps(partials, indent=1)}
 
 Please return a JSON report with the following structure:
 
@@ -88,23 +207,45 @@ Please return a JSON report with the following structure:
   "ai_insights": "Your detailed insights here..."
 }}
 """
+    return _chat_json(prompt, task="insights_report", schema=TREND_REPORT_SCHEMA, fallback={
+        "top_blockers": [],
+        "frequent_next_steps": [],
+        "emotion_trend": "mixed",
+        "progress_health": "medium",
+        "risk_level": "medium",
+        "ai_insights": "Could not analyze trends properly."
+    })
 
-    response = ollama.chat(model="mistral", messages=[
-        {"role": "user", "content": prompt}
-    ])
 
-    try:
-        return json.loads(response['message']['content'])
-    except Exception as e:
-        print("⚠️ Trend analyzer JSON parsing failed:", e)
-        return {
-            "top_blockers": [],
-            "frequent_next_steps": [],
-            "emotion_trend": "mixed",
-            "progress_health": "medium",
-            "risk_level": "medium",
-            "ai_insights": "Could not analyze trends properly."
-        }
+# Set on a trend analyzer result that is the fallback, not the model's
+# answer (callers must not cache it)
+FALLBACK_KEY = "_fallback"
+
+
+def _chat_json(prompt: str, task: str, fallback: dict, schema: dict = None) -> dict:
+    value = chat_json(prompt, task=task, schema=schema)
+    if value is None:
+        print("⚠️ Trend analyzer JSON parsing failed, using fallback")
+        return {**fallback, FALLBACK_KEY: True}
+    # Every key of the fallback is required: a reply without them (or some
+    # other object) is no answer, even if it parsed
+    missing = [key for key in fallback if key not in value]
+    if missing:
+        print(f"⚠️ Trend analyzer reply lacks {', '.join(missing)}, using fallback")
+        return {**fallback, FALLBACK_KEY: True}
+    return {key: value[key] for key in fallback}
+
+
+def generate_trend_analysis_from_logs(logs: list[dict]) -> dict:
+    """
+    Takes in a list of structured voice logs and returns AI-analyzed trends in JSON.
+    Each log should include filename, summary, blockers, progress, next_steps, sentiment, and timestamp.
+    Logs are summarized per day (map), then the daily summaries are reduced
+    into the report, so any number of logs fits in the model's context.
+    """
+    from app.services.insights import analyze_logs
+    return analyze_logs(logs)
+
 
 def analyze_trends_with_llm(trends_dict: dict) -> str:
     prompt = f"""
@@ -119,7 +260,7 @@ def analyze_trends_with_llm(trends_dict: dict) -> str:
     - Blocker trends (if seen)
     - Team health indicators
     """
-    response = ollama.chat(model="mistral", messages=[
+    response = cached_chat(messages=[
         {"role": "user", "content": prompt}
     ])
     return response["message"]["content"].strip()
\ No newline at end of file
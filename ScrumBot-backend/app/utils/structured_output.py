@@ -0,0 +1,205 @@
+# app/utils/structured_output.py
+#
+# Getting JSON out of the LLM reliably: the JSON schemas passed to Ollama's
+# `format` option (constrained decoding), a tolerant extractor for replies
+# that still wrap the JSON in prose or code fences, coercion to the expected
+# shape, and parse outcome counters shared by every worker.
+
+import json
+import logging
+import os
+import re
+import threading
+
+# "schema": constrain decoding to the JSON schema, "json": any JSON object,
+# "off": plain text (prompt-only, as before)
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "schema").lower()
+# Extra LLM round trips allowed to repair an unparseable reply
+LLM_JSON_REPAIR_RETRIES = int(os.getenv("LLM_JSON_REPAIR_RETRIES", "1"))
+
+STATS_KEY = "llm_json:stats"
+# parsed: valid JSON as is; extracted: JSON found inside prose / fences;
+# repaired: valid after a repair round trip; failed: fallback used
+OUTCOMES = ("parsed", "extracted", "repaired", "failed")
+
+SENTIMENTS = ["positive", "neutral", "negative"]
+
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "blockers": {"type": "array", "items": {"type": "string"}},
+        "progress": {"type": "array", "items": {"type": "string"}},
+        "next_steps": {"type": "array", "items": {"type": "string"}},
+        "sentiment": {"type": "string", "enum": SENTIMENTS},
+    },
+    "required": ["summary", "blockers", "progress", "next_steps", "sentiment"],
+}
+
+
+TRENDS = ["positive", "negative", "mixed"]
+HEALTH = ["good", "medium", "poor"]
+
+# Trend insights: a day's (or period's) summary, and the final report
+PARTIAL_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "blockers": {"type": "array", "items": {"type": "string"}},
+        "next_steps": {"type": "array", "items": {"type": "string"}},
+        "emotion_trend": {"type": "string", "enum": TRENDS},
+        "progress_health": {"type": "string", "enum": HEALTH},
+    },
+    "required": ["summary", "blockers", "next_steps", "emotion_trend", "progress_health"],
+}
+
+TREND_REPORT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "top_blockers": {"type": "array", "items": {"type": "string"}},
+        "frequent_next_steps": {"type": "array", "items": {"type": "string"}},
+        "emotion_trend": {"type": "string", "enum": TRENDS},
+        "progress_health": {"type": "string", "enum": HEALTH},
+        "risk_level": {"type": "string", "enum": ["low", "medium", "high"]},
+        "ai_insights": {"type": "string"},
+    },
+    "required": ["top_blockers", "frequent_next_steps", "emotion_trend", "progress_health", "risk_level", "ai_insights"],
+}
+
+
+class JSONExtractionError(ValueError):
+    pass
+
+
+def response_format(schema: dict = None):
+    """
+    Value of Ollama's `format` option for the configured mode.
+    """
+    if LLM_STRUCTURED_OUTPUT == "schema" and schema is not None:
+        return schema
+    if LLM_STRUCTURED_OUTPUT in ("schema", "json"):
+        return "json"
+    return None
+
+
+def _balanced_objects(text: str):
+    """
+    Every top-level {...} span of the text, in order (braces inside strings ignored).
+    """
+    depth, start, in_string, escaped = 0, None, False, False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
+
+def _loads_lenient(candidate: str):
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+    # Common slips: smart quotes and trailing commas
+    fixed = candidate.replace("“", '"').replace("”", '"').replace("’", "'")
+    fixed = re.sub(r",\s*([}\]])", r"\1", fixed)
+    return json.loads(fixed)
+
+
+def extract_json(text: str) -> tuple[dict, bool]:
+    """
+    The JSON object in an LLM reply, and whether it had to be dug out of
+    surrounding text. Raises JSONExtractionError if there is none.
+    """
+    text = (text or "").strip()
+    try:
+        value = json.loads(text)
+        if isinstance(value, dict):
+            return value, False
+    except json.JSONDecodeError:
+        pass
+
+    fenced = re.findall(r"```(?:json)?\s*(.*?)```", text, flags=re.DOTALL)
+    for candidate in fenced + list(_balanced_objects(text)):
+        try:
+            value = _loads_lenient(candidate.strip())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value, True
+    raise JSONExtractionError(f"No JSON object in reply: {text[:200]!r}")
+
+
+def _string_list(value) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, list):
+        return [str(v) if not isinstance(v, str) else v for v in value if v not in (None, "")]
+    return [str(value)]
+
+
+def coerce_summary(value: dict, transcript: str) -> dict:
+    """
+    Brings a parsed structured summary to the exact expected shape.
+    """
+    sentiment = str(value.get("sentiment", "neutral")).lower()
+    return {
+        "summary": str(value.get("summary") or transcript),
+        "blockers": _string_list(value.get("blockers")),
+        "progress": _string_list(value.get("progress")),
+        "next_steps": _string_list(value.get("next_steps")),
+        "sentiment": sentiment if sentiment in SENTIMENTS else "neutral",
+    }
+
+
+class ParseStats:
+    """
+    Parse outcome counters: in-process, and summed over workers in Redis.
+    """
+
+    def __init__(self):
+        self.counters = {outcome: 0 for outcome in OUTCOMES}
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str, task: str):
+        with self._lock:
+            self.counters[outcome] += 1
+        try:
+            from app.services.queues import get_redis
+            conn = get_redis()
+            conn.hincrby(STATS_KEY, outcome, 1)
+            conn.hincrby(STATS_KEY, f"{task}:{outcome}", 1)
+        except Exception as e:
+            logging.debug(f"Could not record JSON parse outcome: {e}")
+
+
+parse_stats = ParseStats()
+
+
+def get_shared_stats(conn) -> dict:
+    """
+    Outcome counts over every worker plus the failure rate, overall and per task.
+    """
+    counts = {k.decode(): int(v) for k, v in conn.hgetall(STATS_KEY).items()}
+    total = sum(counts.get(outcome, 0) for outcome in OUTCOMES)
+    return {
+        **counts,
+        "total": total,
+        "failure_rate": round(counts.get("failed", 0) / total, 4) if total else 0.0,
+        "repair_rate": round(counts.get("repaired", 0) / total, 4) if total else 0.0,
+    }
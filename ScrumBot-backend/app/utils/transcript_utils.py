@@ -1,7 +1,17 @@
 # app/utils/transcript_utils.py
 
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from app.utils.llm_utils import clean_transcript_with_llm
 
+# Number of chunks sent to Ollama at the same time (match OLLAMA_NUM_PARALLEL)
+LLM_CLEAN_CONCURRENCY = int(os.getenv("LLM_CLEAN_CONCURRENCY", "4"))
+# Seconds to wait for a single chunk before keeping its raw text
+LLM_CHUNK_TIMEOUT = float(os.getenv("LLM_CHUNK_TIMEOUT", "120"))
+
 
 def split_transcript(text, max_chars=1000):
     """
@@ -29,21 +39,121 @@ def split_transcript(text, max_chars=1000):
     return chunks
 
 
-def clean_transcript_chunkwise(raw_transcript: str) -> str:
+def group_segments(segments, max_chars=1000):
     """
-    Splits the transcript and sends each chunk to the LLM for cleaning.
-    Returns the full cleaned transcript.
+    Groups transcript segments, as they arrive, into chunks of about max_chars.
     """
-    chunks = split_transcript(raw_transcript)
-    cleaned_chunks = []
+    current_chunk = ""
+    for segment in segments:
+        segment = segment.strip()
+        if not segment:
+            continue
+        if current_chunk and len(current_chunk) + len(segment) + 1 > max_chars:
+            yield current_chunk
+            current_chunk = segment
+        else:
+            current_chunk = f"{current_chunk} {segment}".strip()
+
+    if current_chunk:
+        yield current_chunk
+
+
+def _clean_chunk(chunk: str, index: int, total: int = None) -> str:
+    print(f"Cleaning chunk {index + 1}/{total or '?'} (approx {len(chunk)} chars)...")
+    return clean_transcript_with_llm(chunk).strip()
+
+
+def clean_chunks_stream(chunks, concurrency: int = None, chunk_timeout: float = None, total: int = None):
+    """
+    Sends chunks to the LLM for cleaning as soon as they arrive (chunks may be
+    a lazy iterator, e.g. fed by Whisper), keeping up to `concurrency` in flight.
+    Yields (index, raw chunk, cleaned chunk) in the original order, as early as
+    possible. A chunk that fails or runs longer than `chunk_timeout` seconds
+    is yielded as is. The timeout counts from when the chunk starts running,
+    and a chunk still queued behind calls that all overran theirs (a stalled
+    LLM) is not waited for, so a stall costs one timeout, not one per chunk.
+    """
+    concurrency = concurrency or LLM_CLEAN_CONCURRENCY
+    chunk_timeout = chunk_timeout or LLM_CHUNK_TIMEOUT
 
-    for i, chunk in enumerate(chunks):
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency if total is None else min(concurrency, total)))
+    pending = []  # (index, raw chunk, future), in order
+    next_index = 0
+    running = {}  # index -> monotonic start time, while the LLM call runs
+    started = set()
+    lock = threading.Lock()
+
+    def run(chunk, index):
+        with lock:
+            running[index] = time.monotonic()
+            started.add(index)
+        try:
+            return _clean_chunk(chunk, index, total)
+        finally:
+            with lock:
+                running.pop(index, None)
+
+    def time_left(index):
+        """
+        Seconds to keep waiting for a chunk (<= 0: give up on it).
+        """
+        now = time.monotonic()
+        with lock:
+            if index in running:
+                return running[index] + chunk_timeout - now
+            if index in started:
+                return 0.05  # Just finished, the future is about to be done
+            # Queued: it starts when a running call ends. If every running
+            # call overran its timeout, the LLM is stalled and it won't.
+            deadlines = [start + chunk_timeout - now for start in running.values()]
+        if deadlines and max(deadlines) <= 0:
+            return 0
+        return min([d for d in deadlines if d > 0] + [0.05])
+
+    def collect(index, chunk, future, block):
+        while block and not future.done():
+            remaining = time_left(index)
+            if remaining <= 0:
+                print(f"Timed out cleaning chunk {index + 1} after {chunk_timeout}s")
+                return chunk  # Fallback to original if LLM is too slow
+            wait([future], timeout=remaining)
         try:
-            print(f"Cleaning chunk {i + 1}/{len(chunks)} (approx {len(chunk)} chars)...")
-            cleaned = clean_transcript_with_llm(chunk)
-            cleaned_chunks.append(cleaned.strip())
+            return future.result(timeout=0)
         except Exception as e:
-            print(f"Error processing chunk {i + 1}: {e}")
-            cleaned_chunks.append(chunk)  # Fallback to original if LLM fails
+            print(f"Error processing chunk {index + 1}: {e}")
+            return chunk  # Fallback to original if LLM fails
+
+    try:
+        for chunk in chunks:
+            pending.append((next_index, chunk, executor.submit(run, chunk, next_index)))
+            next_index += 1
+
+            # Hand back whatever is already cleaned at the head of the line
+            while pending and pending[0][2].done():
+                index, raw, future = pending.pop(0)
+                yield index, raw, collect(index, raw, future, block=False)
+
+        for index, raw, future in pending:
+            yield index, raw, collect(index, raw, future, block=True)
+    finally:
+        # Don't wait for chunks that timed out, their text is already in the result
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def clean_transcript_chunkwise(raw_transcript: str, concurrency: int = None, chunk_timeout: float = None, on_chunk=None) -> str:
+    """
+    Splits the transcript and sends the chunks to the LLM for cleaning,
+    keeping up to `concurrency` chunks in flight at once.
+    Returns the full cleaned transcript, with chunks in their original order.
+    A chunk that fails or takes longer than `chunk_timeout` seconds is kept as is.
+    on_chunk(done, total) is called as each chunk is collected.
+    """
+    chunks = split_transcript(raw_transcript)
+    cleaned_chunks = []
+
+    for index, _, cleaned in clean_chunks_stream(chunks, concurrency, chunk_timeout, total=len(chunks)):
+        cleaned_chunks.append(cleaned)
+        if on_chunk is not None:
+            on_chunk(index + 1, len(chunks))
 
     return " ".join(cleaned_chunks)
@@ -0,0 +1,211 @@
+# app/utils/upload_utils.py
+
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+# Size of the pieces copied from the request to disk
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# Largest accepted recording (default 500 MB)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+# Seconds one PATCH may hold an upload session's lock
+UPLOAD_LOCK_SECONDS = int(os.getenv("UPLOAD_LOCK_SECONDS", "600"))
+# Seconds without a new chunk after which an upload session is abandoned (default 24h)
+UPLOAD_SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", str(24 * 3600)))
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadOffsetMismatch(Exception):
+    pass
+
+
+class UploadInProgress(UploadOffsetMismatch):
+    pass
+
+
+def safe_filename(name: str) -> str:
+    """
+    Keeps only the base name and a conservative set of characters.
+    """
+    name = os.path.basename(name or "audio")
+    return re.sub(r"[^A-Za-z0-9._-]", "_", name) or "audio"
+
+
+async def save_upload_stream(file, dest_path: str, max_bytes: int = None) -> tuple[int, str]:
+    """
+    Copies an UploadFile to disk in UPLOAD_CHUNK_SIZE pieces, never holding
+    the whole body in memory. Returns (size in bytes, sha256 hex digest).
+    Raises UploadTooLarge (and removes the partial file) past max_bytes.
+    The request as a whole is already bounded by BodySizeLimitMiddleware
+    (app/api/limits.py) before the multipart body is received; this is
+    the per-file limit.
+    """
+    max_bytes = max_bytes or MAX_UPLOAD_BYTES
+
+    if getattr(file, "size", None) and file.size > max_bytes:
+        raise UploadTooLarge(f"File is {file.size} bytes, limit is {max_bytes}")
+
+    return await write_chunks(_iter_upload_file(file), dest_path, max_bytes)
+
+
+async def _iter_upload_file(file):
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def write_chunks(chunks, dest_path: str, max_bytes: int, mode: str = "wb", start_size: int = 0) -> tuple[int, str]:
+    """
+    Writes an async iterator of byte chunks to dest_path, hashing on the fly.
+    """
+    hasher = hashlib.sha256()
+    size = start_size
+
+    try:
+        with open(dest_path, mode) as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds the {max_bytes} byte limit")
+                hasher.update(chunk)
+                await run_in_threadpool(f.write, chunk)
+    except UploadTooLarge:
+        if mode == "wb":
+            os.remove(dest_path)
+        raise
+
+    return size, hasher.hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """
+    sha256 of a file on disk, read in chunks.
+    """
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+# --- Resumable uploads -------------------------------------------------------
+# A session is a ".part" file plus a small JSON sidecar in PARTIAL_FOLDER.
+# The current offset is simply the size of the ".part" file, so a client can
+# resume after a dropped connection by asking for it and sending the rest.
+# Sessions idle for UPLOAD_SESSION_TTL are removed when a new one starts.
+
+def _session_paths(partial_folder: str, upload_id: str) -> tuple[str, str]:
+    if not re.fullmatch(r"[0-9a-f]{32}", upload_id):
+        raise FileNotFoundError(upload_id)
+    base = os.path.join(partial_folder, upload_id)
+    return base + ".part", base + ".json"
+
+
+def create_upload_session(partial_folder: str, filename: str, length: int) -> dict:
+    if length > MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(f"File is {length} bytes, limit is {MAX_UPLOAD_BYTES}")
+
+    os.makedirs(partial_folder, exist_ok=True)
+    expire_upload_sessions(partial_folder)
+    upload_id = uuid.uuid4().hex
+    part_path, meta_path = _session_paths(partial_folder, upload_id)
+
+    session = {"upload_id": upload_id, "filename": safe_filename(filename), "length": length}
+    with open(meta_path, "w") as f:
+        json.dump(session, f)
+    open(part_path, "wb").close()
+
+    return {**session, "offset": 0, "chunk_size": UPLOAD_CHUNK_SIZE}
+
+
+def expire_upload_sessions(partial_folder: str, ttl: int = None, now: float = None) -> int:
+    """
+    Removes the files of sessions that got no chunk for `ttl` seconds.
+    Returns the number of sessions removed.
+    """
+    ttl = UPLOAD_SESSION_TTL if ttl is None else ttl
+    now = time.time() if now is None else now
+    expired = 0
+    for name in os.listdir(partial_folder):
+        upload_id, ext = os.path.splitext(name)
+        if ext != ".json":
+            continue
+        try:
+            paths = _session_paths(partial_folder, upload_id)
+            last_write = max(os.path.getmtime(p) for p in paths if os.path.exists(p))
+        except (FileNotFoundError, ValueError):
+            continue
+        if now - last_write < ttl:
+            continue
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        expired += 1
+    return expired
+
+
+def get_upload_session(partial_folder: str, upload_id: str) -> dict:
+    part_path, meta_path = _session_paths(partial_folder, upload_id)
+    with open(meta_path) as f:
+        session = json.load(f)
+    return {**session, "offset": os.path.getsize(part_path), "chunk_size": UPLOAD_CHUNK_SIZE}
+
+
+async def append_upload_chunk(partial_folder: str, upload_id: str, offset: int, chunks, lock_conn=None) -> dict:
+    """
+    Appends a streamed request body at `offset` (must equal the current size).
+    With lock_conn (Redis), the session is locked from the offset check to
+    the end of the append, so two concurrent PATCHes with the same offset
+    cannot both append: the second gets UploadInProgress.
+    """
+    _session_paths(partial_folder, upload_id)
+    lock_key, token = f"upload_lock:{upload_id}", uuid.uuid4().hex
+    if lock_conn is not None and not await run_in_threadpool(
+        lock_conn.set, lock_key, token, nx=True, ex=UPLOAD_LOCK_SECONDS
+    ):
+        raise UploadInProgress(f"Another chunk of upload {upload_id} is being written")
+
+    try:
+        session = get_upload_session(partial_folder, upload_id)
+        if offset != session["offset"]:
+            raise UploadOffsetMismatch(f"Expected offset {session['offset']}, got {offset}")
+
+        part_path, _ = _session_paths(partial_folder, upload_id)
+        size, _ = await write_chunks(chunks, part_path, session["length"], mode="ab", start_size=offset)
+        return {**session, "offset": size}
+    finally:
+        if lock_conn is not None:
+            await run_in_threadpool(_release_lock, lock_conn, lock_key, token)
+
+
+def _release_lock(conn, key: str, token: str):
+    # Only our own lock: it may have expired and been taken by another PATCH
+    if conn.get(key) == token.encode():
+        conn.delete(key)
+
+
+def finish_upload_session(partial_folder: str, upload_id: str, dest_path: str) -> tuple[int, str]:
+    """
+    Moves a fully received upload to dest_path. Returns (size, sha256).
+    """
+    session = get_upload_session(partial_folder, upload_id)
+    if session["offset"] != session["length"]:
+        raise UploadOffsetMismatch(f"Upload incomplete: {session['offset']}/{session['length']} bytes")
+
+    part_path, meta_path = _session_paths(partial_folder, upload_id)
+    content_hash = hash_file(part_path)
+    os.replace(part_path, dest_path)
+    os.remove(meta_path)
+    return session["length"], content_hash
@@ -1,5 +1,4 @@
-from app.db.models import Base
-from app.db.session import engine
+from app.db.init_db import init_db
 
-Base.metadata.create_all(bind=engine)
-print("Database created ✅")
+applied = init_db()
+print(f"Database up to date ✅ (applied migrations: {applied or 'none'})")
@@ -1,10 +1,25 @@
 from fastapi import FastAPI
+from app.api.limits import BodySizeLimitMiddleware, MULTIPART_OVERHEAD_BYTES
 from app.api.routes import router
+from app.services.batches import MAX_BATCH_FILES
+from app.utils.upload_utils import MAX_UPLOAD_BYTES
+from app.db.init_db import init_db
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI(title="ScrumBot AI")
 
+
+@app.on_event("startup")
+def apply_migrations():
+    init_db()
+
+
 app.include_router(router, prefix="/api")
+# Oversized multipart uploads are refused before their body is read
+app.add_middleware(BodySizeLimitMiddleware, limits={
+    "/api/upload_audio": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    "/api/upload_audio/batch": MAX_BATCH_FILES * (MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES),
+})
 # Allow your frontend origin here
 origins = [
     "http://localhost:5173",  # React dev server
@@ -18,4 +33,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],              # GET, POST, etc.
     allow_headers=["*"],              # Authorization, Content-Type, etc.
+    expose_headers=["X-Next-Cursor", "Retry-After"], # Pagination cursor of GET /logs, back-off on 429
 )
@@ -0,0 +1,110 @@
+"""
+Benchmarks the VoiceLog query patterns before and after the index migration.
+
+Seeds N synthetic logs into a throwaway SQLite database at the baseline
+schema (migration 1), times the report / trends / logs queries, applies the
+remaining migrations and times them again.
+
+Usage (from ScrumBot-backend/):
+    python scripts/bench_log_queries.py --rows 50000 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.migrations import run_migrations  # noqa: E402
+
+EMOTIONS = ["joy", "neutral", "sadness", "anger", "fear", "surprise", "disgust"]
+
+QUERIES = {
+    "report (last 7 days)": (
+        "SELECT id, summary, emotion, created_at FROM voice_logs1 "
+        "WHERE created_at >= :since ORDER BY created_at ASC",
+        {},
+    ),
+    "emotion by day (last 30 days)": (
+        "SELECT date(created_at) AS day, emotion, COUNT(id) FROM voice_logs1 "
+        "WHERE created_at >= :since30 GROUP BY day, emotion",
+        {},
+    ),
+    "logs page by emotion": (
+        "SELECT id, summary, created_at FROM voice_logs1 WHERE emotion = :emotion "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+        {"emotion": "anger"},
+    ),
+}
+
+
+def seed(engine, rows: int, days: int):
+    now = datetime.utcnow()
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            batch.append({
+                "filename": f"bench_{i}.wav",
+                "transcript": "lorem ipsum " * 50,
+                "summary": f"Synthetic update {i}",
+                "emotion": random.choice(EMOTIONS),
+                "created_at": now - timedelta(seconds=random.randint(0, days * 86400)),
+                "blockers": '["waiting on review"]' if i % 5 == 0 else "[]",
+            })
+            if len(batch) == 5000 or i == rows - 1:
+                conn.execute(text(
+                    "INSERT INTO voice_logs1 (filename, transcript, summary, emotion, created_at, blockers) "
+                    "VALUES (:filename, :transcript, :summary, :emotion, :created_at, :blockers)"
+                ), batch)
+                batch = []
+
+
+def time_queries(engine, repeat: int) -> dict:
+    now = datetime.utcnow()
+    params = {"since": now - timedelta(days=7), "since30": now - timedelta(days=30)}
+    results = {}
+    with engine.connect() as conn:
+        for name, (sql, extra) in QUERIES.items():
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                conn.execute(text(sql), {**params, **extra}).fetchall()
+                samples.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(samples)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000, help="Synthetic logs to seed")
+    parser.add_argument("--days", type=int, default=365, help="Spread logs over this many days")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query (median is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        run_migrations(engine, target=1)
+
+        print(f"Seeding {args.rows} logs over {args.days} days...")
+        seed(engine, args.rows, args.days)
+
+        before = time_queries(engine, args.repeat)
+        run_migrations(engine)
+        after = time_queries(engine, args.repeat)
+        engine.dispose()
+
+    print(f"\n{'query':<32}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<32}{before[name]:>14.2f}{after[name]:>14.2f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
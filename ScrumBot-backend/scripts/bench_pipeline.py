@@ -0,0 +1,112 @@
+"""
+Measures pipeline throughput (jobs per minute) and job latency, offline.
+
+Each job runs the LLM stages of an upload: the transcript is cleaned chunk
+by chunk, then summarized into the structured log (the same calls the
+worker makes). Jobs run --concurrency at a time, like that many workers.
+With --audio, the files are transcribed first (needs the Whisper model).
+
+LLM_BACKEND defaults to the stub here, so no Ollama is needed; set
+LLM_STUB_LATENCY to the model's typical response time, or point
+LLM_BACKEND=ollama / LLM_HOST at a real (or stub) server. Every job has a
+distinct transcript, so the LLM cache does not hide the LLM's cost.
+
+Usage (from ScrumBot-backend/):
+    LLM_STUB_LATENCY=0.8 python scripts/bench_pipeline.py --jobs 40 --concurrency 1,2,4,8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("LLM_BACKEND", "stub")
+os.environ.setdefault("LLM_CACHE_REDIS", "false")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import llm_client  # noqa: E402
+from app.utils.llm_utils import structured_summary_with_llm  # noqa: E402
+from app.utils.transcript_utils import clean_transcript_chunkwise  # noqa: E402
+
+SENTENCES = [
+    "Yesterday I finished the login page and fixed the session bug",
+    "Today I will work on the payments integration with the new provider",
+    "I am blocked on the staging database, it has been down since this morning",
+    "The code review for the report export is still waiting on the backend team",
+    "We also need to update the onboarding docs before the release",
+]
+
+
+def make_transcript(job: int, sentences: int) -> str:
+    return ". ".join(f"{SENTENCES[(job + i) % len(SENTENCES)]} ({job}-{i})" for i in range(sentences)) + "."
+
+
+def run_job(transcript: str) -> float:
+    started = time.perf_counter()
+    cleaned = clean_transcript_chunkwise(transcript)
+    structured_summary_with_llm(cleaned)
+    return time.perf_counter() - started
+
+
+def run_level(transcripts: list[str], concurrency: int) -> dict:
+    started = time.perf_counter()
+    # The pipeline prints per-chunk progress; keep the table readable
+    with ThreadPoolExecutor(max_workers=concurrency) as executor, contextlib.redirect_stdout(io.StringIO()):
+        latencies = sorted(executor.map(run_job, transcripts))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "jobs_per_minute": len(transcripts) / elapsed * 60,
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def time_to_first_token(transcript: str) -> tuple[float, float]:
+    started = time.perf_counter()
+    first = None
+    for _ in llm_client.stream_chat([{"role": "user", "content": f'Input: "{transcript}"'}]):
+        if first is None:
+            first = time.perf_counter() - started
+    return first or 0.0, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=20, help="Jobs per concurrency level")
+    parser.add_argument("--sentences", type=int, default=40, help="Sentences per synthetic transcript")
+    parser.add_argument("--concurrency", default="1,2,4", help="Comma separated numbers of jobs run at once")
+    parser.add_argument("--audio", nargs="*", help="Transcribe these files and use their transcripts instead")
+    args = parser.parse_args()
+
+    if args.audio:
+        from app.services.transcription_pool import transcribe_files
+        base = transcribe_files(args.audio)
+    else:
+        base = None
+
+    print(f"LLM backend {llm_client.LLM_BACKEND} ({llm_client.model_id()}), {args.jobs} jobs per level\n")
+    first, total = time_to_first_token(make_transcript(-1, args.sentences))
+    print(f"Streaming: first token after {first:.2f}s, full reply after {total:.2f}s\n")
+
+    print(f"{'concurrency':>12}{'seconds':>10}{'jobs/min':>10}{'p50 s':>8}{'p95 s':>8}")
+    for run, level in enumerate(int(level) for level in args.concurrency.split(",")):
+        # Fresh transcripts per level, so nothing is served from the LLM cache
+        transcripts = [
+            f"{base[job % len(base)]} ({run}-{job})" if base else make_transcript(run * args.jobs + job, args.sentences)
+            for job in range(args.jobs)
+        ]
+        result = run_level(transcripts, level)
+        print(
+            f"{result['concurrency']:>12}{result['seconds']:>10.1f}{result['jobs_per_minute']:>10.1f}"
+            f"{result['p50']:>8.2f}{result['p95']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Measures Whisper throughput (files per minute) for different concurrency levels.
+
+For each level N, one WhisperModel is loaded with num_workers=N and
+cpu_threads=cores // N, and the files are transcribed N at a time on
+threads sharing that model (the same setup as the worker's
+transcription pool).
+
+Usage (from ScrumBot-backend/):
+    python scripts/bench_transcription.py --files harvard.wav --copies 8 --levels 1,2,4
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.model_registry import WHISPER_MODEL_SIZE, WHISPER_COMPUTE_TYPE, available_cores  # noqa: E402
+
+
+def transcribe(model, path: str) -> str:
+    segments, _ = model.transcribe(path)
+    return " ".join(segment.text for segment in segments)
+
+
+def run_level(paths: list[str], concurrency: int, cores: int) -> dict:
+    from faster_whisper import WhisperModel
+
+    threads = max(1, cores // concurrency)
+    model = WhisperModel(
+        WHISPER_MODEL_SIZE,
+        compute_type=WHISPER_COMPUTE_TYPE,
+        device="cpu",
+        num_workers=concurrency,
+        cpu_threads=threads,
+    )
+    # Warm-up run, not timed
+    transcribe(model, paths[0])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda p: transcribe(model, p), paths))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "cpu_threads": threads,
+        "seconds": elapsed,
+        "files_per_minute": len(paths) / elapsed * 60,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", nargs="+", default=["harvard.wav"], help="Audio files to transcribe")
+    parser.add_argument("--copies", type=int, default=4, help="Times each file is transcribed per level")
+    parser.add_argument("--levels", default=None, help="Comma separated concurrency levels (default: 1,2,4,... up to cores)")
+    args = parser.parse_args()
+
+    cores = available_cores()
+    if args.levels:
+        levels = [int(level) for level in args.levels.split(",")]
+    else:
+        levels, level = [], 1
+        while level <= cores:
+            levels.append(level)
+            level *= 2
+
+    paths = args.files * args.copies
+    print(f"Model {WHISPER_MODEL_SIZE} ({WHISPER_COMPUTE_TYPE}), {cores} cores, {len(paths)} files per level\n")
+    print(f"{'concurrency':>12}{'threads':>9}{'seconds':>10}{'files/min':>11}{'files/min/core':>16}")
+    for level in levels:
+        result = run_level(paths, level, cores)
+        print(
+            f"{result['concurrency']:>12}{result['cpu_threads']:>9}{result['seconds']:>10.1f}"
+            f"{result['files_per_minute']:>11.1f}{result['files_per_minute'] / cores:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Checks that the API process starts fast and stays free of worker-only dependencies.
+
+Imports `main` in a fresh interpreter, reports the import time and fails
+(exit code 1) if it exceeds the budget or pulls in ML / LLM / Jira modules.
+
+Usage (from ScrumBot-backend/):
+    python scripts/check_api_startup.py [--budget 3.0]
+
+The same check runs in the test suite (tests/test_api_startup.py).
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that belong to the worker process only
+FORBIDDEN_MODULES = ["torch", "transformers", "faster_whisper", "ctranslate2", "ollama", "jira"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+loaded = sorted({name.split('.')[0] for name in sys.modules} & set(json.loads(sys.argv[1])))
+print(json.dumps({"seconds": elapsed, "forbidden_loaded": loaded}))
+"""
+
+
+def measure_startup() -> dict:
+    """
+    {"seconds": import time of main, "forbidden_loaded": [...]}, measured in a
+    fresh interpreter. Raises RuntimeError if main cannot be imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(FORBIDDEN_MODULES)],
+        capture_output=True, text=True, cwd=BACKEND_DIR,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=3.0, help="Max import time in seconds")
+    args = parser.parse_args()
+
+    try:
+        report = measure_startup()
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+    print(f"API import time: {report['seconds']:.2f}s (budget {args.budget:.2f}s)")
+
+    failed = False
+    if report["forbidden_loaded"]:
+        print(f"❌ Worker-only modules imported by the API: {', '.join(report['forbidden_loaded'])}")
+        failed = True
+    if report["seconds"] > args.budget:
+        print("❌ Startup budget exceeded")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ API startup within budget")
+
+
+if __name__ == "__main__":
+    main()
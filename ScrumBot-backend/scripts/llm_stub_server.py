@@ -0,0 +1,137 @@
+"""
+Local stand-in for the Ollama chat API, to load-test the real LLM client
+(connection pooling, timeouts, streaming) without a model.
+
+Implements /api/chat (streamed and not) and /api/tags. Replies are the
+deterministic ones of the stub backend (app.services.llm_client), sent
+after --latency seconds, streamed one token every --token-latency seconds.
+
+Usage (from ScrumBot-backend/):
+    python scripts/llm_stub_server.py --port 11435 --latency 0.5 --token-latency 0.01
+
+Then point the backend at it:
+    LLM_HOST=http://localhost:11435
+
+GET /_stats returns the number of requests, streamed requests and requests in flight.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.llm_client import StubBackend  # noqa: E402
+
+
+class StubLLM:
+    def __init__(self, latency: float, token_latency: float):
+        self.backend = StubBackend(latency, token_latency)
+        self.stats = {"requests": 0, "streamed": 0, "in_flight": 0, "max_in_flight": 0}
+        self._lock = threading.Lock()
+
+    def started(self, stream: bool):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["streamed"] += int(stream)
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+    def finished(self):
+        with self._lock:
+            self.stats["in_flight"] -= 1
+
+
+def _message(model: str, content: str, done: bool) -> dict:
+    return {
+        "model": model,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "message": {"role": "assistant", "content": content},
+        "done": done,
+        **({"done_reason": "stop"} if done else {}),
+    }
+
+
+def make_handler(llm: StubLLM):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, as Ollama
+
+        def _send(self, status: int, body: dict):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _chunk(self, body: dict):
+            data = json.dumps(body).encode() + b"\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            if self.path == "/_stats":
+                return self._send(200, llm.stats)
+            if self.path == "/api/tags":
+                return self._send(200, {"models": [{"name": "stub", "model": "stub"}]})
+            self._send(404, {"error": f"Not implemented: {self.path}"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if self.path != "/api/chat":
+                return self._send(404, {"error": f"Not implemented: {self.path}"})
+
+            model, messages = body.get("model", "stub"), body.get("messages", [])
+            stream = body.get("stream", True)
+            llm.started(stream)
+            try:
+                time.sleep(llm.backend.latency)
+                reply = llm.backend.reply(model, messages, body.get("format") or None)
+                if not stream:
+                    return self._send(200, _message(model, reply, True))
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for token in re.findall(r"\S+\s*", reply):
+                    time.sleep(llm.backend.token_latency)
+                    self._chunk(_message(model, token, False))
+                self._chunk(_message(model, "", True))
+                self.wfile.write(b"0\r\n\r\n")
+            finally:
+                llm.finished()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the reply starts")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per streamed token")
+    args = parser.parse_args()
+
+    llm = StubLLM(args.latency, args.token_latency)
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), make_handler(llm))
+    print(f"Stub LLM on http://localhost:{args.port} (latency {args.latency}s, {args.token_latency}s per token)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Stats: {llm.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Local stand-in for the Jira REST API, to exercise the Jira outbox
+(bulk creation, retries and backoff) without a real Jira.
+
+Implements just what the jira client uses: serverInfo, issue creation
+(single and bulk) and issue lookup. Every request can be delayed and a
+share of them fail with 503, to simulate a slow or flaky Jira.
+
+Usage (from ScrumBot-backend/):
+    python scripts/mock_jira_server.py --port 8089 --latency 0.5 --failure-rate 0.2
+
+Then point the backend at it:
+    JIRA_SERVER=http://localhost:8089 JIRA_EMAIL=dev@example.com JIRA_API_TOKEN=x JIRA_PROJECT_KEY=SCRUM
+
+GET /_stats returns the number of requests, failures and issues created.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API = "/rest/api/2"
+
+
+class MockJira:
+    def __init__(self, latency: float, failure_rate: float, project: str = "SCRUM"):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.project = project
+        self.issues = {}
+        self.stats = {"requests": 0, "failures": 0, "issues_created": 0, "bulk_requests": 0}
+        self._lock = threading.Lock()
+
+    def create(self, base_url: str, fields: dict) -> dict:
+        with self._lock:
+            key = f"{fields.get('project', {}).get('key') or self.project}-{len(self.issues) + 1}"
+            issue_id = str(10000 + len(self.issues))
+            self.issues[key] = {"id": issue_id, "key": key, "fields": fields}
+            self.stats["issues_created"] += 1
+        return {"id": issue_id, "key": key, "self": f"{base_url}{API}/issue/{issue_id}"}
+
+
+def make_handler(jira: MockJira):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _base_url(self) -> str:
+            return f"http://{self.headers.get('Host', 'localhost')}"
+
+        def _simulate(self) -> bool:
+            """
+            Applies the latency; returns False (after replying 503) for a simulated failure.
+            """
+            with jira._lock:
+                jira.stats["requests"] += 1
+            time.sleep(jira.latency)
+            if random.random() < jira.failure_rate:
+                with jira._lock:
+                    jira.stats["failures"] += 1
+                self._send(503, {"errorMessages": ["Service unavailable (simulated)"]})
+                return False
+            return True
+
+        def _body(self) -> dict:
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            if self.path == "/_stats":
+                return self._send(200, jira.stats)
+            if not self._simulate():
+                return
+            if self.path.startswith(f"{API}/serverInfo"):
+                return self._send(200, {
+                    "baseUrl": self._base_url(),
+                    "version": "9.12.0",
+                    "versionNumbers": [9, 12, 0],
+                    "deploymentType": "Server",
+                    "serverTitle": "Mock Jira",
+                })
+            match = re.match(rf"{API}/issue/([^/?]+)", self.path)
+            if match:
+                issue = jira.issues.get(match.group(1))
+                if issue is None:
+                    return self._send(404, {"errorMessages": ["Issue does not exist"]})
+                return self._send(200, {**issue, "self": f"{self._base_url()}{API}/issue/{issue['id']}"})
+            self._send(404, {"errorMessages": [f"Not implemented: {self.path}"]})
+
+        def do_POST(self):
+            if not self._simulate():
+                return
+            body = self._body()
+            if self.path.startswith(f"{API}/issue/bulk"):
+                with jira._lock:
+                    jira.stats["bulk_requests"] += 1
+                issues = [jira.create(self._base_url(), update["fields"]) for update in body.get("issueUpdates", [])]
+                return self._send(201, {"issues": issues, "errors": []})
+            if self.path.startswith(f"{API}/issue"):
+                return self._send(201, jira.create(self._base_url(), body["fields"]))
+            self._send(404, {"errorMessages": [f"Not implemented: {self.path}"]})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    args = parser.parse_args()
+
+    jira = MockJira(args.latency, args.failure_rate)
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), make_handler(jira))
+    print(f"Mock Jira on http://localhost:{args.port} (latency {args.latency}s, failure rate {args.failure_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Stats: {jira.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.migrations import run_migrations  # noqa: E402
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Sessions on a fresh, fully migrated SQLite database.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    run_migrations(engine)
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def redis_conn(monkeypatch):
+    """
+    In-memory Redis, also returned by app.services.queues.get_redis.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    conn = fakeredis.FakeRedis()
+    monkeypatch.setattr("app.services.queues.get_redis", lambda: conn)
+    return conn
@@ -0,0 +1,17 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from check_api_startup import measure_startup  # noqa: E402
+
+# Generous on purpose: a cold CI machine is slower than a laptop
+API_STARTUP_BUDGET = float(os.getenv("API_STARTUP_BUDGET", "3.0"))
+
+
+def test_api_imports_no_worker_only_modules():
+    assert measure_startup()["forbidden_loaded"] == []
+
+
+def test_api_import_time_within_budget():
+    assert measure_startup()["seconds"] < API_STARTUP_BUDGET
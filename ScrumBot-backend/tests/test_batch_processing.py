@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("faster_whisper")
+
+from app.db.models import VoiceLog  # noqa: E402
+from app.services import transcription_pool  # noqa: E402
+from worker import tasks  # noqa: E402
+
+
+class FakeJob:
+    def __init__(self, conn):
+        self.connection = conn
+        self.id = "batch-job"
+        self.meta = {}
+
+    def save_meta(self):
+        pass
+
+
+@pytest.fixture
+def pipeline(redis_conn, session_factory, monkeypatch):
+    def transcribe(path):
+        if path.startswith("broken"):
+            raise RuntimeError(f"cannot decode {path}")
+        return f"transcript of {path}"
+
+    def structure(transcript):
+        if "garbled" in transcript:
+            raise ValueError("LLM unavailable")
+        return {"summary": transcript, "blockers": [], "progress": [], "next_steps": []}
+
+    monkeypatch.setattr(tasks, "get_current_job", lambda: FakeJob(redis_conn))
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    monkeypatch.setattr(transcription_pool, "transcribe_audio", transcribe)
+    monkeypatch.setattr(tasks, "clean_transcript_chunkwise", lambda text: text)
+    monkeypatch.setattr(tasks, "structured_summary_with_llm", structure)
+    monkeypatch.setattr(tasks, "detect_emotions_batch", lambda texts: ["neutral"] * len(texts))
+    return session_factory
+
+
+def test_failing_files_do_not_fail_the_batch(pipeline):
+    files = [("ok-1.wav", "ok-1.wav", None), ("broken.wav", "broken.wav", None),
+             ("garbled.wav", "garbled.wav", None), ("ok-2.wav", "ok-2.wav", None)]
+    result = tasks.process_audio_batch("b1", files)
+
+    ok_1, broken, garbled, ok_2 = result["results"]
+    assert broken == {"file": "broken.wav", "error": "cannot decode broken.wav", "stage": "asr"}
+    assert garbled["stage"] == "clean_structure" and "log_id" not in garbled
+    assert not ok_1["cached"] and not ok_2["cached"]
+
+    db = pipeline()
+    saved = {log.id: log.filename for log in db.query(VoiceLog)}
+    db.close()
+    assert saved == {ok_1["log_id"]: "ok-1.wav", ok_2["log_id"]: "ok-2.wav"}
+
+
+def test_batch_fails_when_every_file_fails(pipeline):
+    with pytest.raises(RuntimeError, match="Every file"):
+        tasks.process_audio_batch("b2", [("broken-1.wav", "a", None), ("broken-2.wav", "b", None)])
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+
+from app.db.migrations import run_migrations
+from app.db.models import BlockerCluster, JiraOutbox, VoiceLog
+from app.services import blocker_index, jira_outbox
+
+
+def add_log(db, name: str, blockers: list[str]) -> VoiceLog:
+    log = VoiceLog(filename=name, transcript="...", summary="...", emotion="neutral", blockers=blockers)
+    db.add(log)
+    db.flush()
+    clusters = blocker_index.index_log(db, log)
+    jira_outbox.enqueue_blocker_issue(db, log, cluster=clusters[0] if clusters else None)
+    db.commit()
+    return log
+
+
+def test_rephrased_blockers_share_a_cluster(db):
+    first = blocker_index.assign_cluster(db, "Waiting on the API keys")
+    again = blocker_index.assign_cluster(db, "Still waiting for the API keys!")
+    other = blocker_index.assign_cluster(db, "Staging database is down")
+
+    assert again.id == first.id and other.id != first.id
+    assert first.mentions == 2 and first.label == "Waiting on the API keys"
+
+
+def test_top_clusters_counts_mentions(db):
+    add_log(db, "a.wav", ["Waiting on the API keys"])
+    add_log(db, "b.wav", ["waiting for API keys", "Staging database is down"])
+
+    top = blocker_index.top_clusters(db)
+    assert [(c["label"], c["count"]) for c in top] == [("Waiting on the API keys", 2), ("Staging database is down", 1)]
+
+
+def test_rebuild_does_not_move_issues_to_other_blockers(db, monkeypatch):
+    monkeypatch.setattr(jira_outbox, "create_jira_issues", lambda issues: [{"key": "SB-1", "error": None}])
+    vpn = add_log(db, "a.wav", ["VPN keeps dropping"])
+    add_log(db, "b.wav", [])
+    jira_outbox.drain(db)
+
+    # The VPN log is edited; after the rebuild its cluster id belongs to another blocker
+    vpn.blockers = []
+    db.commit()
+    blocker_index.rebuild(db)
+    api_keys = add_log(db, "c.wav", ["Waiting on the API keys"])
+    assert db.query(BlockerCluster).one().id == 1
+
+    assert api_keys.jira_issue_url is None
+    assert db.query(JiraOutbox).filter(JiraOutbox.status == "pending").count() == 1
+
+
+def test_migration_rekeys_outbox_rows_by_cluster_seed(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    run_migrations(engine, target=6)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO voice_logs1 (id, filename, blockers) VALUES (1, 'a.wav', '[\"VPN keeps dropping\"]')"))
+        conn.execute(text("INSERT INTO blocker_clusters (id, label, normalized, mentions, first_seen, last_seen) "
+                          "VALUES (1, 'VPN keeps dropping', 'vpn keeps dropping', 1, :now, :now)"), {"now": datetime.utcnow()})
+        conn.execute(text("INSERT INTO blocker_mentions (log_id, cluster_id, text, day) VALUES (1, 1, 'VPN keeps dropping', :day)"),
+                     {"day": datetime.utcnow().date()})
+        conn.execute(text("INSERT INTO jira_outbox (log_id, dedup_key, summary, description, issue_type, status, attempts, "
+                          "next_attempt_at, created_at) VALUES (1, 'blocker_cluster:1', 'Blocker from ScrumBot: VPN keeps dropping', "
+                          "'', 'Task', 'done', 1, :now, :now)"), {"now": datetime.utcnow()})
+
+    assert run_migrations(engine) == [7]
+    with engine.begin() as conn:
+        key = conn.execute(text("SELECT dedup_key FROM jira_outbox")).scalar()
+    assert key == jira_outbox.cluster_key(BlockerCluster(normalized="vpn keeps dropping"))
+    engine.dispose()
@@ -0,0 +1,95 @@
+import pytest
+
+from app.utils import emotion_utils
+from app.utils.emotion_utils import _token_windows, detect_emotions_batch, get_emotion_probabilities_batch
+
+
+class StubTokenizer:
+    """One token per word; token ids are the word positions in a shared vocabulary."""
+    model_max_length = 10
+
+    def __init__(self):
+        self.vocab = []
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def __call__(self, text, add_special_tokens=True):
+        ids = []
+        for word in text.split():
+            if word not in self.vocab:
+                self.vocab.append(word)
+            ids.append(self.vocab.index(word))
+        return {"input_ids": ids}
+
+    def decode(self, ids):
+        return " ".join(self.vocab[i] for i in ids)
+
+
+class StubClassifier:
+    """Scores each window by the share of its words that are an emotion label."""
+
+    def __init__(self):
+        self.tokenizer = StubTokenizer()
+        self.calls = []
+
+    def __call__(self, windows, batch_size=None, truncation=False):
+        self.calls.append((list(windows), batch_size))
+        results = []
+        for window in windows:
+            words = window.split()
+            assert len(words) <= self.tokenizer.model_max_length - 2
+            if not words:
+                results.append([{"label": "neutral", "score": 1.0}])
+                continue
+            labels = sorted(set(words))
+            results.append([{"label": label, "score": words.count(label) / len(words)} for label in labels])
+        return results
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    stub = StubClassifier()
+    monkeypatch.setattr(emotion_utils, "get_emotion_classifier", lambda: stub)
+    monkeypatch.setattr(emotion_utils, "EMOTION_WINDOW_STRIDE", 2)
+    return stub
+
+
+def test_short_text_is_a_single_window(classifier):
+    assert _token_windows(classifier.tokenizer, "joy joy sadness") == [("joy joy sadness", 3)]
+
+
+def test_long_text_is_split_into_overlapping_windows(classifier):
+    text = " ".join(f"w{i}" for i in range(20))
+    windows = _token_windows(classifier.tokenizer, text)
+
+    # 8 usable tokens per window, consecutive windows share 2
+    assert [n for _, n in windows] == [8, 8, 8]
+    assert windows[0][0].split() == [f"w{i}" for i in range(0, 8)]
+    assert windows[1][0].split() == [f"w{i}" for i in range(6, 14)]
+    assert windows[2][0].split() == [f"w{i}" for i in range(12, 20)]
+
+
+def test_window_scores_are_weighted_by_length(classifier):
+    # Windows: 8 x joy, then "joy joy sadness sadness" (4 tokens)
+    text = " ".join(["joy"] * 8 + ["sadness"] * 2)
+    probabilities = get_emotion_probabilities_batch([text])[0]
+
+    assert probabilities == {"joy": round(10 / 12, 4), "sadness": round(2 / 12, 4)}
+    assert len(classifier.calls[0][0]) == 2
+
+
+def test_batch_results_keep_the_input_order(classifier):
+    long_sad = " ".join(["sadness"] * 9 + ["joy"] * 3)
+    texts = ["joy", long_sad, "anger anger joy", "", "sadness"]
+
+    assert detect_emotions_batch(texts, batch_size=4) == ["joy", "sadness", "anger", "neutral", "sadness"]
+    # Every window of every text went through a single batched call
+    assert len(classifier.calls) == 1
+    assert len(classifier.calls[0][0]) == 6
+    assert classifier.calls[0][1] == 4
+
+
+def test_empty_batch_skips_the_model(classifier):
+    assert detect_emotions_batch([]) == []
+    assert classifier.calls == []
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+
+from app.db.models import VoiceLog
+from app.services import insights
+from app.utils import llm_utils
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """
+    Trend analyzer replies: a JSON summary, or None (unparseable) while llm.down.
+    """
+    class LLM:
+        down = False
+        prompts = []
+
+    def chat_json(prompt, task, schema=None):
+        LLM.prompts.append(task)
+        if LLM.down:
+            return None
+        # Every key of every insights format
+        return {
+            "summary": f"{task} summary", "blockers": [], "next_steps": [], "emotion_trend": "mixed",
+            "progress_health": "good", "top_blockers": [], "frequent_next_steps": [], "risk_level": "low",
+            "ai_insights": "ok",
+        }
+
+    monkeypatch.setattr(llm_utils, "chat_json", chat_json)
+    return LLM
+
+
+def add_log(db, name: str, emotion: str = "joy") -> VoiceLog:
+    log = VoiceLog(filename=name, summary=f"worked on {name}", emotion=emotion, created_at=datetime.utcnow())
+    db.add(log)
+    db.commit()
+    return log
+
+
+def test_unchanged_days_are_not_summarized_again(db, redis_conn, llm):
+    add_log(db, "a.wav")
+    assert insights.trend_insights(redis_conn, db, 7)["resummarized_days"]
+    assert insights.trend_insights(redis_conn, db, 7)["resummarized_days"] == []
+
+
+def test_rescored_emotion_changes_the_day_fingerprint(db, redis_conn, llm):
+    log = add_log(db, "a.wav", emotion="joy")
+    insights.trend_insights(redis_conn, db, 7)
+
+    # Same count and last id, different content (as after rescore_emotions)
+    log.emotion = "sadness"
+    db.commit()
+    assert insights.trend_insights(redis_conn, db, 7)["resummarized_days"]
+
+
+def test_fallback_summaries_are_not_cached(db, redis_conn, llm):
+    add_log(db, "a.wav")
+    llm.down = True
+    result = insights.trend_insights(redis_conn, db, 7)
+    assert result["ai_insights"] == "Could not analyze trends properly."
+    assert llm_utils.FALLBACK_KEY not in result
+    assert all(llm_utils.FALLBACK_KEY not in day for day in result["daily"])
+
+    # The model is back: the day is summarized again and the report regenerated
+    llm.down = False
+    result = insights.trend_insights(redis_conn, db, 7)
+    assert result["resummarized_days"] and result["ai_insights"] == "ok"
+
+
+def test_partial_reply_counts_as_a_fallback(db, redis_conn, llm, monkeypatch):
+    add_log(db, "a.wav")
+    # Parses, but only has a summary (e.g. the stub backend's generic reply)
+    monkeypatch.setattr(llm_utils, "chat_json", lambda prompt, task, schema=None: {"summary": "stub"})
+
+    result = insights.trend_insights(redis_conn, db, 7)
+    assert result["ai_insights"] == "Could not analyze trends properly."
+    assert result["daily"][0]["summary"] == ""
+    assert redis_conn.keys("insights:*") == []
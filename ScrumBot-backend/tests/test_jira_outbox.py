@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pytest
+
+from app.db.models import JiraOutbox, VoiceLog
+from app.services import jira_outbox
+
+
+def add_log(db, name: str, blocker: str) -> VoiceLog:
+    log = VoiceLog(filename=name, transcript="...", summary="...", emotion="neutral", blockers=[blocker])
+    db.add(log)
+    db.flush()
+    jira_outbox.enqueue_blocker_issue(db, log)
+    db.commit()
+    return log
+
+
+def jira_up(issues):
+    return [{"key": f"SB-{i}", "error": None} for i, _ in enumerate(issues, 1)]
+
+
+def jira_down(issues):
+    raise ConnectionError("Jira unreachable")
+
+
+def test_same_blocker_shares_one_issue(db, monkeypatch):
+    requests = []
+    monkeypatch.setattr(jira_outbox, "create_jira_issues", lambda issues: requests.append(issues) or jira_up(issues))
+    first = add_log(db, "a.wav", "Staging DB is down")
+    second = add_log(db, "b.wav", "staging db is down!")
+
+    assert jira_outbox.drain(db) == {"due": 2, "created": 1, "linked": 1, "failed": 0}
+    assert len(requests) == 1 and len(requests[0]) == 1
+    db.refresh(first)
+    db.refresh(second)
+    assert first.jira_issue_url == second.jira_issue_url
+    assert first.jira_issue_url.endswith("/browse/SB-1")
+
+    # Seen again later: linked at enqueue time, nothing queued
+    third = add_log(db, "c.wav", "Staging DB is down")
+    assert third.jira_issue_url == first.jira_issue_url
+    assert jira_outbox.get_stats(db)["pending"] == 0
+
+
+def test_failures_back_off_then_give_up(db, monkeypatch):
+    monkeypatch.setattr(jira_outbox, "create_jira_issues", jira_down)
+    monkeypatch.setattr(jira_outbox, "JIRA_MAX_ATTEMPTS", 2)
+    add_log(db, "a.wav", "Waiting on the API keys")
+
+    assert jira_outbox.drain(db)["failed"] == 1
+    row = db.query(JiraOutbox).one()
+    assert row.status == "pending" and row.attempts == 1
+    assert "ConnectionError" in row.last_error
+    assert jira_outbox.next_retry_in(db) > 0
+    # Not due yet
+    assert jira_outbox.drain(db)["due"] == 0
+
+    row.next_attempt_at = datetime.utcnow()
+    db.commit()
+    jira_outbox.drain(db)
+    db.refresh(row)
+    assert row.status == "failed" and row.attempts == 2
+    assert jira_outbox.next_retry_in(db) is None
+
+
+def test_failing_row_goes_through_one_retry_cycle(session_factory, redis_conn, monkeypatch):
+    pytest.importorskip("faster_whisper")
+    from rq.job import Job
+    from rq.registry import ScheduledJobRegistry
+    from app.services.queues import ANALYTICS, get_queue
+    from worker import tasks
+
+    monkeypatch.setattr("app.services.queues._queues", {})
+    monkeypatch.setattr(tasks, "get_redis", lambda: redis_conn)
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    db = session_factory()
+    log = add_log(db, "a.wav", "Blocked on the VPN")
+
+    monkeypatch.setattr(jira_outbox, "create_jira_issues", jira_down)
+    result = tasks.drain_jira_outbox()
+    assert result["failed"] == 1 and result["next_retry_in"] > 0
+
+    # The retry is scheduled as a real RQ job, with our flag as a job kwarg
+    (job_id,) = ScheduledJobRegistry(queue=get_queue(ANALYTICS)).get_job_ids()
+    job = Job.fetch(job_id, connection=redis_conn)
+    assert job.kwargs == {"is_retry": True}
+
+    db.query(JiraOutbox).update({JiraOutbox.next_attempt_at: datetime.utcnow()})
+    db.commit()
+    monkeypatch.setattr(jira_outbox, "create_jira_issues", jira_up)
+    result = job.perform()
+
+    assert result["created"] == 1 and "next_retry_in" not in result
+    assert not redis_conn.exists(tasks.JIRA_RETRY_SCHEDULED_KEY)
+    db.refresh(log)
+    assert log.jira_issue_url.endswith("/browse/SB-1")
+    db.close()
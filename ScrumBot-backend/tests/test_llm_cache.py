@@ -0,0 +1,85 @@
+import pytest
+
+from app.services import llm_client
+from app.utils import llm_cache as cache_module
+from app.utils import llm_utils
+from app.utils.llm_cache import LLMCache, MemoryTier, RedisTier, get_shared_stats, make_key
+
+MESSAGES = [{"role": "user", "content": "Summarize the standup"}]
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, messages, model=None, options=None, format=None):
+        self.calls.append((model, options, format))
+        return f"reply {len(self.calls)}"
+
+
+@pytest.fixture
+def llm(monkeypatch, redis_conn):
+    fake = FakeLLM()
+    monkeypatch.setattr(llm_client, "chat", fake.chat)
+    monkeypatch.setattr(llm_utils, "llm_cache", LLMCache([MemoryTier(8), RedisTier(60)]))
+    return fake
+
+
+def test_memory_tier_hit_and_miss(llm):
+    first = llm_utils.cached_chat(messages=MESSAGES)
+    second = llm_utils.cached_chat(messages=MESSAGES)
+
+    assert first == second == {"message": {"role": "assistant", "content": "reply 1"}}
+    assert len(llm.calls) == 1
+    counters = llm_utils.llm_cache.counters
+    assert counters["misses"] == 1 and counters["memory_hits"] == 1 and counters["redis_hits"] == 0
+
+
+def test_redis_tier_hit_and_miss(llm, redis_conn):
+    llm_utils.cached_chat(messages=MESSAGES)
+
+    # Another worker: empty memory tier, same Redis
+    other = LLMCache([MemoryTier(8), RedisTier(60)])
+    llm_utils.llm_cache = other
+    assert llm_utils.cached_chat(messages=MESSAGES)["message"]["content"] == "reply 1"
+    assert len(llm.calls) == 1
+    assert other.counters["redis_hits"] == 1 and other.counters["misses"] == 0
+    # The hit was back-filled into the memory tier
+    assert len(other.tiers[0]) == 1
+
+    assert llm_utils.cached_chat(messages=[{"role": "user", "content": "Something else"}])["message"]["content"] == "reply 2"
+    assert other.counters["misses"] == 1
+    assert get_shared_stats(redis_conn) == {"misses": 2, "redis_hits": 1}
+
+
+def test_uncacheable_responses_are_not_stored(llm):
+    never = lambda response: False
+    llm_utils.cached_chat(messages=MESSAGES, cacheable=never)
+    llm_utils.cached_chat(messages=MESSAGES, cacheable=never)
+    assert len(llm.calls) == 2
+
+
+def test_key_covers_model_options_format_and_prompt_version(monkeypatch):
+    key = make_key("llama3", MESSAGES, {"temperature": 0})
+
+    assert make_key("mistral", MESSAGES, {"temperature": 0}) != key
+    assert make_key("llama3", MESSAGES, {"temperature": 0.7}) != key
+    assert make_key("llama3", MESSAGES, {"temperature": 0}, fmt="json") != key
+    assert make_key("llama3", [{"role": "user", "content": "Other"}], {"temperature": 0}) != key
+    # Whitespace in the prompt is not meaningful
+    assert make_key("llama3", [{"role": "user", "content": "  Summarize\n  the standup "}], {"temperature": 0}) == key
+
+    monkeypatch.setattr(cache_module, "PROMPT_VERSION", "next")
+    assert make_key("llama3", MESSAGES, {"temperature": 0}) != key
+
+
+def test_memory_tier_evicts_least_recently_used():
+    tier = MemoryTier(2)
+    tier.set("a", 1)
+    tier.set("b", 2)
+    assert tier.get("a") == 1  # "a" is now the most recently used
+    tier.set("c", 3)
+
+    assert tier.get("b") is None
+    assert tier.get("a") == 1 and tier.get("c") == 3
+    assert len(tier) == 2
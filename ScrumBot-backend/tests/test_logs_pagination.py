@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.db.models import VoiceLog
+from main import app
+
+
+@pytest.fixture
+def client(db):
+    start = datetime(2024, 1, 1)
+    db.add_all([
+        VoiceLog(filename=f"{i}.wav", summary=f"log {i}", emotion="neutral", created_at=start + timedelta(hours=i))
+        for i in range(120)
+    ])
+    db.commit()
+    app.dependency_overrides[routes.get_db] = lambda: db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_without_limit_every_log_is_returned(client):
+    response = client.get("/api/logs")
+    assert response.status_code == 200
+    assert len(response.json()) == 120
+    assert "x-next-cursor" not in response.headers
+
+
+def test_pages_follow_the_cursor_newest_first(client):
+    seen, cursor = [], None
+    while True:
+        response = client.get("/api/logs", params={"limit": 50, **({"cursor": cursor} if cursor else {})})
+        seen += [log["summary"] for log in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert seen == [f"log {i}" for i in reversed(range(120))]
+
+
+def test_cursor_alone_uses_the_default_page_size(client):
+    cursor = client.get("/api/logs", params={"limit": 1}).headers["x-next-cursor"]
+    assert len(client.get("/api/logs", params={"cursor": cursor}).json()) == routes.LOG_PAGE_SIZE
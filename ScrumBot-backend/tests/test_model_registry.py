@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+
+from app.services import model_registry
+from app.services.queues import get_redis
+from main import app
+
+
+def test_model_loads_are_published_for_the_api(redis_conn, monkeypatch):
+    monkeypatch.setattr(model_registry, "_LOADERS", {"fake": (lambda: object(), lambda: "fake model")})
+    monkeypatch.setattr(model_registry, "_models", {})
+    monkeypatch.setattr(model_registry, "_stats", {})
+
+    model = model_registry.get_model("fake")
+    assert model_registry.get_model("fake") is model
+
+    app.dependency_overrides[get_redis] = lambda: redis_conn
+    try:
+        response = TestClient(app).get("/api/metrics/models")
+    finally:
+        app.dependency_overrides.clear()
+    (process,) = response.json().values()
+    assert process["loaded"]["fake"]["model"] == "fake model"
+    assert process["loaded"]["fake"]["load_seconds"] >= 0
+
+
+def test_preload_only_loads_the_listed_models(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(model_registry, "get_model", loaded.append)
+    monkeypatch.setattr(model_registry, "PRELOAD_MODELS", "whisper, emotion")
+    model_registry.preload_from_env()
+    assert loaded == ["whisper", "emotion"]
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import progress
+
+
+@pytest.fixture
+def async_conn():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.fixture(autouse=True)
+def fast_checks(monkeypatch):
+    monkeypatch.setattr(progress, "JOB_STATUS_CHECK_SECONDS", 0)
+
+
+async def _collect(gen):
+    return [frame async for frame in gen]
+
+
+def _events(frames):
+    return [json.loads(f.split("data: ", 1)[1]) for f in frames if f.startswith("event:")]
+
+
+def _set_job_status(conn, job_id, status):
+    from rq.job import Job
+    return conn.hset(Job.key_for(job_id), "status", status)
+
+
+def test_unknown_job_ends_the_stream_with_a_failure(async_conn):
+    events = _events(asyncio.run(asyncio.wait_for(_collect(progress.stream_events(async_conn, ["nope"])), 10)))
+    assert [(e["job_id"], e["stage"]) for e in events] == [("nope", "failed")]
+
+
+def test_job_that_died_without_a_terminal_event(async_conn):
+    async def run():
+        await async_conn.set(progress._last_key("j1"), json.dumps({"job_id": "j1", "stage": "transcribing"}))
+        await _set_job_status(async_conn, "j1", "failed")
+        return await _collect(progress.stream_events(async_conn, ["j1"]))
+
+    events = _events(asyncio.run(asyncio.wait_for(run(), 10)))
+    assert [e["stage"] for e in events] == ["transcribing", "failed"]
+
+
+def test_finished_job_just_closes_the_stream(async_conn):
+    async def run():
+        await _set_job_status(async_conn, "j1", "finished")
+        return await _collect(progress.stream_events(async_conn, ["j1"]))
+
+    assert _events(asyncio.run(asyncio.wait_for(run(), 10))) == []
+
+
+def test_running_job_stream_stops_at_the_deadline(async_conn):
+    async def run():
+        await _set_job_status(async_conn, "j1", "started")
+        return await _collect(progress.stream_events(async_conn, ["j1"], max_seconds=1.5))
+
+    assert _events(asyncio.run(asyncio.wait_for(run(), 10))) == []
+
+
+def test_terminal_event_ends_the_stream(async_conn):
+    async def run():
+        await _set_job_status(async_conn, "j1", "started")
+        stream = progress.stream_events(async_conn, ["j1"])
+        frames = []
+
+        async def consume():
+            async for frame in stream:
+                frames.append(frame)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.2)
+        await async_conn.publish(progress.channel("j1"), json.dumps({"job_id": "j1", "stage": "saved", "log_id": 3}))
+        await task
+        return frames
+
+    assert [e["stage"] for e in _events(asyncio.run(asyncio.wait_for(run(), 10)))] == ["saved"]
+
+
+def test_no_event_replaces_a_terminal_one(redis_conn):
+    pubsub = redis_conn.pubsub()
+    pubsub.subscribe(progress.channel("j1"))
+    progress.publish_progress(redis_conn, "j1", "saved", log_id=3)
+    progress.publish_progress(redis_conn, "j1", "partial_summary", summary="late")
+
+    assert json.loads(redis_conn.get(progress._last_key("j1")))["stage"] == "saved"
+    published = list(iter(lambda: pubsub.get_message(timeout=0.2), None))
+    assert [json.loads(m["data"])["stage"] for m in published if m["type"] == "message"] == ["saved"]
+
+
+def test_idle_stream_sends_keep_alives(async_conn, monkeypatch):
+    monkeypatch.setattr(progress, "HEARTBEAT_SECONDS", 0.5)
+
+    async def run():
+        await _set_job_status(async_conn, "j1", "started")
+        return await _collect(progress.stream_events(async_conn, ["j1"], max_seconds=2.5))
+
+    frames = asyncio.run(asyncio.wait_for(run(), 10))
+    assert _events(frames) == []
+    assert ": keep-alive\n\n" in frames
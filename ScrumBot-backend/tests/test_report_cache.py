@@ -0,0 +1,98 @@
+import csv
+import io
+from datetime import datetime
+
+import pytest
+import redis
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.api.report import CSV_FIELDS, render_csv
+from app.db.models import VoiceLog
+from app.services import report_cache
+from app.services.queues import get_redis
+from main import app
+
+
+class RedisDown:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise redis.ConnectionError("Connection refused")
+        return fail
+
+
+def row(**fields):
+    return {
+        "id": 1, "created_at": datetime(2024, 5, 1, 9, 30), "filename": "a.wav", "summary": "Did things",
+        "emotion": "joy", "progress": [], "next_steps": [], "blockers": [], "jira_issue_url": None, **fields,
+    }
+
+
+def test_cached_report_is_dropped_by_invalidate(redis_conn):
+    key = report_cache.cache_key(redis_conn, 7, "markdown", True)
+    assert b"".join(report_cache.stream_and_store(redis_conn, key, iter([b"# Report", b"\n"]))) == b"# Report\n"
+    assert report_cache.get(redis_conn, key) == b"# Report\n"
+
+    report_cache.invalidate(redis_conn)
+    new_key = report_cache.cache_key(redis_conn, 7, "markdown", True)
+    assert new_key != key and report_cache.get(redis_conn, new_key) is None
+
+
+def test_oversized_report_is_streamed_but_not_cached(redis_conn, monkeypatch):
+    monkeypatch.setattr(report_cache, "REPORT_CACHE_MAX_BYTES", 4)
+    key = report_cache.cache_key(redis_conn, 7, "csv", False)
+    assert list(report_cache.stream_and_store(redis_conn, key, iter([b"abc", b"def"]))) == [b"abc", b"def"]
+    assert report_cache.get(redis_conn, key) is None
+
+
+def test_redis_outage_renders_without_the_cache():
+    conn = RedisDown()
+    key = report_cache.cache_key(conn, 7, "markdown", True)
+    assert key is None and report_cache.get(conn, key) is None
+    assert b"".join(report_cache.stream_and_store(conn, key, iter([b"report"]))) == b"report"
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    db = session_factory()
+    db.add(VoiceLog(filename="a.wav", summary="Shipped the export", emotion="joy", created_at=datetime.utcnow()))
+    db.commit()
+    db.close()
+    monkeypatch.setattr(routes, "SessionLocal", session_factory)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_report_endpoint_survives_a_redis_outage(client):
+    app.dependency_overrides[get_redis] = RedisDown
+    response = client.get("/api/report")
+    assert response.status_code == 200
+    assert "Shipped the export" in response.json()["markdown_report"]
+
+    response = client.get("/api/report/export", params={"format": "csv"})
+    assert response.status_code == 200 and response.headers["x-report-cache"] == "miss"
+
+
+def test_csv_of_an_empty_window_is_the_header():
+    assert "".join(render_csv(iter([]), 7)) == ",".join(CSV_FIELDS) + "\r\n"
+
+
+def test_csv_rows_join_lists_and_quote_text():
+    rendered = "".join(render_csv(iter([
+        row(summary='Fixed "login", then deployed\nto staging', blockers=["VPN", "API keys"]),
+        row(id=2, progress=["export"]),
+    ]), 7))
+    records = list(csv.DictReader(io.StringIO(rendered)))
+
+    assert records[0]["summary"] == 'Fixed "login", then deployed\nto staging'
+    assert records[0]["blockers"] == "VPN; API keys"
+    assert records[0]["created_at"] == "2024-05-01T09:30:00"
+    assert records[1]["progress"] == "export"
+    assert list(records[0]) == CSV_FIELDS
+
+
+def test_csv_with_transcripts_adds_the_column():
+    rendered = "".join(render_csv(iter([row(transcript="um, so yesterday")]), 7))
+    (record,) = csv.DictReader(io.StringIO(rendered))
+    assert list(record) == CSV_FIELDS + ["transcript"]
+    assert record["transcript"] == "um, so yesterday"
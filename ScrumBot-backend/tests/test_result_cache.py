@@ -0,0 +1,55 @@
+import pytest
+
+from app.db.models import VoiceLog
+from app.services import result_cache
+
+
+def _log(db, content_hash, version=None, name="a.wav"):
+    log = VoiceLog(filename=name, summary="s", emotion="neutral", content_hash=content_hash,
+                   pipeline_version=version or result_cache.pipeline_version())
+    db.add(log)
+    db.commit()
+    return log
+
+
+def test_lookup_falls_back_to_the_database_after_a_redis_flush(db, redis_conn):
+    log = _log(db, "h1")
+    assert result_cache.lookup(redis_conn, db, "h1") == log.id
+    # The Redis entry was restored
+    assert redis_conn.get(result_cache._key("h1")) == str(log.id).encode()
+    assert result_cache.get_stats(redis_conn)["hits"] == 1
+
+
+def test_lookup_without_redis(db):
+    log = _log(db, "h1")
+    assert result_cache.lookup(None, db, "h1") == log.id
+    assert result_cache.lookup(None, db, "other") is None
+
+
+def test_logs_of_another_pipeline_version_are_not_reused(db, redis_conn):
+    _log(db, "h1", version="old")
+    assert result_cache.lookup(redis_conn, db, "h1") is None
+    assert result_cache.get_stats(redis_conn)["misses"] == 1
+
+
+def test_stale_redis_entry_of_a_deleted_log_is_dropped(db, redis_conn):
+    log = _log(db, "h1")
+    result_cache.store(redis_conn, "h1", log.id)
+    db.delete(log)
+    db.commit()
+    assert result_cache.lookup(redis_conn, db, "h1") is None
+    assert redis_conn.get(result_cache._key("h1")) is None
+
+
+def test_duplicate_upload_is_reused_and_removed(db, session_factory, tmp_path, monkeypatch):
+    pytest.importorskip("faster_whisper")
+    from worker import tasks
+
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+    log = _log(db, "h1")
+    duplicate = tmp_path / "dup.wav"
+    duplicate.write_bytes(b"audio")
+
+    result = tasks.process_audio(str(duplicate), "dup.wav", "h1")
+    assert result == {"log_id": log.id, "cached": True, "timings": {}}
+    assert not duplicate.exists()
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+pytest.importorskip("faster_whisper")
+
+from worker import tasks  # noqa: E402
+
+
+class FakeJob:
+    def __init__(self, conn):
+        self.connection = conn
+        self.id = "job-1"
+        self.meta = {}
+
+    def save_meta(self):
+        pass
+
+
+def test_rolling_summary_finishes_before_cleaning_returns(redis_conn, monkeypatch):
+    job = FakeJob(redis_conn)
+    finished = []
+
+    def slow_summary(text):
+        time.sleep(0.3)
+        finished.append(text)
+        return {"summary": text, "blockers": []}
+
+    monkeypatch.setattr(tasks, "get_current_job", lambda: job)
+    monkeypatch.setattr(tasks, "ROLLING_SUMMARY_CHUNKS", 1)
+    monkeypatch.setattr(tasks, "transcribe_audio_stream", lambda path, stats: iter(["one.", "two."]))
+    monkeypatch.setattr(tasks, "clean_chunks_stream", lambda chunks: ((i, c, c) for i, c in enumerate(chunks)))
+    monkeypatch.setattr(tasks, "structured_summary_with_llm", slow_summary)
+
+    assert tasks.transcribe_and_clean("audio.wav", {}) == "one. two."
+    # The in-flight summary is done, so nothing can be published after this point
+    assert finished == ["one. two."]
+    assert b"partial_summary" in redis_conn.get("job_progress:job-1:last")
+
+
+def test_audio_stats_stay_out_of_stage_timings(redis_conn, monkeypatch):
+    job = FakeJob(redis_conn)
+
+    def stream(path, stats):
+        stats.update({"audio_seconds": 10.0, "speech_seconds": 6.0, "speech_ratio": 0.6})
+        yield "one."
+
+    monkeypatch.setattr(tasks, "get_current_job", lambda: job)
+    monkeypatch.setattr(tasks, "ROLLING_SUMMARY_CHUNKS", 0)
+    monkeypatch.setattr(tasks, "transcribe_audio_stream", stream)
+    monkeypatch.setattr(tasks, "clean_chunks_stream", lambda chunks: ((i, c, c) for i, c in enumerate(chunks)))
+
+    timings = {}
+    tasks.transcribe_and_clean("audio.wav", timings)
+    assert list(timings) == ["asr"]
+    assert job.meta["audio"]["speech_ratio"] == 0.6
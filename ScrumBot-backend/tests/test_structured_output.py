@@ -0,0 +1,78 @@
+import pytest
+
+from app.services.llm_client import StubBackend
+from app.utils import llm_utils, structured_output
+from app.utils.structured_output import (
+    PARTIAL_SUMMARY_SCHEMA,
+    TREND_REPORT_SCHEMA,
+    JSONExtractionError,
+    coerce_summary,
+    extract_json,
+)
+
+
+def test_plain_json_is_parsed_as_is():
+    assert extract_json('{"summary": "ok", "blockers": []}') == ({"summary": "ok", "blockers": []}, False)
+
+
+@pytest.mark.parametrize("reply", [
+    'Here is the summary:\n```json\n{"summary": "ok"}\n```\nLet me know!',
+    '```\n{"summary": "ok"}\n```',
+    'Sure! {"summary": "ok"} Hope this helps.',
+])
+def test_json_is_dug_out_of_prose_and_fences(reply):
+    assert extract_json(reply) == ({"summary": "ok"}, True)
+
+
+def test_braces_inside_strings_do_not_end_the_object():
+    value, extracted = extract_json('Result: {"summary": "use {curly} braces \\"}\\"", "blockers": ["a}"]} done')
+    assert value == {"summary": 'use {curly} braces "}"', "blockers": ["a}"]} and extracted
+
+
+def test_trailing_commas_and_smart_quotes_are_tolerated():
+    value, _ = extract_json('Output: {“summary”: “ok”, "blockers": ["x",],}')
+    assert value == {"summary": "ok", "blockers": ["x"]}
+
+
+def test_first_valid_object_wins():
+    value, _ = extract_json('{not json} then {"summary": "second"} and {"summary": "third"}')
+    assert value == {"summary": "second"}
+
+
+@pytest.mark.parametrize("reply", ["", "no json here", "[1, 2, 3]", '{"unterminated": '])
+def test_no_object_raises(reply):
+    with pytest.raises(JSONExtractionError):
+        extract_json(reply)
+
+
+def test_coerce_summary_fills_the_expected_shape():
+    value = coerce_summary({"blockers": "VPN is down", "progress": ["a", None, 3], "sentiment": "Happy"}, "transcript")
+    assert value == {
+        "summary": "transcript",
+        "blockers": ["VPN is down"],
+        "progress": ["a", "3"],
+        "next_steps": [],
+        "sentiment": "neutral",
+    }
+
+
+@pytest.mark.parametrize("call, schema", [
+    (lambda: llm_utils.summarize_logs_partial(["- [joy] shipped it"], "2024-05-01"), PARTIAL_SUMMARY_SCHEMA),
+    (lambda: llm_utils.merge_partial_summaries([{"summary": "a"}, {"summary": "b"}], "May"), PARTIAL_SUMMARY_SCHEMA),
+    (lambda: llm_utils.trend_report_from_partials([{"summary": "a"}]), TREND_REPORT_SCHEMA),
+])
+def test_insight_stages_constrain_replies_to_their_schema(call, schema, monkeypatch):
+    formats = []
+
+    def chat(model=None, messages=None, options=None, format=None, cacheable=None):
+        formats.append(format)
+        # The stub backend answers with an object matching the schema
+        return {"message": {"content": StubBackend(0).reply("model", messages, format)}}
+
+    monkeypatch.setattr(structured_output, "LLM_STRUCTURED_OUTPUT", "schema")
+    monkeypatch.setattr(llm_utils, "cached_chat", chat)
+
+    value = call()
+    assert formats == [schema]
+    assert llm_utils.FALLBACK_KEY not in value
+    assert sorted(value) == sorted(schema["required"])
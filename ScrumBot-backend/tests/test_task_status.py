@@ -0,0 +1,39 @@
+import pytest
+from fastapi.testclient import TestClient
+from rq import Queue
+from rq.results import Result
+
+from app.services.queues import get_redis
+from main import app
+
+
+@pytest.fixture
+def client(redis_conn):
+    app.dependency_overrides[get_redis] = lambda: redis_conn
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def finished_job(conn, result):
+    job = Queue("interactive", connection=conn).enqueue("worker.tasks.process_audio_batch", "b1", [])
+    job.set_status("finished")
+    Result.create(job, Result.Type.SUCCESSFUL, ttl=600, return_value=result)
+    return job
+
+
+def test_finished_batch_job(client, redis_conn):
+    result = {"batch_id": "b1", "results": [{"file": "a.wav", "log_id": 4, "cached": False}], "timings": {}}
+    job = finished_job(redis_conn, result)
+
+    response = client.get(f"/api/task_status/{job.id}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "success" and body["result"] == result
+    assert body["log_url"] is None and body["batch_url"] == "/batch_status/b1"
+
+
+def test_finished_single_upload_job(client, redis_conn):
+    job = finished_job(redis_conn, {"log_id": 7, "cached": True, "timings": {}})
+
+    body = client.get(f"/api/task_status/{job.id}").json()
+    assert body["log_url"] == "/logs/7" and "batch_url" not in body
@@ -0,0 +1,68 @@
+import random
+import threading
+import time
+
+import pytest
+
+from app.utils import transcript_utils
+from app.utils.transcript_utils import clean_chunks_stream, clean_transcript_chunkwise
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """
+    Cleaning replies: the chunk upper-cased, after llm.delay(chunk) seconds;
+    "boom" chunks fail, "stall" chunks block until the test ends.
+    """
+    class LLM:
+        delay = staticmethod(lambda chunk: 0)
+        release = threading.Event()
+
+    def clean(chunk):
+        if "boom" in chunk:
+            raise RuntimeError("LLM error")
+        if "stall" in chunk:
+            LLM.release.wait(10)
+        time.sleep(LLM.delay(chunk))
+        return chunk.upper()
+
+    monkeypatch.setattr(transcript_utils, "clean_transcript_with_llm", clean)
+    yield LLM
+    LLM.release.set()
+
+
+def test_chunks_come_back_in_order(llm):
+    rng = random.Random(3)
+    llm.delay = lambda chunk: rng.uniform(0, 0.05)
+    chunks = [f"chunk {i}" for i in range(12)]
+
+    results = list(clean_chunks_stream(iter(chunks), concurrency=4))
+    assert [index for index, _, _ in results] == list(range(12))
+    assert [cleaned for _, _, cleaned in results] == [c.upper() for c in chunks]
+
+
+def test_failed_chunk_keeps_its_raw_text(llm):
+    results = list(clean_chunks_stream(["one", "boom", "three"], concurrency=2))
+    assert [c for _, _, c in results] == ["ONE", "boom", "THREE"]
+    parts = ["first part " * 60, "boom " * 150, "last part " * 60]
+    cleaned = clean_transcript_chunkwise(". ".join(p.strip() for p in parts), concurrency=2).split(". ")
+    assert cleaned[1] == parts[1].strip() and cleaned[0] == parts[0].strip().upper()
+
+
+def test_stalled_llm_costs_one_timeout(llm):
+    chunks = [f"stall {i}" for i in range(6)]
+    started = time.monotonic()
+    results = list(clean_chunks_stream(chunks, concurrency=2, chunk_timeout=0.3))
+    elapsed = time.monotonic() - started
+
+    assert [c for _, _, c in results] == chunks
+    # Not 6 x 0.3s: queued chunks are not waited for once the LLM is stalled
+    assert elapsed < 0.9
+
+
+def test_timeout_counts_from_the_chunk_start(llm):
+    # Each chunk runs 0.2s, one at a time: the last one starts ~0.6s after
+    # submission but is well within its own 0.3s timeout
+    llm.delay = lambda chunk: 0.2
+    results = list(clean_chunks_stream(["a", "b", "c", "d"], concurrency=1, chunk_timeout=0.3))
+    assert [c for _, _, c in results] == ["A", "B", "C", "D"]
@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.db.models import TrendDailyEmotion
+from app.services import trend_cache
+from main import app
+
+CACHED = {"dates": ["2024-05-01"], "emotions": {"joy": [1]}, "top_blockers": [], "frequent_next_steps": []}
+
+
+class FakeQueue:
+    name = "analytics"
+
+    def __init__(self):
+        self.enqueued = []
+        self._lock = threading.Lock()
+
+    def enqueue(self, func, *args, **kwargs):
+        time.sleep(0.05)  # keep concurrent requests overlapping
+        with self._lock:
+            self.enqueued.append((func, args))
+
+
+def store(conn, age: float, days: int = None):
+    entry = {"computed_at": time.time() - age, "data": CACHED}
+    conn.set(trend_cache.cache_key(days), json.dumps(entry))
+
+
+@pytest.fixture
+def client(db, redis_conn):
+    db.add(TrendDailyEmotion(day=date.today(), emotion="sadness", count=2))
+    db.commit()
+    queue = FakeQueue()
+    app.dependency_overrides[routes.get_db] = lambda: db
+    app.dependency_overrides[routes.get_redis] = lambda: redis_conn
+    app.dependency_overrides[routes.get_analytics_queue] = lambda: queue
+    client = TestClient(app)
+    client.queue = queue
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_fresh_entry_is_served_without_a_refresh(client, redis_conn):
+    store(redis_conn, age=1, days=7)
+    body = client.get("/api/trends", params={"days": 7}).json()
+
+    assert body["emotions"] == {"joy": [1]}
+    assert not body["stale"] and not body["refreshing"]
+    assert client.queue.enqueued == []
+
+
+def test_stale_entry_is_served_while_one_refresh_is_enqueued(client, db, redis_conn):
+    store(redis_conn, age=trend_cache.TREND_STALE_SECONDS + 60, days=7)
+    body = client.get("/api/trends", params={"days": 7}).json()
+
+    # The cached (stale) window is returned as is, not recomputed inline
+    assert body["emotions"] == {"joy": [1]}
+    assert body["stale"] and body["refreshing"]
+    assert client.queue.enqueued == [("worker.tasks.run_trend_analysis", (7,))]
+
+    # What the refresh job does: recompute, then release the lock
+    trend_cache.compute_and_store(redis_conn, db, 7)
+    trend_cache.release_refresh_lock(redis_conn, 7)
+    body = client.get("/api/trends", params={"days": 7}).json()
+    assert body["emotions"] == {"sadness": [2]}
+    assert not body["stale"] and not body["refreshing"]
+    assert len(client.queue.enqueued) == 1
+
+
+def test_concurrent_stale_reads_enqueue_a_single_refresh(client, redis_conn):
+    store(redis_conn, age=trend_cache.TREND_STALE_SECONDS + 60, days=7)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(lambda _: client.get("/api/trends", params={"days": 7}), range(8)))
+
+    assert all(r.status_code == 200 and r.json()["refreshing"] for r in responses)
+    assert client.queue.enqueued == [("worker.tasks.run_trend_analysis", (7,))]
+
+
+def test_each_window_gets_its_own_refresh(client, redis_conn):
+    for days in (7, 30):
+        store(redis_conn, age=trend_cache.TREND_STALE_SECONDS + 60, days=days)
+    for days in (7, 30, 7, 30):
+        client.get("/api/trends", params={"days": days})
+
+    assert sorted(args for _, args in client.queue.enqueued) == [(7,), (30,)]
+
+
+def test_missing_entry_is_computed_inline(client, redis_conn):
+    body = client.get("/api/trends").json()
+
+    assert body["emotions"] == {"sadness": [2]}
+    assert not body["refreshing"]
+    assert client.queue.enqueued == []
+    assert redis_conn.get(trend_cache.cache_key(None)) is not None
@@ -0,0 +1,65 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api import routes
+from app.services.queues import QueueFull
+from main import app
+
+
+class FakeJob:
+    id = "job-1"
+
+
+class FakeQueue:
+    name = "interactive"
+
+    def __init__(self):
+        self.enqueued = []
+
+    def enqueue(self, func, *args, **kwargs):
+        self.enqueued.append((func, args))
+        return FakeJob()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    queue = FakeQueue()
+    monkeypatch.setattr(routes, "UPLOAD_FOLDER", str(tmp_path))
+    app.dependency_overrides[routes.get_interactive_queue] = lambda: queue
+    client = TestClient(app)
+    client.queue = queue
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_saturated_queue_is_refused_before_the_form_is_read(client, monkeypatch):
+    def full(q):
+        raise QueueFull(q.name, 100, 30)
+
+    parsed = []
+    original_form = Request.form
+    monkeypatch.setattr(Request, "form", lambda self, **kw: parsed.append(True) or original_form(self, **kw))
+    monkeypatch.setattr(routes, "admit", full)
+
+    response = client.post("/api/upload_audio", files={"file": ("a.wav", b"x" * 100)})
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
+    assert parsed == []
+
+
+def test_upload_is_saved_and_enqueued(client, monkeypatch):
+    monkeypatch.setattr(routes, "admit", lambda q: {"queue_position": 1})
+
+    response = client.post("/api/upload_audio", files={"file": ("a.wav", b"x" * 100)})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["size"] == 100 and body["queue_position"] == 1
+    assert client.queue.enqueued[0][0] == "worker.tasks.process_audio"
+
+
+def test_missing_file_field_is_a_422(client, monkeypatch):
+    monkeypatch.setattr(routes, "admit", lambda q: {})
+
+    response = client.post("/api/upload_audio", data={"other": "value"})
+    assert response.status_code == 422
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import time
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.api.limits import BodySizeLimitMiddleware
+from app.utils.upload_utils import (
+    UploadInProgress,
+    UploadOffsetMismatch,
+    append_upload_chunk,
+    MAX_UPLOAD_BYTES,
+    create_upload_session,
+    expire_upload_sessions,
+    get_upload_session,
+)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    received = []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        received.append(await file.read())
+        return {"size": len(received[-1])}
+
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": 1000})
+    client = TestClient(app)
+    client.received = received
+    return client
+
+
+def test_small_upload_passes(client):
+    response = client.post("/upload", files={"file": ("a.wav", b"x" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_oversized_upload_refused_before_the_handler(client):
+    response = client.post("/upload", files={"file": ("a.wav", b"x" * 5000)})
+    assert response.status_code == 413
+    assert client.received == []
+
+
+def test_streamed_body_without_content_length_is_cut_off(client):
+    def body():
+        for _ in range(10):
+            yield b"x" * 500
+
+    response = client.post("/upload", content=body(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert client.received == []
+
+
+async def _chunks(data: bytes, delay: float = 0.0):
+    await asyncio.sleep(delay)
+    yield data
+
+
+def test_concurrent_patches_at_the_same_offset_append_once(tmp_path, redis_conn):
+    session = create_upload_session(str(tmp_path), "a.wav", 10)
+    upload_id = session["upload_id"]
+
+    async def race():
+        return await asyncio.gather(
+            append_upload_chunk(str(tmp_path), upload_id, 0, _chunks(b"aaaaa", 0.05), lock_conn=redis_conn),
+            append_upload_chunk(str(tmp_path), upload_id, 0, _chunks(b"bbbbb"), lock_conn=redis_conn),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(race())
+    assert sum(isinstance(r, dict) for r in results) == 1
+    assert any(isinstance(r, UploadInProgress) for r in results)
+    assert get_upload_session(str(tmp_path), upload_id)["offset"] == 5
+
+    # The lock is released: the next chunk goes through, a stale offset does not
+    assert asyncio.run(append_upload_chunk(str(tmp_path), upload_id, 5, _chunks(b"ccccc"), lock_conn=redis_conn))["offset"] == 10
+    with pytest.raises(UploadOffsetMismatch):
+        asyncio.run(append_upload_chunk(str(tmp_path), upload_id, 5, _chunks(b"d"), lock_conn=redis_conn))
+
+
+@pytest.mark.parametrize("length", [0, -1, MAX_UPLOAD_BYTES + 1])
+def test_upload_session_length_is_bounded(tmp_path, monkeypatch, length):
+    from app.api import routes
+    from main import app
+
+    monkeypatch.setattr(routes, "PARTIAL_UPLOAD_FOLDER", str(tmp_path))
+    response = TestClient(app).post("/api/uploads", json={"filename": "a.wav", "length": length})
+    assert response.status_code == 422
+    assert not os.listdir(tmp_path)
+
+
+def test_abandoned_upload_sessions_expire(tmp_path):
+    old = create_upload_session(str(tmp_path), "old.wav", 10)["upload_id"]
+    fresh = create_upload_session(str(tmp_path), "fresh.wav", 10)["upload_id"]
+    stale = time.time() - 3600
+    for ext in (".part", ".json"):
+        os.utime(tmp_path / (old + ext), (stale, stale))
+
+    assert expire_upload_sessions(str(tmp_path), ttl=600) == 1
+    assert sorted(os.listdir(tmp_path)) == [fresh + ".json", fresh + ".part"]
+    with pytest.raises(FileNotFoundError):
+        get_upload_session(str(tmp_path), old)
+    assert get_upload_session(str(tmp_path), fresh)["offset"] == 0
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("rq")
+
+import worker
+from app.services import model_registry
+
+
+@pytest.fixture
+def cores(monkeypatch):
+    monkeypatch.setattr(model_registry, "available_cores", lambda: 16)
+    monkeypatch.setattr(model_registry, "WHISPER_NUM_WORKERS", 2)
+    monkeypatch.delenv("WHISPER_CPU_THREADS", raising=False)
+
+
+def test_auto_fills_the_cores_with_default_threads(cores, monkeypatch):
+    monkeypatch.setattr(worker, "WORKER_PROCESSES", "auto")
+    # 16 cores / (2 transcriptions x 4 threads)
+    assert worker.worker_process_count() == 2
+
+
+def test_auto_honors_explicit_threads(cores, monkeypatch):
+    monkeypatch.setattr(worker, "WORKER_PROCESSES", "auto")
+    monkeypatch.setenv("WHISPER_CPU_THREADS", "1")
+    assert worker.worker_process_count() == 8
+
+
+def test_threads_are_split_between_processes(cores):
+    assert model_registry.default_cpu_threads(1) == 8
+    assert model_registry.default_cpu_threads(4) == 2
+    # Never below one thread
+    assert model_registry.default_cpu_threads(32) == 1
+
+
+def test_only_model_loading_pools_share_the_cores():
+    pools = worker.parse_pools("interactive,llm:3;analytics,backfill:2")
+    assert worker.transcribing_process_count(pools) == 3
+    assert worker.transcribing_process_count(worker.parse_pools("analytics:1")) == 1
@@ -1,18 +1,116 @@
+import logging
 import os
-import redis
-from rq import Worker, Queue
+from rq import SimpleWorker
 import multiprocessing
+from app.services.queues import get_redis, get_queue, QUEUE_PRIORITY, INTERACTIVE
 
 multiprocessing.set_start_method('spawn', force=True)
+logging.basicConfig(level=logging.INFO)
 
 
-listen = ['default']
-redis_url = os.getenv('REDIS_URL', 'redis://localhost:6380')
+# Priority order: a worker always takes the next job of the highest
+# priority queue that has one (interactive > llm > analytics > backfill)
+listen = QUEUE_PRIORITY
 
-conn = redis.from_url(redis_url)
+# Same pooled client the tasks use (REDIS_URL, REDIS_MAX_CONNECTIONS, ...)
+conn = get_redis()
+
+# Worker processes to start: a number, or "auto" to fill the available cores
+# with processes of WHISPER_NUM_WORKERS x WHISPER_CPU_THREADS cores each
+# (AUTO_CPU_THREADS per transcription when WHISPER_CPU_THREADS is unset).
+# Unless WHISPER_CPU_THREADS is set, the cores are then split between the
+# processes, so N processes never run N x the cores in threads.
+WORKER_PROCESSES = os.getenv('WORKER_PROCESSES', '1')
+AUTO_CPU_THREADS = int(os.getenv('AUTO_CPU_THREADS', '4'))
+
+# Concurrency per job class, e.g. "interactive,llm:3;analytics,backfill:1"
+# starts 3 processes for uploads and LLM jobs and 1 for analytics and
+# backfills, so bulk work never takes more than its share of the workers.
+# When empty, WORKER_PROCESSES processes listen on every queue.
+WORKER_POOLS = os.getenv('WORKER_POOLS', '')
+
+
+def worker_process_count() -> int:
+    from app.services.model_registry import available_cores, WHISPER_NUM_WORKERS
+    if WORKER_PROCESSES == 'auto':
+        threads = int(os.getenv('WHISPER_CPU_THREADS', '0')) or AUTO_CPU_THREADS
+        return max(1, available_cores() // (WHISPER_NUM_WORKERS * threads))
+    return max(1, int(WORKER_PROCESSES))
+
+
+def parse_pools(spec: str) -> list[tuple[list[str], int]]:
+    """
+    "a,b:2;c:1" -> [(["a", "b"], 2), (["c"], 1)], queues kept in priority order.
+    """
+    pools = []
+    for group in spec.split(';'):
+        if not group.strip():
+            continue
+        names, _, count = group.partition(':')
+        queues = [name.strip() for name in names.split(',') if name.strip()]
+        unknown = set(queues) - set(QUEUE_PRIORITY)
+        if unknown:
+            raise ValueError(f"Unknown queues in WORKER_POOLS: {sorted(unknown)}")
+        queues.sort(key=QUEUE_PRIORITY.index)
+        pools.append((queues, int(count or 1)))
+    return pools
+
+
+def worker_pools() -> list[tuple[list[str], int]]:
+    return parse_pools(WORKER_POOLS) or [(listen, worker_process_count())]
+
+
+def loads_models(queue_names: list[str]) -> bool:
+    return INTERACTIVE in queue_names or 'default' in queue_names
 
-if __name__ == '__main__':
-    queues = [Queue(name, connection=conn) for name in listen]
-    worker = Worker(queues, connection=conn)
-    worker.work()
 
+def transcribing_process_count(pools: list[tuple[list[str], int]]) -> int:
+    return max(1, sum(count for queues, count in pools if loads_models(queues)))
+
+
+def work(queue_names: list[str] = None):
+    queue_names = queue_names or listen
+
+    # Models are loaded once and stay resident: SimpleWorker runs jobs in
+    # this process instead of forking a work horse (which would reload them,
+    # and forking after CTranslate2 / torch started their threads is unsafe).
+    # Only workers that take uploads preload them.
+    if loads_models(queue_names):
+        from app.services.model_registry import preload_from_env
+        stats = preload_from_env()
+        for name, model in stats.get("loaded", {}).items():
+            logging.info(
+                f"Preloaded {name}: {model['load_seconds']}s, "
+                f"+{model['rss_delta_bytes'] / 2**20:.0f} MiB RSS ({model['model']})"
+            )
+        if stats:
+            logging.info(f"Worker RSS after preload: {stats['process_rss_bytes'] / 2**20:.0f} MiB")
+
+    queues = [get_queue(name) for name in queue_names]
+    worker = SimpleWorker(queues, connection=conn)
+    # The scheduler runs delayed jobs (Jira outbox retries)
+    worker.work(with_scheduler=True)
+
+
+def run_worker():
+    pools = worker_pools()
+    if len(pools) == 1 and pools[0][1] == 1:
+        work(pools[0][0])
+        return
+
+    # Spawned (not forked) processes, each with its own resident models.
+    # The ones that transcribe share the cores (see model_registry.WHISPER_CPU_THREADS)
+    os.environ['WORKER_PROCESS_COUNT'] = str(transcribing_process_count(pools))
+    children = [
+        multiprocessing.Process(target=work, args=(queues,), name=f'scrumbot-worker-{"-".join(queues)}-{i}')
+        for queues, count in pools
+        for i in range(count)
+    ]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join()
+
+
+if __name__ == '__main__':
+    run_worker()
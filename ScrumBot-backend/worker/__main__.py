@@ -0,0 +1,4 @@
+# Allows starting the worker with `python -m worker`
+from worker import run_worker
+
+run_worker()
@@ -1,102 +1,587 @@
-from app.services.transcriber import transcribe_audio
-from app.services.summarizer import summarize
-from app.utils.emotion_utils import detect_emotions
+from app.services.transcriber import transcribe_audio_stream
+from app.services.transcription_pool import transcribe_files
+from app.utils.emotion_utils import detect_emotions, detect_emotions_batch
 from app.db.session import SessionLocal
 from app.db.models import VoiceLog
 import logging
-from app.services.jira_client import create_jira_issue
-from app.utils.blocker_extractor import extract_blockers
-from app.utils.llm_utils import clean_transcript_with_llm
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from app.services import jira_outbox
+from app.services import blocker_index
+from app.services import report_cache
+from app.services import insights_cache
+from app.utils.transcript_utils import clean_chunks_stream, group_segments, clean_transcript_chunkwise
 from app.utils.llm_utils import structured_summary_with_llm
 from sqlalchemy.orm import Session
-import redis
-import json
-from app.services.trend_analyzer import analyze_trends_from_logs
-from app.utils.llm_utils import analyze_trends_with_llm
+from rq import get_current_job
+from app.services import result_cache
+from app.services import trend_rollups
+from app.services import trend_cache
+from app.services.queues import get_redis, get_queue, record_duration, ANALYTICS, LLM
+from app.services.progress import publish_progress
+from datetime import timedelta
 
 
 
 logging.basicConfig(level=logging.INFO)
 
-def process_audio(file_path: str, file_name: str):
+# Publish a partial structured summary every N cleaned chunks (0 disables it,
+# each one costs an extra LLM call)
+ROLLING_SUMMARY_CHUNKS = int(os.getenv("ROLLING_SUMMARY_CHUNKS", "0"))
+# Outbox drains: one scheduled at a time, and one drain running at a time
+JIRA_DRAIN_SCHEDULED_KEY = "jira_outbox:drain_scheduled"
+JIRA_RETRY_SCHEDULED_KEY = "jira_outbox:retry_scheduled"
+JIRA_DRAIN_LOCK_KEY = "jira_outbox:draining"
+JIRA_DRAIN_SCHEDULE_SECONDS = 60
+
+# Files of a batch cleaned / summarized by the LLM at the same time
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "2"))
+
+
+# Stage name -> progress event sent to clients
+PROGRESS_LABELS = {
+    "asr_clean": "transcribing",
+    "asr": "transcribing",
+    "clean_structure": "summarizing",
+    "structure": "summarizing",
+    "emotion": "emotion",
+    "persist": "saving",
+}
+
+
+def report_progress(stage: str, **data):
+    """
+    Publishes a progress event for the current job (no-op outside RQ).
+    """
+    job = get_current_job()
+    if job is None:
+        return
+    try:
+        publish_progress(job.connection, job.id, stage, **data)
+    except Exception as e:
+        logging.warning(f"Could not publish progress for job {job.id}: {e}")
+
+
+@contextmanager
+def pipeline_stage(name: str, timings: dict):
+    """
+    Times one pipeline stage, publishes the timings in the RQ job meta
+    and announces the stage to progress subscribers.
+    """
+    job = get_current_job()
+    if job is not None:
+        job.meta["stage"] = name
+        job.save_meta()
+    report_progress(PROGRESS_LABELS.get(name, name))
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round(time.perf_counter() - started, 3)
+        if job is not None:
+            job.meta["stage_timings"] = timings
+            job.save_meta()
+
+
+def _record_job_duration(job, started: float):
+    """
+    Feeds the queue's average job duration (used for upload ETAs).
+    """
+    if job is None:
+        return
+    try:
+        record_duration(job.connection, job.origin, time.perf_counter() - started)
+    except Exception as e:
+        logging.warning(f"Could not record duration of job {job.id}: {e}")
+
+
+def _discard_duplicate_upload(file_path: str):
+    """
+    Removes an uploaded file whose audio was already processed (the
+    existing log keeps its own copy).
+    """
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Could not remove duplicate upload {file_path}: {e}")
+
+
+def _timed_iter(iterable, timer: dict):
+    """
+    Adds the time spent producing each item to timer["seconds"].
+    """
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            timer["seconds"] += time.perf_counter() - started
+        yield item
+
+
+def _rolling_summary(executor, text: str, chunks_done: int, job):
+    """
+    Summarizes the transcript cleaned so far in the background and
+    publishes it as a "partial_summary" progress event.
+    """
+    def run():
+        try:
+            partial = structured_summary_with_llm(text)
+            publish_progress(
+                job.connection, job.id, "partial_summary",
+                chunks=chunks_done, summary=partial.get("summary"), blockers=partial.get("blockers", []),
+            )
+        except Exception as e:
+            logging.warning(f"Rolling summary failed after {chunks_done} chunks: {e}")
+
+    return executor.submit(run)
+
+
+def _add_log(db: Session, file_name: str, transcript: str, structured_summary: dict, emotion: str, content_hash: str = None) -> VoiceLog:
+    """
+    Adds a VoiceLog, its blocker clusters, its daily trend counters and its
+    Jira outbox entry to the session (the caller commits, so all are saved
+    in one transaction).
+    """
+    log = VoiceLog(
+        filename=file_name,
+        transcript=transcript,
+        summary=structured_summary["summary"],
+        emotion=emotion,
+        progress=structured_summary.get("progress", []),
+        next_steps=structured_summary.get("next_steps", []),
+        blockers=structured_summary.get("blockers", []),
+        content_hash=content_hash,
+        pipeline_version=result_cache.pipeline_version(),
+    )
+    db.add(log)
+    db.flush()
+    clusters = blocker_index.index_log(db, log)
+    trend_rollups.record_log(db, log, blocker_labels=[cluster.label for cluster in clusters])
+    jira_outbox.enqueue_blocker_issue(db, log, cluster=clusters[0] if clusters else None)
+    return log
+
+
+def schedule_jira_drain(redis_conn):
+    """
+    Enqueues one outbox drain for any number of logs saved close together.
+    """
+    if redis_conn is None:
+        return
+    try:
+        if redis_conn.set(JIRA_DRAIN_SCHEDULED_KEY, 1, nx=True, ex=JIRA_DRAIN_SCHEDULE_SECONDS):
+            get_queue(ANALYTICS).enqueue('worker.tasks.drain_jira_outbox')
+    except Exception as e:
+        logging.warning(f"Could not schedule the Jira outbox drain: {e}")
+
+
+def transcribe_and_clean(file_path: str, timings: dict) -> str:
+    """
+    Streams Whisper segments into chunk cleaning, so the LLM works on the
+    start of the recording while the rest is still being decoded.
+    Partial transcripts are kept in the job meta and published as progress.
+    """
+    job = get_current_job()
+    asr_timer = {"seconds": 0.0}
+    audio_stats = {}
+    segments = _timed_iter(transcribe_audio_stream(file_path, audio_stats), asr_timer)
+
+    cleaned_chunks = []
+    summary_executor = ThreadPoolExecutor(max_workers=1) if ROLLING_SUMMARY_CHUNKS and job is not None else None
+    rolling = None
+    try:
+        for index, _, cleaned in clean_chunks_stream(group_segments(segments)):
+            cleaned_chunks.append(cleaned)
+            report_progress("cleaning", chunk=index + 1, text=cleaned)
+            if job is not None:
+                job.meta["partial_transcript"] = " ".join(cleaned_chunks)
+                job.save_meta()
+
+            if summary_executor and len(cleaned_chunks) % ROLLING_SUMMARY_CHUNKS == 0 and (rolling is None or rolling.done()):
+                rolling = _rolling_summary(summary_executor, " ".join(cleaned_chunks), len(cleaned_chunks), job)
+    finally:
+        if summary_executor:
+            # A rolling summary already running cannot be interrupted: let it
+            # finish here, so it neither competes with the structure stage
+            # for the LLM nor publishes after the job's later events
+            summary_executor.shutdown(wait=True, cancel_futures=True)
+
+    timings["asr"] = round(asr_timer["seconds"], 3)
+    # Total vs speech-only duration, after VAD (not stage timings)
+    if job is not None:
+        job.meta["audio"] = audio_stats
+        job.save_meta()
+    return " ".join(cleaned_chunks)
+
+
+def process_audio(file_path: str, file_name: str, content_hash: str = None):
+    """
+    ASR + clean (overlapped) -> structure -> emotion -> persist -> Jira.
+    Each stage runs exactly once and hands its output to the next one.
+    Audio that was already processed (same sha256 and pipeline version)
+    returns the existing log without running any stage.
+    """
     logging.info(f"Starting audio processing: {file_name}")
+    started = time.perf_counter()
     db: Session = SessionLocal()
+    timings = {}
+    job = get_current_job()
+    redis_conn = job.connection if job is not None else None
 
     try:
-        # Step 1: Transcribe
-        raw_transcript = transcribe_audio(file_path)
-        logging.info(f"Raw transcript complete for: {file_name}")
+        if content_hash:
+            log_id = result_cache.lookup(redis_conn, db, content_hash)
+            if log_id is not None:
+                logging.info(f"Cache hit for {file_name}: reusing voice log {log_id}")
+                _discard_duplicate_upload(file_path)
+                report_progress("cached", log_id=log_id)
+                return {"log_id": log_id, "cached": True, "timings": timings}
 
-        # Step 2: Clean transcript using LLM
-        transcript = clean_transcript_with_llm(raw_transcript)
-        logging.info(f"Cleaned transcript complete for: {file_name}")
+        # Stages 1-2: ASR streamed into LLM cleaning (chunked)
+        with pipeline_stage("asr_clean", timings):
+            transcript = transcribe_and_clean(file_path, timings)
+        logging.info(f"Transcribed and cleaned: {file_name} (ASR {timings['asr']}s)")
 
-        # Step 3: Structured Summary
-        structured_summary = structured_summary_with_llm(transcript)
-        summary = structured_summary["summary"]
-        blockers = structured_summary["blockers"]
+        # Stage 3: Structured Summary
+        with pipeline_stage("structure", timings):
+            structured_summary = structured_summary_with_llm(transcript)
+        blockers = structured_summary.get("blockers", [])
         logging.info(f"Summary complete for: {file_name}")
 
-        # Step 4: Emotion Detection
-        emotion = detect_emotions(transcript)
+        # Stage 4: Emotion Detection
+        with pipeline_stage("emotion", timings):
+            emotion = detect_emotions(transcript)
         logging.info(f"Emotion detection complete for: {file_name}")
 
-        # Step 5: (Optional) Jira Ticket Creation
-        jira_issue_url = None
-        if blockers:
-            issue_key = create_jira_issue(
-                summary=f"Blocker from ScrumBot: {blockers[0]}",
-                description=f"Audio File: {file_name}\nTranscript: {transcript}\nSummary: {summary}"
-            )
-            jira_issue_url = f"https://devpatel26612.atlassian.net/browse/{issue_key}"
-            logging.info(f"Created Jira issue: {jira_issue_url}")
-
-        # Step 6: Save to DB
-        log = VoiceLog(
-            filename=file_name,
-            transcript=transcript,
-            summary=summary,
-            emotion=emotion,
-            jira_issue_url=jira_issue_url,
-            progress=structured_summary.get("progress", []),
-            next_steps=structured_summary.get("next_steps", []),
-            blockers=structured_summary.get("blockers", [])
-        )
-
-        db.add(log)
-        db.commit()
-        db.refresh(log)
+        # Stage 5: Save to DB
+        with pipeline_stage("persist", timings):
+            log = _add_log(db, file_name, transcript, structured_summary, emotion, content_hash)
+            db.commit()
+            db.refresh(log)
         log_id = log.id
         logging.info(f"Saved voice log for: {file_name} with id: {log_id}")
 
-        # # Step 7: Trend Analysis Trigger
-        # logs = db.query(VoiceLog).all()
-        # raw_trends = analyze_trends_from_logs(logs)
-        # insights = analyze_trends_with_llm(raw_trends)
+        if content_hash and redis_conn is not None:
+            result_cache.store(redis_conn, content_hash, log_id)
+        report_cache.invalidate(redis_conn)
 
-        # logging.info("Trend analysis and insights complete.")
-        # logging.debug(f"Raw Trends: {raw_trends}")
-        # logging.debug(f"Trend Insights (LLM): {insights}")
+        # Stage 6: Jira issues are created by the outbox drain, off this job
+        if blockers:
+            schedule_jira_drain(redis_conn)
 
-        return {"log_id": log_id}
+        logging.info(f"Stage timings for {file_name}: {timings}")
+        _record_job_duration(job, started)
+        report_progress("saved", log_id=log_id, timings=timings)
+        return {"log_id": log_id, "cached": False, "timings": timings}
 
     except Exception as e:
         logging.error(f"Error processing {file_name}: {e}", exc_info=True)
+        report_progress("failed", error=str(e))
         raise
 
     finally:
         db.close()
-    
 
 
-def run_trend_analysis():
+def _clean_and_structure(raw_transcript: str) -> tuple[str, dict]:
+    transcript = clean_transcript_chunkwise(raw_transcript)
+    return transcript, structured_summary_with_llm(transcript)
+
+
+def _clean_and_structure_or_error(raw_transcript: str):
+    try:
+        return _clean_and_structure(raw_transcript)
+    except Exception as e:
+        return e
+
+
+def _batch_emotions(transcripts: list[str]) -> list:
+    """
+    One batched scoring pass; if it fails, each transcript is scored alone
+    so only the ones that fail again get their exception in place.
+    """
+    try:
+        return detect_emotions_batch(transcripts)
+    except Exception as e:
+        logging.warning(f"Batched emotion scoring failed, scoring one by one: {e}")
+    emotions = []
+    for transcript in transcripts:
+        try:
+            emotions.append(detect_emotions(transcript))
+        except Exception as e:
+            emotions.append(e)
+    return emotions
+
+
+def process_audio_batch(batch_id: str, files: list):
+    """
+    Processes the recordings of a batch upload in one job, so inference is
+    batched across the group: Whisper decodes several files at once on the
+    shared model, the LLM steps of BATCH_LLM_CONCURRENCY files overlap and
+    emotions are scored in a single batched pass.
+    files is a list of (file_path, file_name, content_hash).
+    A file that fails gets {"file", "error"} in the results and the others
+    are still saved; the job only fails if no file made it.
+    """
+    logging.info(f"Starting batch {batch_id}: {len(files)} files")
+    started = time.perf_counter()
+    db: Session = SessionLocal()
+    timings = {}
+    job = get_current_job()
+    redis_conn = job.connection if job is not None else None
+    results = [None] * len(files)
+
+    def fail(i: int, stage: str, error: Exception):
+        logging.error(f"Batch {batch_id}: {files[i][1]} failed at {stage}: {error}", exc_info=error)
+        results[i] = {"file": files[i][1], "error": str(error), "stage": stage}
+        report_progress("file_failed", file=files[i][1], error=str(error))
+
+    try:
+        pending = []
+        for i, (file_path, file_name, content_hash) in enumerate(files):
+            try:
+                log_id = result_cache.lookup(redis_conn, db, content_hash) if content_hash else None
+            except Exception as e:
+                logging.warning(f"Dedup lookup failed for {file_name}, processing it: {e}")
+                log_id = None
+            if log_id is not None:
+                _discard_duplicate_upload(file_path)
+                results[i] = {"file": file_name, "log_id": log_id, "cached": True}
+            else:
+                pending.append(i)
+        report_progress("batch", files=len(files), cached=len(files) - len(pending))
+
+        logs = []
+        if pending:
+            with pipeline_stage("asr", timings):
+                raw_transcripts = transcribe_files([files[i][0] for i in pending], return_exceptions=True)
+            transcribed = []
+            for i, raw in zip(pending, raw_transcripts):
+                if isinstance(raw, Exception):
+                    fail(i, "asr", raw)
+                else:
+                    transcribed.append((i, raw))
+
+            with pipeline_stage("clean_structure", timings):
+                processed = []
+                with ThreadPoolExecutor(max_workers=BATCH_LLM_CONCURRENCY) as executor:
+                    items = executor.map(_clean_and_structure_or_error, [raw for _, raw in transcribed])
+                    for done, ((i, _), item) in enumerate(zip(transcribed, items), 1):
+                        if isinstance(item, Exception):
+                            fail(i, "clean_structure", item)
+                            continue
+                        processed.append((i, item))
+                        report_progress("summarized", file=files[i][1], done=done, total=len(pending))
+
+            with pipeline_stage("emotion", timings):
+                emotions = _batch_emotions([transcript for _, (transcript, _) in processed])
+
+            with pipeline_stage("persist", timings):
+                # One transaction per file, so a file that cannot be saved
+                # does not roll back the others
+                for (i, (transcript, structured_summary)), emotion in zip(processed, emotions):
+                    if isinstance(emotion, Exception):
+                        fail(i, "emotion", emotion)
+                        continue
+                    try:
+                        log = _add_log(db, files[i][1], transcript, structured_summary, emotion, files[i][2])
+                        db.commit()
+                        db.refresh(log)
+                    except Exception as e:
+                        db.rollback()
+                        fail(i, "persist", e)
+                        continue
+                    logs.append(log)
+                    results[i] = {"file": log.filename, "log_id": log.id, "cached": False}
+                    if files[i][2] and redis_conn is not None:
+                        result_cache.store(redis_conn, files[i][2], log.id)
+
+            if logs:
+                report_cache.invalidate(redis_conn)
+            if any(log.blockers for log in logs):
+                schedule_jira_drain(redis_conn)
+
+        failed = [result for result in results if "error" in result]
+        if failed and len(failed) == len(files):
+            raise RuntimeError(f"Every file of batch {batch_id} failed: {failed[0]['error']}")
+
+        logging.info(f"Batch {batch_id} done ({len(failed)} failed), stage timings: {timings}")
+        _record_job_duration(job, started)
+        report_progress(
+            "saved",
+            log_ids=[r["log_id"] for r in results if "log_id" in r],
+            failed=[r["file"] for r in failed],
+            timings=timings,
+        )
+        return {"batch_id": batch_id, "results": results, "timings": timings}
+
+    except Exception as e:
+        logging.error(f"Error processing batch {batch_id}: {e}", exc_info=True)
+        report_progress("failed", error=str(e))
+        raise
+
+    finally:
+        db.close()
+
+
+def enqueue_trend_insights(days: int):
+    get_queue(LLM).enqueue('worker.tasks.run_trend_insights', days, job_timeout=insights_cache.INSIGHTS_JOB_TIMEOUT)
+
+
+def finalize_batch(batch_id: str):
+    """
+    Runs after the batch job (RQ dependency): refreshes every cached trend
+    window once, and queues one insights refresh per cached insights
+    window, for the whole batch instead of once per recording.
+    """
     db = SessionLocal()
+    job = get_current_job()
+    redis_conn = job.connection if job is not None else get_redis()
     try:
-        logs = db.query(VoiceLog).all()
-        result = analyze_trends_from_logs(logs)
-        redis_conn = redis.Redis()
-        # Save to Redis cache
-        redis_conn.set("latest_trends", json.dumps(result), ex=360000)  # cache for 1 hour
-        return result
+        windows = trend_cache.refresh_cached_windows(redis_conn, db)
+        insight_windows = [
+            days for days in insights_cache.cached_windows(redis_conn)
+            if insights_cache.request_refresh(redis_conn, days, enqueue_trend_insights)
+        ]
+        logging.info(f"Batch {batch_id}: refreshed trend windows {windows}, insights queued for {insight_windows}")
+        return {"batch_id": batch_id, "trend_windows": windows, "insight_windows": insight_windows}
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def drain_jira_outbox(is_retry: bool = False):
+    """
+    Creates the pending Jira issues (bulk, deduplicated by blocker) and
+    schedules itself again for the rows waiting on a retry backoff
+    (is_retry, not `retry`: RQ reserves that keyword for its own Retry).
+    """
+    job = get_current_job()
+    redis_conn = job.connection if job is not None else get_redis()
+    # Logs saved from now on schedule a new drain
+    redis_conn.delete(JIRA_RETRY_SCHEDULED_KEY if is_retry else JIRA_DRAIN_SCHEDULED_KEY)
+
+    if not redis_conn.set(JIRA_DRAIN_LOCK_KEY, 1, nx=True, ex=600):
+        # Another drain is running and may have missed rows saved since it
+        # started: look again shortly (workers run with_scheduler=True)
+        if redis_conn.set(JIRA_DRAIN_SCHEDULED_KEY, 1, nx=True, ex=JIRA_DRAIN_SCHEDULE_SECONDS):
+            get_queue(ANALYTICS).enqueue_in(timedelta(seconds=30), 'worker.tasks.drain_jira_outbox')
+        return {"skipped": True}
+
+    db = SessionLocal()
+    try:
+        result = jira_outbox.drain(db)
+        retry_in = jira_outbox.next_retry_in(db)
+        if result["created"] or result["linked"]:
+            # Reports show the issue links
+            report_cache.invalidate(redis_conn)
+        logging.info(f"Jira outbox drained: {result}")
+    finally:
+        redis_conn.delete(JIRA_DRAIN_LOCK_KEY)
+        db.close()
+
+    if retry_in is not None and redis_conn.set(JIRA_RETRY_SCHEDULED_KEY, 1, nx=True, ex=int(retry_in) + 1):
+        get_queue(ANALYTICS).enqueue_in(timedelta(seconds=max(retry_in, 1)), 'worker.tasks.drain_jira_outbox', is_retry=True)
+        result["next_retry_in"] = round(retry_in, 1)
+    return result
+
+
+def run_trend_insights(days: int = 7):
+    """
+    Recomputes the LLM insights of a window (map-reduce over days, only
+    changed days are summarized again) and stores them for the API.
+    """
+    from app.services.insights import trend_insights
+
+    db = SessionLocal()
+    job = get_current_job()
+    redis_conn = job.connection if job is not None else get_redis()
+    try:
+        data = trend_insights(redis_conn, db, days)
+        insights_cache.store_latest(redis_conn, days, data)
+        return {"days": days, "resummarized_days": data["resummarized_days"]}
+    finally:
+        insights_cache.release_refresh_lock(redis_conn, days)
+        db.close()
+
+
+def run_trend_analysis(days: int = None):
+    """
+    Recomputes one trend window from the daily rollups into the trend cache
+    (enqueued by app.services.trend_cache when a cached window is stale).
+    """
+    db = SessionLocal()
+    job = get_current_job()
+    redis_conn = job.connection if job is not None else get_redis()
+    try:
+        return trend_cache.compute_and_store(redis_conn, db, days)["data"]
+    finally:
+        trend_cache.release_refresh_lock(redis_conn, days)
+        db.close()
+
+
+def rebuild_trend_rollups(recluster_blockers: bool = False):
+    """
+    Recomputes the daily rollups from every log (repair / backfill only),
+    re-clustering the blockers first if asked (e.g. after changing
+    BLOCKER_SIMILARITY).
+    """
+    db = SessionLocal()
+    try:
+        if recluster_blockers:
+            blocker_index.rebuild(db)
+        count = trend_rollups.rebuild(db)
+        db.commit()
+        return {"logs": count}
+    finally:
+        db.close()
+
+
+def rescore_emotions(batch_size: int = 64, after_id: int = 0):
+    """
+    Re-runs emotion detection over historical logs, batch_size rows per
+    forward pass, in id order. after_id allows resuming an interrupted run.
+    """
+    db = SessionLocal()
+    job = get_current_job()
+    rescored = changed = 0
+
+    try:
+        while True:
+            rows = (
+                db.query(VoiceLog.id, VoiceLog.transcript, VoiceLog.emotion, VoiceLog.created_at)
+                .filter(VoiceLog.id > after_id)
+                .order_by(VoiceLog.id.asc())
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            emotions = detect_emotions_batch([row.transcript or "" for row in rows], batch_size=batch_size)
+            for row, emotion in zip(rows, emotions):
+                if emotion != row.emotion:
+                    db.query(VoiceLog).filter(VoiceLog.id == row.id).update({VoiceLog.emotion: emotion})
+                    trend_rollups.move_emotion(db, row.created_at, row.emotion, emotion)
+                    changed += 1
+            db.commit()
+            report_cache.invalidate(job.connection if job is not None else get_redis())
+
+            rescored += len(rows)
+            after_id = rows[-1].id
+            if job is not None:
+                job.meta["rescored"] = rescored
+                job.meta["last_id"] = after_id
+                job.save_meta()
+            logging.info(f"Re-scored {rescored} logs (last id {after_id}, {changed} changed)")
+
+        return {"rescored": rescored, "changed": changed, "last_id": after_id}
+    finally:
+        db.close()
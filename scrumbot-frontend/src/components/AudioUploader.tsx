@@ -20,6 +20,7 @@ function AudioUploader() {
     const [errorMessage, setErrorMessage] = useState<string | null>(null);
     const [taskId, setTaskId] = useState<string | null>(null); // Store the task ID
     const [logLink, setLogLink] = useState<string | null>(null); // Store the link to the created log
+    const [stage, setStage] = useState<string | null>(null); // Current processing stage
 
     const handleFileChange = (event: React.ChangeEvent<HTMLInputElement>) => {
         const file = event.target.files && event.target.files[0];
@@ -69,13 +70,21 @@ function AudioUploader() {
             }
         } catch (error: any) {
             setUploadStatus('error');
-            setErrorMessage(`Upload failed: ${error.message || 'An unexpected error occurred.'}`);
+            if (error.response?.status === 429) {
+                // Workers are saturated, the backend says when to retry
+                const retryAfter = error.response.headers['retry-after'];
+                setErrorMessage(`The server is busy. Please try again${retryAfter ? ` in ${retryAfter} seconds` : ' later'}.`);
+            } else {
+                setErrorMessage(`Upload failed: ${error.message || 'An unexpected error occurred.'}`);
+            }
         }
     };
 
-    // Polling function to check task status
+    // Follow task progress over Server-Sent Events, falling back to polling
     useEffect(() => {
         if (taskId) {
+            let intervalId: ReturnType<typeof setInterval> | null = null;
+
             const pollTaskStatus = async () => {
                 try {
                     const response = await axios.get(`http://localhost:8000/api/task_status/${taskId}`);
@@ -97,9 +106,35 @@ function AudioUploader() {
                 }
             };
 
-            const intervalId = setInterval(pollTaskStatus, 3000); // Poll every 3 seconds
+            const events = new EventSource(`http://localhost:8000/api/task_events/${taskId}`);
+            events.addEventListener('progress', (message) => {
+                const event = JSON.parse((message as MessageEvent).data);
+                if (event.stage === 'saved' || event.stage === 'cached') {
+                    setUploadStatus('success');
+                    setLogLink(`/logs/${event.log_id}`);
+                    setErrorMessage(null);
+                    events.close();
+                } else if (event.stage === 'failed') {
+                    setUploadStatus('error');
+                    setErrorMessage(event.error || 'Task failed.');
+                    events.close();
+                } else {
+                    setUploadStatus('processing');
+                    setStage(event.total ? `${event.stage} ${event.chunk}/${event.total}` : event.stage);
+                }
+            });
+            events.onerror = () => {
+                // Stream unavailable: poll every 3 seconds instead
+                events.close();
+                if (!intervalId) {
+                    intervalId = setInterval(pollTaskStatus, 3000);
+                }
+            };
 
-            return () => clearInterval(intervalId); // Clean up on unmount or taskId change
+            return () => {
+                events.close();
+                if (intervalId) clearInterval(intervalId);
+            };
         }
     }, [taskId]);
 
@@ -112,6 +147,7 @@ function AudioUploader() {
                 setUploadProgress(0);
                 setTaskId(null);
                 setLogLink(null);
+                setStage(null);
                 setSelectedFile(null);
             }, 25000);
 
@@ -149,7 +185,7 @@ function AudioUploader() {
             )}
 
             {uploadStatus === 'processing' && (
-                <Typography variant="subtitle1">Processing...</Typography>
+                <Typography variant="subtitle1">{stage ? `Processing (${stage})...` : 'Processing...'}</Typography>
             )}
 
             {uploadStatus === 'success' && (
@@ -3,29 +3,26 @@ import React, { useEffect, useState } from 'react';
 import { Box, CircularProgress, Alert, IconButton, Typography, Paper } from '@mui/material';
 import CloseIcon from '@mui/icons-material/Close';
 import VoiceLogList from './VoiceLogList';
-import type { VoiceLogResponse } from '../services/api';
-import { fetchVoiceLogs } from '../services/api';
+import type { VoiceLogSummary } from '../services/api';
+import { fetchVoiceLogsPage } from '../services/api';
 
 
 const InsightsPanel: React.FC = () => {
-  const [logs, setLogs] = useState<VoiceLogResponse[]>([]);
+  const [logs, setLogs] = useState<VoiceLogSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-
-
+  // First page only; older pages are requested from the list
   useEffect(() => {
     const loadLogs = async () => {
       setLoading(true);
       setError(null);
       try {
-        const data = await fetchVoiceLogs();
-        if (Array.isArray(data)) {
-          setLogs(data);
-        } else {
-          setError('Unexpected data format from server.');
-          setLogs([]);
-        }
+        const page = await fetchVoiceLogsPage();
+        setLogs(page.logs);
+        setNextCursor(page.nextCursor);
       } catch (err: any) {
         setError(err.message || 'Failed to fetch voice logs.');
         setLogs([]);
@@ -37,7 +34,21 @@ const InsightsPanel: React.FC = () => {
     loadLogs();
   }, []);
 
-  // Compute emotion counts from logs
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchVoiceLogsPage(nextCursor);
+      setLogs(previous => [...previous, ...page.logs]);
+      setNextCursor(page.nextCursor);
+    } catch (err: any) {
+      setError(err.message || 'Failed to fetch more voice logs.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Compute emotion counts from the logs loaded so far
   const emotionData = React.useMemo(() => {
     if (!Array.isArray(logs)) return [];
 
@@ -84,12 +95,12 @@ const InsightsPanel: React.FC = () => {
       </Typography>
 
       {/* Voice Log Table */}
-      <VoiceLogList logs={logs} />
+      <VoiceLogList logs={logs} hasMore={nextCursor !== null} loadingMore={loadingMore} onLoadMore={loadMore} />
 
       {/* Emotion Data JSON display */}
       <Paper sx={{ p: 2, backgroundColor: '#f5f5f5' }}>
         <Typography variant="h6" gutterBottom>
-          Emotion Data (counts)
+          Emotion Data (counts, loaded logs)
         </Typography>
         <pre>{JSON.stringify({ emotionData }, null, 2)}</pre>
       </Paper>
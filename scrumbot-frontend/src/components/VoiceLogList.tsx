@@ -1,29 +1,24 @@
 // src/components/VoiceLogList.tsx
-import React, { useEffect, useState } from 'react';
+import React, { useState } from 'react';
 import {
   Table, TableBody, TableCell, TableContainer,
-  TableHead, TableRow, Paper, Typography
+  TableHead, TableRow, Paper, Typography, Box, Button, CircularProgress
 } from '@mui/material';
 import { useNavigate } from 'react-router-dom';
-import { fetchVoiceLogs, type VoiceLogResponse } from '../services/api';
+import type { VoiceLogSummary } from '../services/api';
 
-const VoiceLogList: React.FC = () => {
-  const [logs, setLogs] = useState<VoiceLogResponse[]>([]);
+interface VoiceLogListProps {
+  logs: VoiceLogSummary[];
+  hasMore: boolean;
+  loadingMore: boolean;
+  onLoadMore: () => void;
+}
+
+// Rows loaded so far; older logs are fetched a page at a time with "Load more"
+const VoiceLogList: React.FC<VoiceLogListProps> = ({ logs, hasMore, loadingMore, onLoadMore }) => {
   const navigate = useNavigate();
   const [selectedRowId, setSelectedRowId] = useState<number | null>(null);
 
-  useEffect(() => {
-    const fetchLogs = async () => {
-      try {
-        const data = await fetchVoiceLogs();
-        setLogs(data);
-      } catch (error) {
-        console.error('Failed to fetch logs:', error);
-      }
-    };
-    fetchLogs();
-  }, []);
-
   const handleRowClick = (id: number) => {
     setSelectedRowId(id);
     setTimeout(() => {
@@ -71,6 +66,13 @@ const VoiceLogList: React.FC = () => {
           ))}
         </TableBody>
       </Table>
+      {hasMore && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', p: 2 }}>
+          <Button variant="outlined" onClick={onLoadMore} disabled={loadingMore}>
+            {loadingMore ? <CircularProgress size={20} /> : 'Load more'}
+          </Button>
+        </Box>
+      )}
     </TableContainer>
   );
 };
@@ -16,9 +16,23 @@ export interface VoiceLogResponse {
     blockers: string[];
     created_at: string;
 }
-export const fetchVoiceLogs = async (): Promise<VoiceLogResponse[]> => {
-  const response = await axios.get<VoiceLogResponse[]>(`${API_BASE}/logs`);
-  return response.data;
+// A row of the log list: the "summary" view, without the (large) transcript
+export type VoiceLogSummary = Omit<VoiceLogResponse, "transcript">;
+
+export interface VoiceLogPage {
+    logs: VoiceLogSummary[];
+    nextCursor: string | null; // null on the last page
+}
+
+// GET /logs is paginated (newest first): pages are loaded on demand,
+// passing back the X-Next-Cursor of the previous page
+const LOGS_PAGE_SIZE = 50;
+
+export const fetchVoiceLogsPage = async (cursor?: string | null, limit: number = LOGS_PAGE_SIZE): Promise<VoiceLogPage> => {
+    const response = await axios.get<VoiceLogSummary[]>(`${API_BASE}/logs`, {
+        params: { limit, view: "summary", ...(cursor ? { cursor } : {}) },
+    });
+    return { logs: response.data, nextCursor: response.headers["x-next-cursor"] || null };
 };
 
 export interface TaskStatusResponse {
@@ -32,11 +46,6 @@ export const pingBackend = async () => {
     return res.data;
 };
 
-export const getLogs = async (): Promise<VoiceLogResponse[]> => {
-    const res = await axios.get<VoiceLogResponse[]>(`${API_BASE}/logs`);
-    return res.data;
-};
-
 export const getLogById = async (logId: number): Promise<VoiceLogResponse> => {
     const res = await axios.get<VoiceLogResponse>(`${API_BASE}/logs/${logId}`);
     return res.data;